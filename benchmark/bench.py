@@ -0,0 +1,217 @@
+"""
+End-to-end benchmark harness.
+
+Run one project and print per-phase measurements as JSON:
+    python benchmark/bench.py run <project_path> [--entry fn]
+
+Generate synthetic projects at growing scales, run each in a fresh process and
+report per-phase growth, flagging phases that scale superlinearly:
+    python benchmark/bench.py sweep [--scales 1,2,4,8] [--functions 40] [--files 4] ...
+        [--work-dir bench_projects] [--out bench_report.json] [--threshold 1.3]
+"""
+
+import json
+import math
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+# Allow importing from the repository root
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from benchmark.generator import ProjectSpec, generate_project
+
+SPEC_OPTIONS = {
+    "--files": "files",
+    "--functions": "functions",
+    "--call-depth": "call_depth",
+    "--fan-out": "fan_out",
+    "--globals": "globals",
+    "--struct-depth": "struct_depth",
+    "--array-size": "array_size",
+    "--pointer-chains": "pointer_chains",
+    "--chain-length": "chain_length",
+    "--seed": "seed",
+}
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_pipeline(project_path: str, entry: str | None) -> dict:
+    """
+    Run the full pipeline once in this process and measure each phase.
+    """
+    from parsing.parser import Parser
+    from parsing.summarizer import iter_summaries, reachable_function_names
+    from memory_managing.memory import MemoryManager
+
+    mem = MemoryManager.instance()
+    phases = []
+
+    def measure(name: str, fn):
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        result = fn()
+        phases.append({
+            "phase": name,
+            "wall_s": time.perf_counter() - start,
+            "cpu_s": time.process_time() - cpu_start,
+            "blocks": len(mem._blocks) - 1,
+            "rss_mb": round(_rss_mb(), 2),
+            "peak_rss_mb": round(_peak_rss_mb(), 2),
+        })
+        return result
+
+    parser = Parser(project_path)
+    measure("parse", parser.load)
+    measure("call_graph", parser.call_graph)
+    measure("analyze", lambda: parser.analyze(entry_function=entry))
+
+    def summarize():
+        names = reachable_function_names(parser, entry) if entry else [
+            f.name for f in parser.functions if f.name not in parser.config_function_names
+        ]
+        return sum(1 for _ in iter_summaries(parser, names))
+
+    summary_count = measure("summarize", summarize)
+    return {
+        "project": os.path.abspath(project_path),
+        "entry": entry,
+        "functions": len(parser.functions),
+        "globals": len(parser.global_vars),
+        "summaries": summary_count,
+        "total_wall_s": sum(p["wall_s"] for p in phases),
+        "phases": phases,
+    }
+
+
+def _growth_exponent(xs: list[float], ys: list[float]) -> float | None:
+    """
+    Least-squares slope of log(y) against log(x); 1.0 means linear growth.
+    """
+    points = [(math.log(x), math.log(y)) for x, y in zip(xs, ys) if x > 0 and y > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(p[0] for p in points) / len(points)
+    mean_y = sum(p[1] for p in points) / len(points)
+    var_x = sum((p[0] - mean_x) ** 2 for p in points)
+    if var_x == 0:
+        return None
+    return sum((p[0] - mean_x) * (p[1] - mean_y) for p in points) / var_x
+
+
+def sweep(spec: ProjectSpec, scales: list[int], work_dir: str, entry_mode: bool, threshold: float) -> dict:
+    runs = []
+    for scale in scales:
+        scaled = spec.scaled(scale)
+        project_dir = os.path.join(work_dir, f"scale_{scale}")
+        entry = generate_project(scaled, project_dir)
+        cmd = [sys.executable, os.path.abspath(__file__), "run", project_dir]
+        if entry_mode:
+            cmd += ["--entry", entry]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"Benchmark run failed for scale {scale}:\n{proc.stderr}")
+        result = json.loads(proc.stdout)
+        result["scale"] = scale
+        result["spec"] = scaled.__dict__
+        runs.append(result)
+
+    # Size is measured in generated functions, the dominant cost driver.
+    sizes = [r["spec"]["functions"] + r["spec"]["pointer_chains"] * r["spec"]["chain_length"] for r in runs]
+    growth = {}
+    phase_names = [p["phase"] for p in runs[0]["phases"]] if runs else []
+    for name in phase_names + ["total"]:
+        if name == "total":
+            walls = [r["total_wall_s"] for r in runs]
+        else:
+            walls = [next(p["wall_s"] for p in r["phases"] if p["phase"] == name) for r in runs]
+        exponent = _growth_exponent(sizes, walls)
+        growth[name] = {
+            "exponent": round(exponent, 3) if exponent is not None else None,
+            "superlinear": exponent is not None and exponent > threshold,
+        }
+    blocks = [r["phases"][-1]["blocks"] for r in runs]
+    block_exponent = _growth_exponent(sizes, blocks)
+    growth["blocks"] = {
+        "exponent": round(block_exponent, 3) if block_exponent is not None else None,
+        "superlinear": block_exponent is not None and block_exponent > threshold,
+    }
+    return {
+        "threshold": threshold,
+        "sizes": sizes,
+        "runs": runs,
+        "growth": growth,
+        "superlinear_phases": sorted(k for k, v in growth.items() if v["superlinear"]),
+    }
+
+
+def _parse_options(argv: list[str]) -> tuple[list[str], dict[str, str | bool]]:
+    positionals: list[str] = []
+    options: dict[str, str | bool] = {}
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if arg.startswith("--"):
+            if "=" in arg:
+                key, value = arg.split("=", 1)
+                options[key] = value
+            elif arg in ("--all",):
+                options[arg] = True
+            elif i + 1 < len(argv):
+                options[arg] = argv[i + 1]
+                i += 1
+            else:
+                raise SystemExit(f"Option {arg} expects a value")
+        else:
+            positionals.append(arg)
+        i += 1
+    return positionals, options
+
+
+if __name__ == "__main__":
+    positionals, options = _parse_options(sys.argv[1:])
+    if not positionals or positionals[0] not in ("run", "sweep"):
+        raise SystemExit(__doc__)
+
+    if positionals[0] == "run":
+        if len(positionals) < 2:
+            raise SystemExit("Usage: python benchmark/bench.py run <project_path> [--entry fn]")
+        print(json.dumps(run_pipeline(positionals[1], options.get("--entry") or None), indent=2))
+        raise SystemExit(0)
+
+    spec = ProjectSpec()
+    for option, field_name in SPEC_OPTIONS.items():
+        if option in options:
+            setattr(spec, field_name, int(options[option]))
+    scales = [int(s) for s in str(options.get("--scales", "1,2,4,8")).split(",") if s]
+    work_dir = options.get("--work-dir") or tempfile.mkdtemp(prefix="ip_parser_bench_")
+    threshold = float(options.get("--threshold", 1.3))
+    report = sweep(spec, scales, work_dir, entry_mode=not options.get("--all"), threshold=threshold)
+
+    out_path = options.get("--out", "bench_report.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    for name, info in report["growth"].items():
+        flag = "  SUPERLINEAR" if info["superlinear"] else ""
+        print(f"{name:>12}: exponent {info['exponent']}{flag}")
+    print(f"Benchmark report written to {out_path}")
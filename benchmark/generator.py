@@ -0,0 +1,191 @@
+"""
+Synthetic C project generator for benchmarking.
+
+The generated project has one entry function `bench_entry` at the root of a call
+tree, leaf functions that read and write globals (builtins, arrays, nested structs),
+and chains of functions that hand a pointer parameter down to the next link.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+from dataclasses import dataclass, asdict
+from typing import List
+
+
+@dataclass
+class ProjectSpec:
+    files: int = 4
+    functions: int = 40         # total functions excluding pointer chains
+    call_depth: int = 4         # levels of the call tree below bench_entry
+    fan_out: int = 3            # minimum callees per non-leaf function
+    globals: int = 30
+    struct_depth: int = 3       # nesting depth of the generated record types
+    array_size: int = 4
+    pointer_chains: int = 2     # number of pointer-param chains
+    chain_length: int = 3       # functions per pointer-param chain
+    seed: int = 0
+
+    def scaled(self, factor: int) -> "ProjectSpec":
+        """
+        Copy of this spec with files, functions, globals and chains multiplied by `factor`.
+        """
+        data = asdict(self)
+        for key in ("files", "functions", "globals", "pointer_chains"):
+            data[key] = max(1, data[key] * factor)
+        return ProjectSpec(**data)
+
+
+ENTRY_FUNCTION = "bench_entry"
+
+
+def _struct_name(level: int) -> str:
+    return f"SBench{level}"
+
+
+def _emit_header(spec: ProjectSpec, global_decls: List[str], prototypes: List[str]) -> str:
+    lines = ["#ifndef BENCH_COMMON_H", "#define BENCH_COMMON_H", "", "typedef int bint;", ""]
+    for level in range(spec.struct_depth):
+        lines.append(f"typedef struct {_struct_name(level)} {{")
+        lines.append("    bint value;")
+        lines.append(f"    bint items[{spec.array_size}];")
+        if level > 0:
+            lines.append(f"    struct {_struct_name(level - 1)} inner;")
+            lines.append(f"    struct {_struct_name(level - 1)} children[{spec.array_size}];")
+        lines.append(f"}} {_struct_name(level)};")
+        lines.append("")
+    lines.extend(f"extern {decl};" for decl in global_decls)
+    lines.append("")
+    lines.extend(f"{proto};" for proto in prototypes)
+    lines.extend(["", "#endif", ""])
+    return "\n".join(lines)
+
+
+def _global_decl(spec: ProjectSpec, index: int) -> tuple[str, str]:
+    """
+    Returns (declaration, kind) for global `index`; kind is one of scalar/array/struct/struct_array.
+    """
+    name = f"g_{index}"
+    top = _struct_name(spec.struct_depth - 1) if spec.struct_depth > 0 else None
+    kind = ("scalar", "array", "struct", "struct_array")[index % 4]
+    if top is None and kind.startswith("struct"):
+        kind = "array"
+    if kind == "scalar":
+        return f"bint {name}", kind
+    if kind == "array":
+        return f"bint {name}[{spec.array_size}]", kind
+    if kind == "struct":
+        return f"{top} {name}", kind
+    return f"{top} {name}[{spec.array_size}]", kind
+
+
+def _access_path(spec: ProjectSpec, rng: random.Random, index: int, kind: str) -> str:
+    """
+    An lvalue inside global `index`, with a random mix of constant and variable indexes.
+    """
+    def subscript() -> str:
+        return f"[{rng.randrange(spec.array_size)}]" if rng.random() < 0.7 else "[idx]"
+
+    path = f"g_{index}"
+    if kind == "scalar":
+        return path
+    if kind == "array":
+        return path + subscript()
+    if kind == "struct_array":
+        path += subscript()
+    depth = rng.randrange(spec.struct_depth)
+    for _ in range(depth):
+        path += ".inner" if rng.random() < 0.5 else ".children" + subscript()
+    return path + (".items" + subscript() if rng.random() < 0.5 else ".value")
+
+
+def generate_project(spec: ProjectSpec, out_dir: str) -> str:
+    """
+    Write the project described by `spec` into `out_dir` and return the entry function name.
+    """
+    rng = random.Random(spec.seed)
+    os.makedirs(out_dir, exist_ok=True)
+    for name in os.listdir(out_dir):
+        if name.endswith((".c", ".h")):
+            os.remove(os.path.join(out_dir, name))
+
+    globals_info = [_global_decl(spec, i) for i in range(spec.globals)]
+
+    # Assign tree functions to levels; each level has at most fan_out times the previous one.
+    levels: List[List[str]] = []
+    remaining = spec.functions
+    width = 1
+    for level in range(spec.call_depth + 1):
+        if remaining <= 0:
+            break
+        count = min(width, remaining) if level < spec.call_depth else remaining
+        levels.append([f"bench_l{level}_{i}" for i in range(count)])
+        remaining -= count
+        width *= max(spec.fan_out, 1)
+
+    chains = [[f"bench_chain{c}_{k}" for k in range(spec.chain_length)] for c in range(spec.pointer_chains)]
+
+    bodies: List[tuple[str, str]] = []  # (prototype, body)
+    prototypes: List[str] = []
+
+    for c, chain in enumerate(chains):
+        for k, name in enumerate(chain):
+            proto = f"void {name}(bint *p, bint idx)"
+            stmts = ["    *p = *p + idx;"]
+            if k + 1 < len(chain):
+                stmts.append(f"    {chain[k + 1]}(p, idx);")
+            bodies.append((proto, "\n".join(stmts)))
+            prototypes.append(proto)
+
+    for level, names in enumerate(levels):
+        is_leaf_level = level + 1 >= len(levels)
+        for i, name in enumerate(names):
+            proto = f"void {name}(bint idx)"
+            stmts = ["    bint tmp = idx;"]
+            if spec.globals:
+                for _ in range(3):
+                    src = rng.randrange(spec.globals)
+                    dst = rng.randrange(spec.globals)
+                    src_path = _access_path(spec, rng, src, globals_info[src][1])
+                    dst_path = _access_path(spec, rng, dst, globals_info[dst][1])
+                    stmts.append(f"    tmp = tmp + {src_path};")
+                    stmts.append(f"    {dst_path} = tmp;")
+            if not is_leaf_level:
+                # Every function of the next level gets at least one caller, so the whole tree is reachable.
+                children = levels[level + 1]
+                callees = {(i * spec.fan_out + j) % len(children) for j in range(spec.fan_out)}
+                callees.update(range(i, len(children), len(names)))
+                for c in sorted(callees):
+                    stmts.append(f"    {children[c]}(tmp);")
+            if chains and spec.globals and rng.random() < 0.5:
+                chain = chains[rng.randrange(len(chains))]
+                target = rng.randrange(spec.globals)
+                kind = globals_info[target][1]
+                target_path = _access_path(spec, rng, target, kind)
+                stmts.append(f"    {chain[0]}(&{target_path}, tmp);")
+            bodies.append((proto, "\n".join(stmts)))
+            prototypes.append(proto)
+
+    entry_stmts = [f"    {name}(idx);" for name in (levels[0] if levels else [])]
+    bodies.append((f"void {ENTRY_FUNCTION}(bint idx)", "\n".join(entry_stmts)))
+    prototypes.append(f"void {ENTRY_FUNCTION}(bint idx)")
+
+    header = _emit_header(spec, [decl for decl, _ in globals_info], prototypes)
+    with open(os.path.join(out_dir, "bench_common.h"), "w", encoding="utf-8") as f:
+        f.write(header)
+
+    file_count = max(spec.files, 1)
+    files: List[List[str]] = [[] for _ in range(file_count)]
+    for i, (decl, _) in enumerate(globals_info):
+        files[i % file_count].append(f"{decl};")
+    for i, (proto, body) in enumerate(bodies):
+        files[i % file_count].append(f"{proto}\n{{\n{body}\n}}\n")
+    for i, chunks in enumerate(files):
+        with open(os.path.join(out_dir, f"bench_{i}.c"), "w", encoding="utf-8") as f:
+            f.write('#include "bench_common.h"\n\n' + "\n".join(chunks) + "\n")
+
+    return ENTRY_FUNCTION
+
+
+__all__ = ["ENTRY_FUNCTION", "ProjectSpec", "generate_project"]
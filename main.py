@@ -3,155 +3,273 @@ import sys
 import os
 
 from parsing.parser import Parser
+from parsing.budget import AnalysisBudget
 from memory_managing.memory import MemoryManager
-from models.summarize import FunctionSummarize, BriefVariable
-from utils.callgraph import reverse_topo_from_project
-
-
-def _to_brief(var) -> BriefVariable:
-	name = var.name
-	if name.endswith("__pointee"):
-		return None
-	if name.startswith("<") and ">" in name:
-		name = name.split(">", 1)[1]
-	name = name.replace("__pointee.", "->")
-	return BriefVariable(name=name, type=getattr(var, "original_raw_type", var.raw_type))
-
-
-def _summarize_function(parser: Parser, target_name: str) -> FunctionSummarize:
-	mem = MemoryManager.instance()
-
-	target_func = None
-	for func in parser.functions:
-		if func.name == target_name:
-			target_func = func
-			break
-	if target_func is None:
-		raise ValueError(f"Function '{target_name}' not found")
-
-	summary = FunctionSummarize(function_name=target_name)
-
-	for block in mem._blocks:
-		if block is None:
-			continue
-		var = block.var
-		if var is None:
-			continue
-
-		root_addr = block.addr
-		root_block = block
-		while root_block.parent != 0:
-			root_addr = root_block.parent
-			root_block = mem._blocks[root_addr]
-			if root_block is None:
-				break
-		root_var = root_block.var if root_block is not None else None
-		root_is_global = root_var is not None and root_var.domain == root_var.domain.GLOBAL
-		if root_var is not None and root_var.domain == root_var.domain.LOCAL:
-			continue
-
-		r_target = target_name in var.read
-		w_target = target_name in var.write
-
-		# Only include variables that the target function reads or writes.
-		if not (r_target or w_target):
-			continue
-
-		if r_target and not w_target and root_is_global:
-			brief = _to_brief(var)
-			if brief:
-				summary.interface_semantics.parameters.append(brief)
-		elif (
-			r_target and w_target
-			and root_is_global
-			and var.read.issubset({target_name})
-			and var.write.issubset({target_name})
-			and var.name not in target_func.non_state
-		):
-			brief = _to_brief(var)
-			if brief:
-				summary.interface_semantics.state.append(brief)
-		elif r_target and not w_target:
-			brief = _to_brief(var)
-			if brief:
-				summary.interface_semantics.input.append(brief)
-		elif w_target and not r_target:
-			brief = _to_brief(var)
-			if brief:
-				summary.interface_semantics.output.append(brief)
+from parsing.summarizer import iter_summaries, reachable_function_names, summary_to_dict
+from utils.store import ResultsStore, QUERIES, run_query
+from utils.server import serve
+from utils.profile import Profiler
+from utils.memreport import MemoryReporter
+from utils.memdump import MEMORY_WRITERS, MemoryFilter, iter_memory_rows
+from utils.diff import diff_projects
+from utils.snapshot import MemorySnapshot, write_snapshot
+
+
+def _record_summaries(summaries, store: ResultsStore):
+	for summary in summaries:
+		store.add_summary(summary)
+		yield summary
+
+
+def _collect_summaries(summaries, collected: list):
+	for summary in summaries:
+		collected.append(summary)
+		yield summary
+
+
+def _write_summaries_json(summaries, f) -> None:
+	f.write(json.dumps([summary_to_dict(s) for s in summaries], ensure_ascii=False, indent=2))
+
+
+def _write_summaries_ndjson(summaries, f) -> None:
+	# One summary per line, flushed as soon as it is produced.
+	for summary in summaries:
+		f.write(json.dumps(summary_to_dict(summary), ensure_ascii=False))
+		f.write("\n")
+		f.flush()
+
+
+SUMMARY_WRITERS = {
+	"json": (".json", _write_summaries_json),
+	"ndjson": (".ndjson", _write_summaries_ndjson),
+}
+
+VALUE_OPTIONS = {"--format", "--store", "--socket", "--profile-top", "--memory-format", "--memory-match", "--jobs", "--snapshot", "--budget-seconds", "--budget-visits", "--budget-blocks"}
+
+
+def _parse_cli(argv: list[str]) -> tuple[list[str], dict[str, str | bool]]:
+	"""
+	Split command line arguments into positionals and `--option [value]` pairs.
+	"""
+	positionals: list[str] = []
+	options: dict[str, str | bool] = {}
+	i = 0
+	while i < len(argv):
+		arg = argv[i]
+		if arg.startswith("--"):
+			if "=" in arg:
+				key, value = arg.split("=", 1)
+				options[key] = value
+			elif arg in VALUE_OPTIONS:
+				if i + 1 >= len(argv):
+					raise SystemExit(f"Option {arg} expects a value")
+				options[arg] = argv[i + 1]
+				i += 1
+			else:
+				options[arg] = True
 		else:
-			brief = _to_brief(var)
-			if brief:
-				summary.interface_semantics.inout.append(brief)
+			positionals.append(arg)
+		i += 1
+	return positionals, options
 
-	return summary
 
+def _query_command(args: list[str]) -> None:
+	if len(args) < 2:
+		raise SystemExit(f"Usage: python main.py query <results.db> <{'|'.join(QUERIES)}> [args...]")
+	try:
+		headers, rows = run_query(args[0], args[1], args[2:])
+	except (ValueError, FileNotFoundError) as e:
+		raise SystemExit(str(e))
+	print("\t".join(headers))
+	for row in rows:
+		print("\t".join("" if v is None else str(v) for v in row))
 
-def _summary_to_dict(summary: FunctionSummarize) -> dict:
-	def serialize_vars(items):
-		return [{"name": v.name, "type": v.type} for v in items]
 
-	return {
-		"function_name": summary.function_name,
-		"interface_semantics": {
-			"parameters": serialize_vars(summary.interface_semantics.parameters),
-			"state": serialize_vars(summary.interface_semantics.state),
-			"input": serialize_vars(summary.interface_semantics.input),
-			"output": serialize_vars(summary.interface_semantics.output),
-			"inout": serialize_vars(summary.interface_semantics.inout),
-		},
-	}
+def _snapshot_command(args: list[str], options: dict[str, str | bool]) -> None:
+	if len(args) < 2 or args[1] not in ("memory", "summaries", "block") or (args[1] == "block" and len(args) < 3):
+		raise SystemExit("Usage: python main.py snapshot <snapshot> <memory|summaries|block NAME> [--memory-format ...] [--memory-globals] [--memory-touched] [--memory-match GLOB] [--format json|ndjson]")
+	try:
+		snapshot = MemorySnapshot(args[0])
+	except (OSError, ValueError) as e:
+		raise SystemExit(str(e))
+	with snapshot:
+		if args[1] == "memory":
+			memory_format = options.get("--memory-format", "text")
+			if memory_format not in MEMORY_WRITERS:
+				raise SystemExit(f"Unknown memory format '{memory_format}', expected one of: {', '.join(MEMORY_WRITERS)}")
+			memory_filter = MemoryFilter(
+				globals_only=bool(options.get("--memory-globals")),
+				touched_by=snapshot.entry if options.get("--memory-touched") else None,
+				name_glob=options.get("--memory-match") or None,
+			)
+			MEMORY_WRITERS[memory_format][1](snapshot.iter_rows(memory_filter), sys.stdout)
+		elif args[1] == "summaries":
+			output_format = options.get("--format", "json")
+			if output_format not in SUMMARY_WRITERS:
+				raise SystemExit(f"Unknown output format '{output_format}', expected one of: {', '.join(SUMMARY_WRITERS)}")
+			SUMMARY_WRITERS[output_format][1](snapshot.summaries(), sys.stdout)
+		else:
+			row = snapshot.find(args[2])
+			if row is None:
+				raise SystemExit(f"No block named '{args[2]}' in {args[0]}")
+			print(json.dumps(row, ensure_ascii=False))
+
+
+def _budget_from_options(options: dict[str, str | bool]) -> AnalysisBudget | None:
+	budget = AnalysisBudget(
+		max_seconds=float(options["--budget-seconds"]) if "--budget-seconds" in options else None,
+		max_visits=int(options["--budget-visits"]) if "--budget-visits" in options else None,
+		max_blocks=int(options["--budget-blocks"]) if "--budget-blocks" in options else None,
+	)
+	return budget if budget.enabled() else None
+
+
+def _diff_command(args: list[str], options: dict[str, str | bool]) -> None:
+	if len(args) < 2:
+		raise SystemExit("Usage: python main.py diff <base_path> <head_path> [entry ...] [--format json|ndjson] [--unity] [--pch] [--jobs N]")
+	output_format = options.get("--format", "json")
+	if output_format not in SUMMARY_WRITERS:
+		raise SystemExit(f"Unknown output format '{output_format}', expected one of: {', '.join(SUMMARY_WRITERS)}")
+	try:
+		result = diff_projects(
+			args[0], args[1], args[2:] or None,
+			unity=bool(options.get("--unity")), pch=bool(options.get("--pch")), jobs=int(options.get("--jobs", 1)),
+			budget=_budget_from_options(options),
+		)
+	except ValueError as e:
+		raise SystemExit(str(e))
+	if output_format == "json":
+		print(json.dumps(result, ensure_ascii=False, indent=2))
+	else:
+		for change in result["changes"]:
+			print(json.dumps(change, ensure_ascii=False))
+	print(
+		f"{len(result['changed_files'])} changed files, {len(result['reanalyzed'])} entries re-analyzed, "
+		f"{len(result['changes'])} interface changes",
+		file=sys.stderr,
+	)
 
 
 if __name__ == "__main__":
-	if len(sys.argv) < 2:
-		raise SystemExit("Usage: python main.py <function_name> [project_path] [output_dir] [--memory]")
+	positionals, options = _parse_cli(sys.argv[1:])
+	if positionals and positionals[0] == "query":
+		_query_command(positionals[1:])
+		raise SystemExit(0)
+	if positionals and positionals[0] == "diff":
+		_diff_command(positionals[1:], options)
+		raise SystemExit(0)
+	if positionals and positionals[0] == "snapshot":
+		_snapshot_command(positionals[1:], options)
+		raise SystemExit(0)
+	if positionals and positionals[0] == "serve":
+		serve(positionals[1] if len(positionals) > 1 else "input", options.get("--socket", "ip-parser.sock"))
+		raise SystemExit(0)
+	if not positionals:
+		raise SystemExit(
+			"Usage: python main.py <function_name> [project_path] [output_dir|-] [--memory [--memory-format text|csv|ndjson] [--memory-globals] [--memory-touched] [--memory-match GLOB]] [--format json|ndjson] [--store results.db] [--snapshot PATH] [--profile [--profile-top N]] [--mem-report] [--full-load] [--unity] [--pch] [--jobs N] [--budget-seconds S] [--budget-visits N] [--budget-blocks N]\n"
+			"       python main.py query <results.db> <query> [args...]\n"
+			"       python main.py snapshot <snapshot> <memory|summaries|block NAME>\n"
+			"       python main.py diff <base_path> <head_path> [entry ...] [--format json|ndjson]\n"
+			"       python main.py serve [project_path] [--socket ip-parser.sock]"
+		)
+
+	function_name = positionals[0]
+	project_path = positionals[1] if len(positionals) > 1 else "input"
+	output_dir = positionals[2] if len(positionals) > 2 else "output"
+	# "-" writes summaries to stdout; status messages then go to stderr.
+	to_stdout = output_dir == "-"
+	log_stream = sys.stderr if to_stdout else sys.stdout
 
-	function_name = sys.argv[1]
-	project_path = "input"
-	output_dir = "output"
-	if len(sys.argv) > 2 and not sys.argv[2].startswith("--"):
-		project_path = sys.argv[2]
-	if len(sys.argv) > 3 and not sys.argv[3].startswith("--"):
-		output_dir = sys.argv[3]
+	with_memory = bool(options.get("--memory", False))
+	output_format = options.get("--format", "json")
+	if output_format not in SUMMARY_WRITERS:
+		raise SystemExit(f"Unknown output format '{output_format}', expected one of: {', '.join(SUMMARY_WRITERS)}")
+	if to_stdout and with_memory:
+		raise SystemExit("--memory requires an output directory")
+	memory_format = options.get("--memory-format", "text")
+	if memory_format not in MEMORY_WRITERS:
+		raise SystemExit(f"Unknown memory format '{memory_format}', expected one of: {', '.join(MEMORY_WRITERS)}")
 
-	with_memory = any(arg == "--memory" for arg in sys.argv[2:])
+	with_profile = bool(options.get("--profile", False))
+	if with_profile:
+		Profiler.enable()
+	mem_reporter = None
+	if options.get("--mem-report"):
+		mem_reporter = MemoryReporter(top_n=int(options.get("--profile-top", 20)))
+		mem_reporter.start()
 
-	parser = Parser(project_path)
+	# Per-function blocks can be released unless the full memory is dumped, stored or snapshotted.
+	keep_blocks = with_memory or bool(options.get("--store")) or bool(options.get("--snapshot"))
+	parser = Parser(project_path, demand_driven=not options.get("--full-load"), release_blocks=not keep_blocks, unity=bool(options.get("--unity")), pch=bool(options.get("--pch")), jobs=int(options.get("--jobs", 1)), budget=_budget_from_options(options))
 	parser.parse(entry_function=function_name)
 
-	order = reversed(reverse_topo_from_project(project_path, function_name))
-	func_names = [name for name in order if any(f.name == name for f in parser.functions)]
-	if function_name not in func_names:
-		func_names.append(function_name)
-
-	summaries = [
-		_summarize_function(parser, name)
-		for name in func_names
-		if name not in getattr(parser, "config_function_names", set())
-	]
-	os.makedirs(output_dir, exist_ok=True)
-	output_path = os.path.join(output_dir, f"results_{function_name}.json")
-	with open(output_path, "w", encoding="utf-8") as f:
-		f.write(json.dumps([_summary_to_dict(s) for s in summaries], ensure_ascii=False, indent=2))
-	print(f"Summaries for reachable functions from '{function_name}' written to {output_path}")
+	func_names = reachable_function_names(parser, function_name)
+	if function_name not in parser.symbols:
+		raise ValueError(f"Function '{function_name}' not found")
+
+	suffix, write_summaries = SUMMARY_WRITERS[output_format]
+	summaries = iter_summaries(parser, func_names)
+	store = None
+	if options.get("--store"):
+		store = ResultsStore(options["--store"])
+		store.begin_run(function_name, project_path)
+		reachable = set(func_names)
+		store.add_functions(f for f in parser.functions if f.name in reachable)
+		summaries = _record_summaries(summaries, store)
+	snapshot_summaries: list = []
+	if options.get("--snapshot"):
+		summaries = _collect_summaries(summaries, snapshot_summaries)
+	if to_stdout:
+		write_summaries(summaries, sys.stdout)
+		sys.stdout.flush()
+		print(f"Summaries for reachable functions from '{function_name}' written to stdout", file=log_stream)
+	else:
+		os.makedirs(output_dir, exist_ok=True)
+		output_path = os.path.join(output_dir, f"results_{function_name}{suffix}")
+		with open(output_path, "w", encoding="utf-8") as f:
+			write_summaries(summaries, f)
+		print(f"Summaries for reachable functions from '{function_name}' written to {output_path}", file=log_stream)
+
+	reachable_names = set(func_names)
+	degraded = [f for f in parser.functions if f.name in reachable_names and f.degraded]
+	if degraded:
+		print(f"Analysis budget exceeded in {len(degraded)} function(s):", file=log_stream)
+		for func in degraded:
+			print(f"  {func.name}: {'; '.join(func.degraded)}", file=log_stream)
+
+	if store is not None:
+		store.add_blocks(MemoryManager.instance().iter_blocks())
+		store.close()
+		print(f"Results for '{function_name}' stored in {store.db_path}", file=log_stream)
+
+	if options.get("--snapshot"):
+		write_snapshot(options["--snapshot"], MemoryManager.instance(), parser.structs, snapshot_summaries, function_name)
+		print(f"Snapshot for '{function_name}' written to {options['--snapshot']}", file=log_stream)
+
+	profile_dir = "." if to_stdout else output_dir
+	if mem_reporter is not None:
+		mem_reporter.stop()
+		report_path = os.path.join(profile_dir, f"memreport_{function_name}.txt")
+		report_json_path = os.path.join(profile_dir, f"memreport_{function_name}.json")
+		mem_reporter.write(report_path, report_json_path)
+		print(f"Memory footprint report for '{function_name}' written to {report_path} and {report_json_path}", file=log_stream)
+
+	if with_profile:
+		Profiler.disable()
+		report_path = os.path.join(profile_dir, f"profile_{function_name}.txt")
+		trace_path = os.path.join(profile_dir, f"trace_{function_name}.json")
+		Profiler.write_report(report_path, top_n=int(options.get("--profile-top", 20)))
+		Profiler.write_trace(trace_path)
+		print(f"Profile for '{function_name}' written to {report_path} and {trace_path}", file=log_stream)
 
 	if with_memory:
-		mem = MemoryManager.instance()
-		memory_path = os.path.join(output_dir, f"memory_{function_name}.txt")
-		with open(memory_path, "w", encoding="utf-8") as f:
-			f.write("Memory Blocks:\n\n")
-			for addr, block in enumerate(mem._blocks):
-				if addr == 0 or block is None:
-					continue
-				if getattr(block.var, "hidden", False):
-					continue
-				read_funcs = sorted(block.var.read)
-				write_funcs = sorted(block.var.write)
-				f.write(
-					f"  M: Addr {addr}: {block.var.name} "
-					f"(type {block.var.raw_type}, parent={block.parent}, size={parser.structs.get_size(block.var.raw_type)})\n"
-				)
-				f.write(f"     R: {', '.join(read_funcs) if read_funcs else '-'}\n")
-				f.write(f"     W: {', '.join(write_funcs) if write_funcs else '-'}\n")
+		memory_filter = MemoryFilter(
+			globals_only=bool(options.get("--memory-globals")),
+			touched_by=function_name if options.get("--memory-touched") else None,
+			name_glob=options.get("--memory-match") or None,
+		)
+		memory_suffix, write_memory = MEMORY_WRITERS[memory_format]
+		memory_path = os.path.join(output_dir, f"memory_{function_name}{memory_suffix}")
+		with open(memory_path, "w", encoding="utf-8", newline="") as f:
+			write_memory(iter_memory_rows(MemoryManager.instance(), parser.structs, memory_filter), f)
 		print(f"Memory report for '{function_name}' written to {memory_path}")
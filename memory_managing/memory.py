@@ -3,7 +3,7 @@ This module handles the allocation for abstract memory location.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Iterable, Dict, Set
+from typing import List, Optional, Iterable, Iterator, Dict, Set
 from models import *
 
 @dataclass
@@ -39,10 +39,18 @@ class MemoryManager:
 		if getattr(self, "_initialized", False):
 			return
 		self._initialized = True
+		self.reset()
+
+	def reset(self) -> None:
+		"""
+		Drop every allocated block so a new analysis starts from an empty address space.
+		"""
 		self._next_addr: int = 1
 		self._blocks: List[Optional[MemoryBlock]] = [None]  # index 0 unused
 		self._map: Dict[str, int] = dict()  # var_name -> address
+		self._children: Dict[int, List[int]] = dict()  # address -> child addresses, in allocation order
 		self._dirty_ptr_blocks: Set[int] = set()
+		self._baseline_ptr_refs: Dict[int, Set[str]] = dict()  # what clear_pointer_refs restores
 
 	@classmethod
 	def instance(cls) -> "MemoryManager":
@@ -146,6 +154,20 @@ class MemoryManager:
 			if block is not None:
 				yield block
 
+	def iter_subtree(self, addr: int) -> Iterator[MemoryBlock]:
+		"""
+		The block at `addr` and all its members/elements, in pre-order.
+		Only the subtree's blocks are visited.
+		"""
+		stack = [addr]
+		while stack:
+			current = stack.pop()
+			block = self._blocks[current]
+			if block is None:
+				continue
+			yield block
+			stack.extend(reversed(self._children.get(current, ())))
+
 	def _mark_read(self, addr: int, func: str):
 		self._blocks[addr].var.mark_read(func)
 
@@ -177,11 +199,26 @@ class MemoryManager:
 		block.pointers.discard(pointer_name)
 		self._dirty_ptr_blocks.add(target_addr)
 
+	def mark_pointer_ref_baseline(self) -> None:
+		"""
+		Make the current pointer back-references (e.g. from global pointer
+		initializers) the state `clear_pointer_refs` restores.
+		"""
+		self._baseline_ptr_refs = {
+			addr: set(self._blocks[addr].pointers)
+			for addr in self._dirty_ptr_blocks
+			if self._blocks[addr] is not None and self._blocks[addr].pointers
+		}
+		self._dirty_ptr_blocks.clear()
+
 	def clear_pointer_refs(self) -> None:
+		"""
+		Undo every pointer back-reference change since the baseline; only changed blocks are touched.
+		"""
 		for addr in self._dirty_ptr_blocks:
 			block = self.get_block(addr)
 			if block is not None:
-				block.pointers.clear()
+				block.pointers = set(self._baseline_ptr_refs.get(addr, ()))
 		self._dirty_ptr_blocks.clear()
 
 	# what: should be called when a function reads a variable in the abstract memory
@@ -212,6 +249,67 @@ class MemoryManager:
 
 		self._mark_write(addr, func)
 
+	def arena_start(self) -> int:
+		"""
+		Address the next allocation will get; pass it to `release_arena` to scope
+		everything allocated from here on.
+		"""
+		return self._next_addr
+
+	def release_arena(self, start: int, owner_prefix: str) -> int:
+		"""
+		Release the parameter/local blocks allocated since `start` whose names start with
+		`owner_prefix`, keeping those the post-pass still needs:
+		- blocks marked read or written (and therefore their ancestors),
+		- blocks pointed to by a pointer outside the arena, with their subtrees.
+		Released addresses are never reused; their slots become None.
+		Returns the number of released blocks.
+		"""
+		blocks = self._blocks
+		end = len(blocks)
+		in_arena: Dict[int, bool] = {}
+		pinned: Set[int] = set()
+		for addr in range(start, end):
+			block = blocks[addr]
+			if block is None:
+				continue
+			if block.parent == 0:
+				var = block.var
+				member = var.domain != VARIABLE_DOMAIN.GLOBAL and var.name.startswith(owner_prefix)
+			else:
+				member = block.parent >= start and in_arena.get(block.parent, False)
+			if not member:
+				continue
+			in_arena[addr] = True
+			if block.parent in pinned or any(not name.startswith(owner_prefix) for name in block.pointers):
+				pinned.add(addr)
+
+		keep: Set[int] = set(pinned)
+		for addr in reversed(list(in_arena)):
+			block = blocks[addr]
+			if addr in keep or block.var.read or block.var.write:
+				keep.add(addr)
+				keep.add(block.parent)
+
+		released = 0
+		parents: Set[int] = set()
+		for addr in in_arena:
+			if addr in keep:
+				continue
+			name = blocks[addr].var.name
+			if self._map.get(name) == addr:
+				del self._map[name]
+			self._dirty_ptr_blocks.discard(addr)
+			self._children.pop(addr, None)
+			parents.add(blocks[addr].parent)
+			blocks[addr] = None
+			released += 1
+		for parent in parents:
+			children = self._children.get(parent)
+			if children is not None:
+				self._children[parent] = [child for child in children if blocks[child] is not None]
+		return released
+
 	def analyze_memories(self):
 		
 		graph = [[] for _ in range(len(self._blocks))]
@@ -227,7 +325,7 @@ class MemoryManager:
 			return (var.read, var.write)
 
 		for addr, block in enumerate(self._blocks):
-			if addr == 0:
+			if addr == 0 or block is None:
 				continue
 			graph[block.parent].append(addr)
 
@@ -265,9 +363,8 @@ class MemoryManager:
 			addr = self._allocate(var.name, var.raw_type, parent=0, structs_manager=structs_manager, variable=var)
 			var.address = addr
 			if var.is_pointer:
-				base_type = structs_manager.get_decoded_name(var.raw_type).rstrip()
-				if base_type.endswith("*"):
-					base_type = base_type[:-1].strip()
+				desc = structs_manager.type_descriptor(var.raw_type)
+				base_type = desc.element_name if desc.is_pointer else desc.name
 				if not base_type:
 					base_type = "void"
 				dummy_name = f"{var.name}__pointee"
@@ -275,11 +372,12 @@ class MemoryManager:
 				if var.is_pointer_array:
 					array_len = max(var.pointer_array_len, 1)
 					dummy_type = f"{base_type}[{array_len}]"
-				dummy_is_pointer = structs_manager.is_pointer(dummy_type)
+				dummy_desc = structs_manager.type_descriptor(dummy_type)
+				dummy_is_pointer = dummy_desc.is_pointer
 				dummy_var = Variable(
 					name=dummy_name,
 					raw_type=dummy_type,
-					kind=structs_manager.get_type_kind(dummy_type),
+					kind=dummy_desc.kind,
 					domain=var.domain,
 					is_pointer=dummy_is_pointer,
 					points_to={},
@@ -312,9 +410,8 @@ class MemoryManager:
 			addr = self._allocate(var.name, var.raw_type, parent=0, structs_manager=structs_manager, variable=var)
 			var.address = addr
 			if var.is_pointer:
-				base_type = structs_manager.get_decoded_name(var.raw_type).rstrip()
-				if base_type.endswith("*"):
-					base_type = base_type[:-1].strip()
+				desc = structs_manager.type_descriptor(var.raw_type)
+				base_type = desc.element_name if desc.is_pointer else desc.name
 				if not base_type:
 					base_type = "void"
 				dummy_name = f"{var.name}__pointee"
@@ -322,11 +419,12 @@ class MemoryManager:
 				if var.is_pointer_array:
 					array_len = max(var.pointer_array_len, 1)
 					dummy_type = f"{base_type}[{array_len}]"
-				dummy_is_pointer = structs_manager.is_pointer(dummy_type)
+				dummy_desc = structs_manager.type_descriptor(dummy_type)
+				dummy_is_pointer = dummy_desc.is_pointer
 				dummy_var = Variable(
 					name=dummy_name,
 					raw_type=dummy_type,
-					kind=structs_manager.get_type_kind(dummy_type),
+					kind=dummy_desc.kind,
 					domain=var.domain,
 					is_pointer=dummy_is_pointer,
 					points_to={},
@@ -375,56 +473,67 @@ class MemoryManager:
 		for i in range(length):
 			self._ensure_array_child(addr, var_name, i)
 
-		dummy_name = f"{var_name}__pointee"
-		for b in self._blocks:
-			if b is None or b.var is None:
-				continue
-			if b.var.name == dummy_name or b.var.name.startswith(f"{dummy_name}[") or b.var.name.startswith(f"{dummy_name}."):
+		dummy_addr = self.get_address(f"{var_name}__pointee")
+		if dummy_addr is None:
+			return
+		for b in self.iter_subtree(dummy_addr):
+			if b.var is not None:
 				b.var.hidden = True
 
 	def _allocate(self, var_name: str, type_name: str, parent: int, structs_manager: StructsManager, variable: Variable | None = None) -> int:
 		
 		"""
-		Allocate a variable by its type name, recursively allocating children.
-		Always allocates one block for the variable itself, then handles array/struct.
+		Allocate a variable by its type name, together with its struct members and
+		unknown-index array elements, by applying the type's flattened layout template.
+		Always allocates one block for the variable itself; an array element already
+		allocated under the same name is reused, as `_ensure_array_child` does.
 		"""
 
-		type_name = structs_manager.get_decoded_name(type_name)
-		addr = self._next_addr
-
-		if variable is None:
-			variable = Variable(
-				name = var_name,
-				raw_type = type_name,
-				kind = structs_manager.get_type_kind(type_name),
-				domain = VARIABLE_DOMAIN.GLOBAL,
-				is_pointer = structs_manager.is_pointer(type_name),
-				address=addr
-			)
-
-		self._blocks.append(MemoryBlock(addr, parent, variable))
-
-		self._map[var_name] = addr
-		self._next_addr += 1
+		layout = structs_manager.get_layout(type_name)
+		blocks = self._blocks
+		addrs = [0] * len(layout)
+		i = 0
+		while i < len(layout):
+			slot = layout[i]
+			name = var_name + slot.suffix
+			addr = self._next_addr
+			if slot.parent < 0:
+				block_parent = parent
+				var = variable
+			else:
+				block_parent = addrs[slot.parent]
+				parent_var = blocks[block_parent].var
+				if slot.key == self.ARRAY_UNKNOWN_INDEX:
+					if parent_var.kind != VARIABLE_KIND.ARRAY:
+						i = slot.end
+						continue
+					existing_addr = parent_var.points_to.get(slot.key)
+					if existing_addr is None:
+						existing_addr = self._map.get(name)
+					if existing_addr is not None:
+						parent_var.points_to[slot.key] = existing_addr
+						i = slot.end
+						continue
+				parent_var.points_to[slot.key] = addr
+				var = None
+
+			if var is None:
+				desc = slot.type
+				var = Variable(
+					name = name,
+					raw_type = desc.name,
+					kind = desc.kind,
+					domain = VARIABLE_DOMAIN.GLOBAL,
+					is_pointer = desc.is_pointer,
+					address=addr
+				)
 
-		# case: basic type, including builtins and pointers -> finished
-		if structs_manager.is_basic_type(type_name):
-			return addr
+			blocks.append(MemoryBlock(addr, block_parent, var))
+			if block_parent:
+				self._children.setdefault(block_parent, []).append(addr)
+			self._map[name] = addr
+			self._next_addr += 1
+			addrs[i] = addr
+			i += 1
 
-		# case: array type
-		if structs_manager.is_array(type_name):
-			self._ensure_array_child(addr, var_name, self.ARRAY_UNKNOWN_INDEX)
-			return addr
-		
-		# case: struct type
-		struct = structs_manager.get_struct(type_name)
-		if struct is None and not type_name.startswith("struct "):
-			struct = structs_manager.get_struct(f"struct {type_name}")
-
-		if struct is not None:
-			for (member_type, member_name) in zip(struct.member_types, struct.member_names):
-				variable.points_to[member_name] = self._next_addr
-				self._allocate(var_name + "." + member_name, member_type, parent=addr, structs_manager=structs_manager)
-			return addr
-		
-		raise TypeError(f"Unknown type for allocation: {type_name}")
\ No newline at end of file
+		return addrs[0]
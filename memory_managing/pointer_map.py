@@ -0,0 +1,90 @@
+"""
+Copy-on-write pointer map: pointer variable name -> target address (None if unknown).
+"""
+
+from typing import Dict, Iterator, Optional, Tuple
+
+_MAX_LAYERS = 8
+
+
+class PointerMap:
+	"""
+	A dict-like map whose state is a stack of frozen layers plus one private top layer.
+
+	fork() freezes the top layer and returns a map sharing every frozen layer, so
+	per-function copies and snapshots cost O(1); writes only ever touch the top
+	layer. Iteration follows dict order: keys in first-insertion order across all
+	layers, with the newest value for each key. changed_items() lists only what
+	was rebound since the fork, so per-function work need not visit every entry.
+	"""
+
+	__slots__ = ("_layers", "_top", "_base_len")
+
+	def __init__(self, layers: Tuple[Dict[str, Optional[int]], ...] = ()) -> None:
+		self._layers = layers  # oldest first; never mutated once shared
+		self._top: Dict[str, Optional[int]] = {}
+		self._base_len = len(layers)  # layers shared with the map this one was forked from
+
+	def fork(self) -> "PointerMap":
+		if self._top:
+			layers = self._layers + (self._top,)
+			if len(layers) > _MAX_LAYERS:
+				layers = (self._merged(layers),)
+				self._base_len = 0  # the fork base is merged away; report everything as changed
+			self._layers = layers
+			self._top = {}
+		return PointerMap(self._layers)
+
+	@staticmethod
+	def _merged(layers) -> Dict[str, Optional[int]]:
+		merged: Dict[str, Optional[int]] = {}
+		for layer in layers:
+			merged.update(layer)
+		return merged
+
+	def __getitem__(self, name: str) -> Optional[int]:
+		if name in self._top:
+			return self._top[name]
+		for layer in reversed(self._layers):
+			if name in layer:
+				return layer[name]
+		raise KeyError(name)
+
+	def get(self, name: str, default: Optional[int] = None) -> Optional[int]:
+		try:
+			return self[name]
+		except KeyError:
+			return default
+
+	def __setitem__(self, name: str, target_addr: Optional[int]) -> None:
+		self._top[name] = target_addr
+
+	def __contains__(self, name: str) -> bool:
+		if name in self._top:
+			return True
+		return any(name in layer for layer in self._layers)
+
+	def changed_items(self) -> Iterator[Tuple[str, Optional[int]]]:
+		"""
+		Entries bound since this map was forked whose value differs from the fork base,
+		in first-insertion order.
+		"""
+		base = self._layers[:self._base_len]
+		missing = object()
+		for name, target_addr in self._merged(self._layers[self._base_len:] + (self._top,)).items():
+			base_addr = missing
+			for layer in reversed(base):
+				if name in layer:
+					base_addr = layer[name]
+					break
+			if base_addr is missing or base_addr != target_addr:
+				yield name, target_addr
+
+	def items(self) -> Iterator[Tuple[str, Optional[int]]]:
+		return iter(self._merged(self._layers + (self._top,)).items())
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self._merged(self._layers + (self._top,)))
+
+	def __len__(self) -> int:
+		return len(self._merged(self._layers + (self._top,)))
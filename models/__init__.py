@@ -1,6 +1,7 @@
 from .variables import VARIABLE_DOMAIN, VARIABLE_KIND, Variable
 from .functions import Function
-from .structs import Struct, StructsManager
+from .structs import Struct, StructsManager, TypeDescriptor
+from .symbol_table import SymbolTable
 # from .summarize import Summarizer
 
 __all__ = [
@@ -10,4 +11,6 @@ __all__ = [
     "Function",
     "Struct",
     "StructsManager",
+    "TypeDescriptor",
+    "SymbolTable",
 ]
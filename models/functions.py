@@ -14,6 +14,7 @@ class Function:
         calls: Set[str] | None = None,
         non_state: Set[str] | None = None,
         ptr_init: Dict[int, int] | None = None,
+        ptr_init_names: List[tuple[str, Optional[str]]] | None = None,
         config_ptr_init_names: List[tuple[str, Optional[str]]] | None = None,
     ):
 
@@ -26,6 +27,8 @@ class Function:
         self.calls = calls or set()
         self.non_state = non_state or set()
         self.ptr_init = ptr_init or {}
+        self.ptr_init_names = ptr_init_names or [] # (pointer name, target name or None), in ptr_init order
         self.config_ptr_init_names = config_ptr_init_names or []
+        self.degraded: List[str] = []  # analysis budget fallbacks taken (parsing/budget.py)
 
     
\ No newline at end of file
@@ -30,11 +30,79 @@ BUILTIN_TYPES = set ([
     "long long", "unsigned long long", "signed long long",
     "float", "double", "long double", "_Bool", "bool",
     "size_t", "ptrdiff_t"])
+_BASE_BUILTIN_TYPES = frozenset(BUILTIN_TYPES)
 
 _structs: Dict[str, Struct] = {}
 _typeDict: Dict[str, str] = {} # typedef alias -> real type
 _typeSize: Dict[str, int] = {}
 _vis: Set[str] = set()
+_types: Dict[str, "TypeDescriptor"] = {} # decoded type name -> interned descriptor
+_typeNames: Dict[str, "TypeDescriptor"] = {} # any spelling seen -> descriptor of its decoded name
+
+
+@dataclass(eq=False)
+class TypeDescriptor:
+    """
+    Interned description of one decoded type name.
+
+    element_name/length: element type and length for arrays, pointee type for pointers.
+    struct: record definition for struct/union types (also looked up with a "struct " prefix).
+    basic: builtin or pointer, i.e. allocated as a single block.
+    """
+    name: str
+    kind: VARIABLE_KIND
+    basic: bool
+    element_name: Optional[str] = None
+    length: int = 0
+    pointer_depth: int = 0
+    struct: Optional[Struct] = None
+    _size: Optional[int] = field(default=None, repr=False)
+    _element: Optional["TypeDescriptor"] = field(default=None, repr=False)
+    _layout: Optional[List["LayoutSlot"]] = field(default=None, repr=False)
+
+    @property
+    def is_pointer(self) -> bool:
+        return self.kind == VARIABLE_KIND.POINTER
+
+    @property
+    def is_array(self) -> bool:
+        return self.kind == VARIABLE_KIND.ARRAY
+
+    @property
+    def element(self) -> Optional["TypeDescriptor"]:
+        if self._element is None and self.element_name is not None:
+            self._element = _InternType(self.element_name)
+        return self._element
+
+    @property
+    def size(self) -> int:
+        if self._size is None:
+            self._size = _CalcTypeSize(self.name)
+        return self._size
+
+    @property
+    def layout(self) -> List["LayoutSlot"]:
+        if self._layout is None:
+            self._layout = _BuildLayout(self)
+        return self._layout
+
+
+@dataclass(frozen=True)
+class LayoutSlot:
+    """
+    One block of a flattened type layout, in allocation (pre-)order.
+
+    parent: index of the parent slot, -1 for the instance itself.
+    suffix: block name relative to the instance name, e.g. ".inner.items[?]".
+    key: member name or array index under which the parent points to this block.
+    end: index one past the last slot of this block's subtree.
+    """
+    parent: int
+    suffix: str
+    key: Any
+    type: TypeDescriptor
+    end: int
+
 
 def _NormalizeTypeName(type_name: str) -> str:
     """
@@ -46,6 +114,74 @@ def _NormalizeTypeName(type_name: str) -> str:
     parts = [p for p in t.split(" ") if p not in qualifiers]
     return " ".join(parts)
 
+def _DescribeType(name: str) -> TypeDescriptor:
+    """
+    Build the descriptor of an already decoded type name.
+    """
+    if name.endswith("*"):
+        base = name
+        depth = 0
+        while base.endswith("*"):
+            base = base[:-1].rstrip()
+            depth += 1
+        return TypeDescriptor(name, VARIABLE_KIND.POINTER, True, element_name=name[:-1].strip(), pointer_depth=depth)
+    if name.endswith("]") and "[" in name:
+        base = name[: name.rfind("[")].strip()
+        length_str = name[name.rfind("[") + 1 : -1].strip()
+        length = int(length_str) if length_str.isdigit() else 1
+        return TypeDescriptor(name, VARIABLE_KIND.ARRAY, name in BUILTIN_TYPES, element_name=base, length=length)
+    struct = _structs.get(name)
+    kind = VARIABLE_KIND.RECORD if struct is not None else VARIABLE_KIND.BUILTIN
+    if struct is None and not name.startswith("struct "):
+        struct = _structs.get(f"struct {name}")
+    return TypeDescriptor(name, kind, name in BUILTIN_TYPES, struct=struct)
+
+def _InternType(type_name: str) -> TypeDescriptor:
+    """
+    Descriptor for any spelling of a type. Typedef aliases are decoded one level,
+    as `StructsManager.get_decoded_name` does.
+    """
+    desc = _typeNames.get(type_name)
+    if desc is not None:
+        return desc
+    name = _NormalizeTypeName(type_name)
+    name = _typeDict.get(name, name)
+    desc = _types.get(name)
+    if desc is None:
+        desc = _types[name] = _DescribeType(name)
+    _typeNames[type_name] = desc
+    return desc
+
+def _BuildLayout(desc: TypeDescriptor) -> List[LayoutSlot]:
+    """
+    Flatten `desc` into the blocks one instance occupies: the instance, then each
+    struct member or the unknown-index array element, recursively.
+    """
+    slots: List[Optional[LayoutSlot]] = []
+
+    def visit(d: TypeDescriptor, parent: int, suffix: str, key: Any) -> None:
+        index = len(slots)
+        slots.append(None)
+        if d.basic:
+            pass
+        elif d.kind == VARIABLE_KIND.ARRAY:
+            # -1 is MemoryManager.ARRAY_UNKNOWN_INDEX
+            visit(d.element, index, f"{suffix}[?]", -1)
+        elif d.struct is not None:
+            for member_type, member_name in zip(d.struct.member_types, d.struct.member_names):
+                visit(_InternType(member_type), index, f"{suffix}.{member_name}", member_name)
+        else:
+            raise TypeError(f"Unknown type for allocation: {d.name}")
+        slots[index] = LayoutSlot(parent, suffix, key, d, len(slots))
+
+    visit(desc, -1, "", None)
+    return slots
+
+def _ClearTypeTable() -> None:
+    # Descriptors depend on the registered structs, typedefs and enums.
+    _types.clear()
+    _typeNames.clear()
+
 # here we guarantee that `curType` is a clean type name, which means no *, no [].
 # the basic level of structs are `struct StructName`.
 def _CalcTypeSize(curType: str):
@@ -134,6 +270,19 @@ class StructsManager:
     def instance(cls) -> "StructsManager":
         return cls()
 
+    def reset(self) -> None:
+        """
+        Forget all registered structs, typedefs, enums and cached sizes.
+        """
+        _structs.clear()
+        _typeDict.clear()
+        _typeSize.clear()
+        _vis.clear()
+        _ClearTypeTable()
+        BUILTIN_TYPES.clear()
+        BUILTIN_TYPES.update(_BASE_BUILTIN_TYPES)
+        self._sizes.clear()
+
     # what: input a struct definition from libclang node
     def add_struct_from_node(self, node: Any) -> Optional[Struct]:
         """
@@ -141,6 +290,7 @@ class StructsManager:
         The node can be a STRUCT_DECL/UNION_DECL cursor or a TYPEDEF_DECL cursor
         like: typedef struct { ... } A; or typedef union { ... } A;
         """
+        _ClearTypeTable()
         if node.kind == CursorKind.TYPEDEF_DECL:
             typedef_name = getattr(node, "spelling", "") or ""
             struct_node = self._get_struct_decl_from_typedef(node)
@@ -175,6 +325,7 @@ class StructsManager:
         name = getattr(node, "spelling", "") or ""
         if not name:
             return
+        _ClearTypeTable()
         # Register both "enum X" and "X" to be safe with clang spellings.
         enum_name = f"enum {name}"
         BUILTIN_TYPES.add(enum_name)
@@ -183,43 +334,39 @@ class StructsManager:
     def get_struct(self, name: str) -> Struct | None:
         return _structs.get(name)
     
+    def type_descriptor(self, type_name: str) -> TypeDescriptor:
+        """
+        Interned descriptor of `type_name`; repeated lookups of a spelling are a dict hit.
+        """
+        return _InternType(type_name)
+
     def get_decoded_name(self, name: str) -> str:
-        name = _NormalizeTypeName(name)
-        if name in self._typeDict:
-            return self._typeDict[name]
-        return name
+        return _InternType(name).name
     
     def is_array(self, name: str) -> bool:
-        name = self.get_decoded_name(name)
-        return name.endswith("]") and "[" in name
+        return _InternType(name).kind == VARIABLE_KIND.ARRAY
     
     def is_struct(self, name: str) -> bool:
-        name = self.get_decoded_name(name)
-        return name in _structs
+        return _InternType(name).kind == VARIABLE_KIND.RECORD
     
     def is_pointer(self, name: str) -> bool:
-        name = self.get_decoded_name(name)
-        return name.endswith("*")
+        return _InternType(name).kind == VARIABLE_KIND.POINTER
     
     def get_type_kind(self, name: str) -> VARIABLE_KIND:
-        name = self.get_decoded_name(name)
-        if name.endswith("*"):
-            return VARIABLE_KIND.POINTER
-        if name.endswith("]") and "[" in name:
-            return VARIABLE_KIND.ARRAY
-        if name in _structs:
-            return VARIABLE_KIND.RECORD
-        return VARIABLE_KIND.BUILTIN
+        return _InternType(name).kind
     
     def parse_array_type(self, type_name: str) -> tuple[str, int]:
-        name = self.get_decoded_name(type_name)
-        if not self.is_array(name):
+        desc = _InternType(type_name)
+        if desc.kind != VARIABLE_KIND.ARRAY:
             raise TypeError(f"Type {type_name} is not an array type.")
-        base = name[: name.rfind("[")].strip()
-        length_str = name[name.rfind("[") + 1 : -1].strip()
-        length = int(length_str) if length_str.isdigit() else 1
-        return base, length
+        return desc.element_name, desc.length
     
+    def get_layout(self, type_name: str) -> List[LayoutSlot]:
+        """
+        Flattened block layout of one `type_name` instance, built once per decoded type.
+        """
+        return _InternType(type_name).layout
+
     def calculate_size(self):
         """
         Calculate sizes for all structs in topological order.
@@ -231,7 +378,7 @@ class StructsManager:
                 _CalcTypeSize(struct_name)
     
     def get_size(self, type_name: str) -> int:
-        return _CalcTypeSize(type_name)
+        return _InternType(type_name).size
     
     def is_basic_type(self, type_name: str) -> bool:
         t = _NormalizeTypeName(type_name)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 '''
 In summarize.py, we define classes used for outputing the summarized information.
@@ -22,4 +22,9 @@ class FunctionSummarize:
     def __init__(self, function_name: str):
         self.function_name = function_name
         self.interface_semantics = VariableSummarize()
+        # Filled in by the library API (utils/api.py); not part of the written results.
+        self.entry : Optional[str] = None
+        self.blocks : Optional[List[dict]] = None
+        # Analysis budget fallbacks taken for this function; written only when non-empty.
+        self.degraded : List[str] = []
     
\ No newline at end of file
@@ -0,0 +1,77 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from models.functions import Function
+from models.variables import Variable
+
+
+class SymbolTable:
+    """
+    Name, file and kind indexes over the project's functions and globals.
+
+    Function kinds are SOURCE (defined in a parsed file) and CONFIG (declared in a
+    function config file). When a name is defined more than once, the later
+    definition wins, which is the one the analysis parses.
+    """
+
+    SOURCE = "source"
+    CONFIG = "config"
+
+    def __init__(self, resolver: Callable[[str], Optional[Function]] | None = None) -> None:
+        # resolver(name) may register (and return) a function the table does not know yet.
+        self._resolver = resolver
+        self.clear()
+
+    def clear(self) -> None:
+        self._unresolved: Set[str] = set()
+        self._functions: Dict[str, Function] = {}
+        self._nodes: Dict[str, Any] = {}  # function name -> definition cursor (None for config functions)
+        self._kinds: Dict[str, str] = {}
+        self._by_file: Dict[str, List[Function]] = {}
+        self._globals: Dict[str, Variable] = {}
+
+    def add_function(self, func: Function, node: Any = None, kind: str = SOURCE) -> None:
+        self._functions[func.name] = func
+        self._nodes[func.name] = node
+        self._kinds[func.name] = kind
+        self._by_file.setdefault(func.source_file, []).append(func)
+
+    def _lookup(self, name: str) -> Optional[Function]:
+        func = self._functions.get(name)
+        if func is None and self._resolver is not None and name not in self._unresolved:
+            if self._resolver(name) is None:
+                self._unresolved.add(name)
+            func = self._functions.get(name)
+        return func
+
+    def __contains__(self, name: str) -> bool:
+        return self._lookup(name) is not None
+
+    def function(self, name: str) -> Optional[Function]:
+        return self._lookup(name)
+
+    def node(self, name: str) -> Any:
+        self._lookup(name)
+        return self._nodes.get(name)
+
+    def kind(self, name: str) -> Optional[str]:
+        self._lookup(name)
+        return self._kinds.get(name)
+
+    def functions_in_file(self, source_file: str) -> List[Function]:
+        return self._by_file.get(source_file, [])
+
+    def function_names(self) -> Iterable[str]:
+        return self._functions.keys()
+
+    def add_global(self, var: Variable) -> None:
+        self._globals[var.name] = var
+
+    def global_var(self, name: str) -> Optional[Variable]:
+        return self._globals.get(name)
+
+    def has_global(self, name: str) -> bool:
+        return name in self._globals
+
+    def retain_globals(self, names: Iterable[str]) -> None:
+        names = set(names)
+        self._globals = {name: var for name, var in self._globals.items() if name in names}
@@ -0,0 +1,83 @@
+"""
+Per-function analysis budgets for FuncParser.parse_function.
+
+A function that exceeds its budget is not abandoned but analyzed less precisely
+from that point on:
+
+- too many blocks allocated: constant array indexes collapse to `[?]`, so no
+  further per-element blocks are created;
+- too many cursor visits or too much wall time: the rest of the body is scanned
+  once without pointer or index resolution, and every variable it references
+  counts as a read and a write of the whole object (for a pointer, of its
+  current target).
+
+Each degradation is recorded on the Function and in its summary.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Wall time is only sampled every this many visits.
+_TIME_CHECK_INTERVAL = 64
+
+COLLAPSE_INDEXES = "collapse_indexes"
+COARSE_SCAN = "coarse_scan"
+
+
+@dataclass(frozen=True)
+class AnalysisBudget:
+	"""
+	Limits per parse_function call; None disables a limit.
+	"""
+	max_seconds: Optional[float] = None
+	max_visits: Optional[int] = None
+	max_blocks: Optional[int] = None
+
+	def enabled(self) -> bool:
+		return self.max_seconds is not None or self.max_visits is not None or self.max_blocks is not None
+
+
+class BudgetMeter:
+	"""
+	Spending of one parse_function call against an AnalysisBudget.
+	`degraded` lists "<fallback>: <limit> exceeded" entries in the order they happened.
+	"""
+
+	def __init__(self, budget: AnalysisBudget, first_addr: int) -> None:
+		self.budget = budget
+		self.first_addr = first_addr
+		self.started = time.perf_counter()
+		self.visits = 0
+		self.collapse_indexes = False
+		self.coarse = False
+		self.degraded: List[str] = []
+
+	def _degrade(self, fallback: str, limit: str) -> None:
+		self.degraded.append(f"{fallback}: {limit} exceeded")
+
+	def tick(self, next_addr: int) -> bool:
+		"""
+		Count one visited cursor; `next_addr` is the memory manager's next address.
+		Returns True once the rest of the body should be scanned coarsely.
+		"""
+		budget = self.budget
+		self.visits += 1
+		if not self.collapse_indexes and budget.max_blocks is not None and next_addr - self.first_addr > budget.max_blocks:
+			self.collapse_indexes = True
+			self._degrade(COLLAPSE_INDEXES, "max_blocks")
+		if self.coarse:
+			return True
+		if budget.max_visits is not None and self.visits > budget.max_visits:
+			self.coarse = True
+			self._degrade(COARSE_SCAN, "max_visits")
+		elif (
+			budget.max_seconds is not None and self.visits % _TIME_CHECK_INTERVAL == 0
+			and time.perf_counter() - self.started > budget.max_seconds
+		):
+			self.coarse = True
+			self._degrade(COARSE_SCAN, "max_seconds")
+		return self.coarse
+
+
+__all__ = ["AnalysisBudget", "BudgetMeter", "COARSE_SCAN", "COLLAPSE_INDEXES"]
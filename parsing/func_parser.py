@@ -3,9 +3,32 @@ from typing import Dict, Optional, Tuple, Any
 from clang.cindex import CursorKind, TypeKind
 
 from models.functions import Function
+from models.symbol_table import SymbolTable
 from models.variables import Variable, VARIABLE_DOMAIN, VARIABLE_KIND
 from models.structs import StructsManager
 from memory_managing.memory import MemoryManager
+from memory_managing.pointer_map import PointerMap
+from parsing.budget import AnalysisBudget, BudgetMeter
+from utils.profile import Profiler
+
+
+def _first_found(root, step):
+	"""
+	Depth-first search over cursors without recursion. step(cursor) returns
+	(value, children): when children is not None they are tried in order,
+	otherwise value is the result of that branch (None meaning no match).
+	"""
+	stack = [root]
+	while stack:
+		cursor = stack.pop()
+		if cursor is None:
+			continue
+		value, children = step(cursor)
+		if children is not None:
+			stack.extend(reversed(children))
+		elif value is not None:
+			return value
+	return None
 
 """
 This class is HUGE and looks like a pile of shit.
@@ -36,19 +59,23 @@ class FuncParser:
 			return
 		self._initialized = True
 		self._mem = MemoryManager.instance()
-		self._pointer_map: Dict[str, Optional[int]] = {}
+		self._pointer_map = PointerMap()
 		self._global_pointer_inits: Dict[str, Any] = {}
-		self._functions: Dict[str, tuple[Any, Function]] = {}
+		self._symbols = SymbolTable()
+		self.release_blocks = False  # release each function's param/local blocks once it is parsed
+		self.budget: Optional[AnalysisBudget] = None  # per-function limits; None analyzes every function fully
 
 	@classmethod
 	def instance(cls) -> "FuncParser":
 		return cls._instance if cls._instance is not None else cls()
 
 	# Initialize pointer map for global/param pointers and apply global initializers.
-	def initialize(self, global_vars: list[Variable], global_pointer_inits: Dict[str, Any], function_nodes: list[tuple[Any, Function]], param_pointer_defaults: Dict[str, int]) -> None:
-		self._pointer_map = {}
+	def initialize(self, global_vars: list[Variable], global_pointer_inits: Dict[str, Any], symbols: SymbolTable, param_pointer_defaults: Dict[str, int], release_blocks: bool = False, budget: Optional[AnalysisBudget] = None) -> None:
+		self.release_blocks = release_blocks
+		self.budget = budget
+		self._pointer_map = PointerMap()
 		self._global_pointer_inits = global_pointer_inits
-		self._functions = {func.name: (node, func) for node, func in function_nodes}
+		self._symbols = symbols
 		for var in global_vars:
 			if var.is_pointer:
 				self._pointer_map[var.name] = None
@@ -62,6 +89,8 @@ class FuncParser:
 			if target_addr is not None:
 				self._pointer_map[pointer_name] = target_addr
 				self._mem.add_pointer_ref(target_addr, pointer_name)
+		# Every function starts from these references; see parse_function.
+		self._mem.mark_pointer_ref_baseline()
 
 	# Aggregate child read/write information to parents.
 	def finalize(self) -> None:
@@ -84,26 +113,16 @@ class FuncParser:
 			return cursor
 
 		def resolve_decl_name(cursor) -> Optional[str]:
-			cursor = unwrap(cursor)
-			if cursor is None:
+			while True:
+				cursor = unwrap(cursor)
+				if cursor is None:
+					return None
+				if cursor.kind in (CursorKind.UNARY_OPERATOR, CursorKind.MEMBER_REF_EXPR, CursorKind.ARRAY_SUBSCRIPT_EXPR):
+					cursor = next(cursor.get_children(), None)
+					continue
+				if cursor.kind == CursorKind.DECL_REF_EXPR:
+					return cursor.spelling
 				return None
-			if cursor.kind == CursorKind.UNARY_OPERATOR:
-				child = next(cursor.get_children(), None)
-				return resolve_decl_name(child)
-			if cursor.kind == CursorKind.DECL_REF_EXPR:
-				return cursor.spelling
-			if cursor.kind == CursorKind.MEMBER_REF_EXPR:
-				child = next(cursor.get_children(), None)
-				return resolve_decl_name(child)
-			if cursor.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
-				child = next(cursor.get_children(), None)
-				return resolve_decl_name(child)
-			if cursor.kind == CursorKind.CSTYLE_CAST_EXPR:
-				for child in cursor.get_children():
-					name = resolve_decl_name(child)
-					if name:
-						return name
-			return None
 
 		def record_array_index(base_name: str, index_cursor) -> None:
 			param_var = param_map.get(base_name)
@@ -121,9 +140,9 @@ class FuncParser:
 			if not callee_name:
 				referenced = getattr(cursor, "referenced", None)
 				callee_name = getattr(referenced, "spelling", "") if referenced else ""
-			if not callee_name or callee_name not in self._functions:
+			if not callee_name or callee_name not in self._symbols:
 				return
-			_, callee_func = self._functions[callee_name]
+			callee_func = self._symbols.function(callee_name)
 			param_names = callee_func.params or []
 			arg_nodes = list(cursor.get_arguments())
 			for i, param_name in enumerate(param_names):
@@ -140,9 +159,12 @@ class FuncParser:
 				caller_var.is_pointer_array = True
 				caller_var.pointer_array_len = max(caller_var.pointer_array_len, param_var.pointer_array_len)
 
-		def walk(cursor) -> None:
+		# Pre-order walk with an explicit stack.
+		stack = [node]
+		while stack:
+			cursor = stack.pop()
 			if cursor is None:
-				return
+				continue
 			if cursor.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
 				children = list(cursor.get_children())
 				if len(children) >= 2:
@@ -151,10 +173,7 @@ class FuncParser:
 						record_array_index(base, children[1])
 			if cursor.kind == CursorKind.CALL_EXPR:
 				handle_call(cursor)
-			for child in cursor.get_children():
-				walk(child)
-
-		walk(node)
+			stack.extend(reversed(list(cursor.get_children())))
 
 	# Extract a constant integer literal from a cursor if present.
 	def _get_integer_literal_expr(self, cursor) -> Optional[str]:
@@ -170,41 +189,49 @@ class FuncParser:
 
 	# Resolve a variable access expression to a fully-qualified name.
 	def _resolve_var_access_expr(self, cursor) -> Optional[str]:
-		if cursor is None:
-			return None
-		if cursor.kind in self.UNWRAP_KINDS:
-			child = next(cursor.get_children(), None)
-			return self._resolve_var_access_expr(child)
-		if cursor.kind == CursorKind.DECL_REF_EXPR:
-			return cursor.spelling
-		if cursor.kind == CursorKind.MEMBER_REF_EXPR:
-			children = list(cursor.get_children())
-			if not children:
-				return None
-			base_name = self._resolve_var_access_expr(children[0])
-			if not base_name:
-				return None
-			return f"{base_name}.{cursor.spelling}"
-		if cursor.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
-			children = list(cursor.get_children())
-			if len(children) < 2:
-				return None
-			base_name = self._resolve_var_access_expr(children[0])
-			if not base_name:
+		# Descend to the base identifier, then rebuild the name outwards.
+		wrappers = []
+		while True:
+			if cursor is None:
 				return None
-			index_val = self._get_integer_literal_expr(children[1])
-			if index_val is None:
-				return base_name
-			return f"{base_name}[{index_val}]"
-		return None
+			if cursor.kind in self.UNWRAP_KINDS:
+				cursor = next(cursor.get_children(), None)
+				continue
+			if cursor.kind == CursorKind.MEMBER_REF_EXPR:
+				children = list(cursor.get_children())
+				if not children:
+					return None
+				wrappers.append((cursor, None))
+				cursor = children[0]
+				continue
+			if cursor.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
+				children = list(cursor.get_children())
+				if len(children) < 2:
+					return None
+				wrappers.append((cursor, children[1]))
+				cursor = children[0]
+				continue
+			if cursor.kind == CursorKind.DECL_REF_EXPR:
+				break
+			return None
+		name = cursor.spelling
+		if wrappers and not name:
+			return None
+		for wrapper, index_cursor in reversed(wrappers):
+			if index_cursor is None:
+				name = f"{name}.{wrapper.spelling}"
+				continue
+			index_val = self._get_integer_literal_expr(index_cursor)
+			if index_val is not None:
+				name = f"{name}[{index_val}]"
+		return name
 
 	# Resolve pointer initializer/assignment expression to a concrete address.
 	def _resolve_pointer_target_expr(self, expr) -> Optional[int]:
+		while expr is not None and expr.kind in self.UNWRAP_KINDS:
+			expr = next(expr.get_children(), None)
 		if expr is None:
 			return None
-		if expr.kind in self.UNWRAP_KINDS:
-			child = next(expr.get_children(), None)
-			return self._resolve_pointer_target_expr(child)
 		if expr.kind == CursorKind.UNARY_OPERATOR:
 			tokens = [t.spelling for t in expr.get_tokens()]
 			if "&" in tokens:
@@ -218,24 +245,27 @@ class FuncParser:
 
 	# Parse a function node in sequential order and update Variable read/write sets.
 	def parse_function(self, node, func: Function) -> None:
+		# Back to the global initializers' references; only blocks changed since are reset.
 		self._mem.clear_pointer_refs()
-		for pointer_name, init_cursor in self._global_pointer_inits.items():
-			target_addr = self._resolve_pointer_target_expr(init_cursor)
-			if target_addr is not None:
-				self._mem.add_pointer_ref(target_addr, pointer_name)
 
+		arena_start = self._mem.arena_start()
+		meter = None
+		if self.budget is not None and self.budget.enabled():
+			meter = BudgetMeter(self.budget, arena_start)
 		if node is not None:
 			self._scan_pointer_arrays(node, func)
-		param_pointer_defaults = self._mem.allocate_params_for_function(list(func.vars_dict.values()) if func.vars_dict else [])
+		with Profiler.phase("allocate_params", function=func.name):
+			param_pointer_defaults = self._mem.allocate_params_for_function(list(func.vars_dict.values()) if func.vars_dict else [])
 
-		pointer_map: Dict[str, Optional[int]] = dict(self._pointer_map)
+		# O(1) fork: only the entries this function rebinds are copied.
+		pointer_map = self._pointer_map.fork()
 		for pointer_name, addr in param_pointer_defaults.items():
 			pointer_map[pointer_name] = addr
 
 		if node is not None:
 			written: Dict[str, bool] = {}
 			call_stack = set()
-			self._parse_function_with_context(node, func, func, pointer_map, written, call_stack)
+			self._parse_function_with_context(node, func, func, pointer_map, written, call_stack, meter)
 		else:
 			for src_name, tgt_name in getattr(func, "config_ptr_init_names", []):
 				src_addr = self._mem.ensure_address(src_name)
@@ -253,8 +283,10 @@ class FuncParser:
 					src_block.var.ptr_target = tgt_addr if tgt_addr is not None else -1
 				if tgt_addr is not None:
 					self._mem.add_pointer_ref(tgt_addr, src_name)
+		func.degraded = meter.degraded if meter is not None else []
+		# Only the pointers this function rebound: every other one keeps the caller's binding.
 		func.ptr_init = {}
-		for pointer_name, target_addr in pointer_map.items():
+		for pointer_name, target_addr in pointer_map.changed_items():
 			pointer_addr = self._mem.ensure_address(pointer_name)
 			if pointer_addr is None:
 				continue
@@ -266,15 +298,30 @@ class FuncParser:
 				final_target = block.var.ptr_target
 			func.ptr_init[pointer_addr] = final_target if final_target is not None else -1
 
+		# Callers merge ptr_init by name, so it stays valid once this function's blocks are released.
+		func.ptr_init_names = []
+		for pointer_addr, target_addr in func.ptr_init.items():
+			target_name: Optional[str] = None
+			if target_addr >= 0:
+				target_block = self._mem.get_block(target_addr)
+				if target_block is not None and target_block.var is not None:
+					target_name = target_block.var.name
+			func.ptr_init_names.append((self._mem.get_block(pointer_addr).var.name, target_name))
+
+		if self.release_blocks:
+			released = self._mem.release_arena(arena_start, f"<{func.name}>")
+			Profiler.count("arena.released", released)
+
 	# Parse with shared pointer map and root function attribution.
 	def _parse_function_with_context(
 		self,
 		node,
 		current_func: Function,
 		root_func: Function,
-		pointer_map: Dict[str, Optional[int]],
+		pointer_map: PointerMap,
 		written: Dict[str, bool],
-		call_stack: set[str]
+		call_stack: set[str],
+		meter: Optional[BudgetMeter] = None
 	) -> None:
 		if current_func.name in call_stack:
 			return
@@ -395,89 +442,82 @@ class FuncParser:
 				return tokens[0]
 			return None
 
+		# Name of the block a pointer variable currently targets, if known.
+		def pointee_name(pointer_name: str) -> Optional[str]:
+			ptr_key = resolve_pointer_key(pointer_name)
+			if ptr_key:
+				target_addr = get_pointer_target_by_key(ptr_key)
+				if target_addr is not None:
+					block = self._mem.get_block(target_addr)
+					if block is not None and block.var is not None:
+						return block.var.name
+			return None
+
 		# Resolve an access expression to a variable name and non-constant index flag.
+		# Casts try each operand in turn; member and subscript nodes are kept on a linked
+		# chain and applied innermost-first once the base identifier is found.
 		def resolve_var_access(cursor) -> Tuple[Optional[str], bool]:
-			if cursor.kind == CursorKind.CSTYLE_CAST_EXPR:
-				for child in cursor.get_children():
-					name, nonconst = resolve_var_access(child)
-					if name:
-						return name, nonconst
-				return None, False
-			if cursor.kind in FuncParser.UNWRAP_KINDS:
-				child = next(cursor.get_children(), None)
-				return resolve_var_access(child) if child is not None else (None, False)
-			if cursor.kind == CursorKind.UNARY_OPERATOR and get_operator(cursor) == "&":
-				child = next(cursor.get_children(), None)
-				return resolve_var_access(child) if child is not None else (None, False)
-			if cursor.kind == CursorKind.DECL_REF_EXPR:
-				return cursor.spelling, False
-			if cursor.kind == CursorKind.MEMBER_REF_EXPR:
-				children = list(cursor.get_children())
-				if not children:
-					return None, False
-				base_name, nonconst = resolve_var_access(children[0])
-				if not base_name:
-					return None, False
-				ptr_key = resolve_pointer_key(base_name)
-				if ptr_key:
-					target_addr = get_pointer_target_by_key(ptr_key)
-					if target_addr is not None:
-						block = self._mem.get_block(target_addr)
-						if block is not None and block.var is not None:
-							base_name = block.var.name
-				return f"{base_name}.{cursor.spelling}", nonconst
-			if cursor.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
-				children = list(cursor.get_children())
-				if len(children) < 2:
-					return None, False
-				base_name, _ = resolve_var_access(children[0])
-				if not base_name:
-					return None, False
-				ptr_key = resolve_pointer_key(base_name)
-				if ptr_key:
-					target_addr = get_pointer_target_by_key(ptr_key)
-					if target_addr is not None:
-						block = self._mem.get_block(target_addr)
-						if block is not None and block.var is not None:
-							# Pointer used as array: treat as access to pointee memory.
-							return block.var.name, True
-				index_val = get_integer_literal(children[1])
-				if index_val is None:
-					return f"{base_name}[?]", True
-				return f"{base_name}[{index_val}]", False
+			stack = [(cursor, None)]
+			while stack:
+				cursor, wrappers = stack.pop()
+				kind = cursor.kind
+				if kind == CursorKind.CSTYLE_CAST_EXPR:
+					stack.extend((child, wrappers) for child in reversed(list(cursor.get_children())))
+					continue
+				if kind in FuncParser.UNWRAP_KINDS or (kind == CursorKind.UNARY_OPERATOR and get_operator(cursor) == "&"):
+					child = next(cursor.get_children(), None)
+					if child is not None:
+						stack.append((child, wrappers))
+					continue
+				if kind == CursorKind.MEMBER_REF_EXPR:
+					children = list(cursor.get_children())
+					if children:
+						stack.append((children[0], ((cursor, None), wrappers)))
+					continue
+				if kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
+					children = list(cursor.get_children())
+					if len(children) >= 2:
+						stack.append((children[0], ((cursor, children[1]), wrappers)))
+					continue
+				if kind != CursorKind.DECL_REF_EXPR or not cursor.spelling:
+					continue
+				name, nonconst = cursor.spelling, False
+				while wrappers is not None:
+					(wrapper, index_cursor), wrappers = wrappers
+					target_name = pointee_name(name)
+					if index_cursor is None:
+						name = f"{target_name or name}.{wrapper.spelling}"
+						continue
+					if target_name is not None:
+						# Pointer used as array: treat as access to pointee memory.
+						name, nonconst = target_name, True
+						continue
+					index_val = None if meter is not None and meter.collapse_indexes else get_integer_literal(index_cursor)
+					if index_val is None:
+						name, nonconst = f"{name}[?]", True
+					else:
+						name, nonconst = f"{name}[{index_val}]", False
+				return name, nonconst
 			return None, False
 
+		def pointer_name_step(cursor):
+			kind = cursor.kind
+			if kind in (CursorKind.CSTYLE_CAST_EXPR, CursorKind.BINARY_OPERATOR, CursorKind.COMPOUND_ASSIGNMENT_OPERATOR, CursorKind.CONDITIONAL_OPERATOR):
+				return None, list(cursor.get_children())
+			if kind in FuncParser.UNWRAP_KINDS or kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
+				return None, [next(cursor.get_children(), None)]
+			if kind == CursorKind.UNARY_OPERATOR and get_operator(cursor) in ("*", "&"):
+				return None, [next(cursor.get_children(), None)]
+			if kind == CursorKind.MEMBER_REF_EXPR:
+				name, _ = resolve_var_access(cursor)
+				return name or None, None
+			if kind == CursorKind.DECL_REF_EXPR:
+				return cursor.spelling or None, None
+			return None, None
+
 		# Resolve a pointer variable name from an expression.
 		def resolve_pointer_name(cursor) -> Optional[str]:
-			if cursor is None:
-				return None
-			if cursor.kind == CursorKind.CSTYLE_CAST_EXPR:
-				for child in cursor.get_children():
-					name = resolve_pointer_name(child)
-					if name:
-						return name
-				return None
-			if cursor.kind in FuncParser.UNWRAP_KINDS:
-				child = next(cursor.get_children(), None)
-				return resolve_pointer_name(child)
-			if cursor.kind == CursorKind.UNARY_OPERATOR and get_operator(cursor) in ("*", "&"):
-				child = next(cursor.get_children(), None)
-				return resolve_pointer_name(child)
-			if cursor.kind in (CursorKind.BINARY_OPERATOR, CursorKind.COMPOUND_ASSIGNMENT_OPERATOR, CursorKind.CONDITIONAL_OPERATOR):
-				for child in cursor.get_children():
-					name = resolve_pointer_name(child)
-					if name:
-						return name
-				return None
-			if cursor.kind == CursorKind.MEMBER_REF_EXPR:
-				name, _ = resolve_var_access(cursor)
-				return name
-			if cursor.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
-				child = next(cursor.get_children(), None)
-				return resolve_pointer_name(child)
-			if cursor.kind == CursorKind.DECL_REF_EXPR:
-				return cursor.spelling
-			return None
+			return _first_found(cursor, pointer_name_step)
 
 		# Update pointer mapping and memory back-references.
 		def update_pointer_mapping(pointer_name: str, target_addr: Optional[int]) -> None:
@@ -510,17 +550,10 @@ class FuncParser:
 
 		# Resolve a pointer initializer/assignment target to an address.
 		def resolve_pointer_target(expr) -> Optional[int]:
+			while expr is not None and expr.kind in FuncParser.UNWRAP_KINDS:
+				expr = next(expr.get_children(), None)
 			if expr is None:
 				return None
-			if expr.kind in FuncParser.UNWRAP_KINDS:
-				child = next(expr.get_children(), None)
-				return resolve_pointer_target(child)
-			if expr.kind == CursorKind.CSTYLE_CAST_EXPR:
-				for child in expr.get_children():
-					addr = resolve_pointer_target(child)
-					if addr is not None:
-						return addr
-				return None
 			if expr.kind == CursorKind.UNARY_OPERATOR and get_operator(expr) == "&":
 				child = next(expr.get_children(), None)
 				if child is None:
@@ -539,18 +572,94 @@ class FuncParser:
 				return get_addr_for_name(name) if name else None
 			return None
 
+		# Collect reads inside a call argument expression (pre-order, explicit stack).
+		def collect_arg_reads(root) -> None:
+			stack = [root]
+			while stack:
+				expr = stack.pop()
+				if expr is None:
+					continue
+				if expr.kind == CursorKind.CSTYLE_CAST_EXPR:
+					stack.extend(reversed(list(expr.get_children())))
+					continue
+				if expr.kind in FuncParser.UNWRAP_KINDS:
+					stack.append(next(expr.get_children(), None))
+					continue
+				if expr.kind == CursorKind.UNARY_OPERATOR and get_operator(expr) == "*":
+					child = next(expr.get_children(), None)
+					ptr_name = resolve_pointer_name(child)
+					ptr_key = resolve_pointer_key(ptr_name)
+					if ptr_key:
+						target_addr = get_pointer_target_by_key(ptr_key)
+						if target_addr is not None:
+							mark_read(target_addr)
+					continue
+				if expr.kind == CursorKind.UNARY_OPERATOR and get_operator(expr) == "&":
+					# Taking address should not count as a read, but index expressions are reads.
+					child = next(expr.get_children(), None)
+					if child is not None and child.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
+						children = list(child.get_children())
+						if len(children) >= 2:
+							stack.append(children[1])
+					continue
+				name, _ = resolve_var_access(expr)
+				if name:
+					addr = get_addr_for_name(name)
+					if addr is not None:
+						block = self._mem.get_block(addr)
+						if block is not None and block.var is not None and not block.var.is_pointer:
+							# Array name used as a pointer (e.g., function argument) does not count as read.
+							if not (expr.kind == CursorKind.DECL_REF_EXPR and block.var.kind.name == "ARRAY"):
+								mark_read(addr)
+					# Avoid double-counting base identifiers in member expressions.
+					if expr.kind == CursorKind.MEMBER_REF_EXPR:
+						children = list(expr.get_children())
+						if children:
+							stack.append(children[0])
+						continue
+					if expr.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
+						# ARRAY_SUBSCRIPT_EXPR semantically has two key children: base and index.
+						# Only traverse those two to avoid double-counting implicit/extra nodes.
+						children = list(expr.get_children())
+						if len(children) >= 2:
+							stack.append(children[1])
+							stack.append(children[0])
+						continue
+				stack.extend(reversed(ordered_children(expr)))
+
+		# The body is walked with an explicit work stack instead of recursion, so deep
+		# else-if chains and wide expressions cannot hit the recursion limit. Each item
+		# is (handler, cursor, is_compound); a handler does its own work and pushes the
+		# nodes it would have recursed into, in reverse order, so evaluation order is kept.
+		work: list = []
+
+		def push_expr(cursor) -> None:
+			work.append((visit_expr, cursor, False))
+
+		def push_exprs(cursors) -> None:
+			for cursor in reversed(cursors):
+				work.append((visit_expr, cursor, False))
+
+		def push_lvalue(cursor, is_compound: bool) -> None:
+			work.append((visit_lvalue, cursor, is_compound))
+
 		# Handle lvalue writes, including compound assignments.
-		def handle_lvalue(cursor, is_compound: bool) -> None:
+		def visit_lvalue(cursor, is_compound: bool) -> None:
 			if cursor.kind in FuncParser.UNWRAP_KINDS:
 				child = next(cursor.get_children(), None)
 				if child is not None:
-					handle_lvalue(child, is_compound)
+					push_lvalue(child, is_compound)
 				return
 			if cursor.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
 				children = list(cursor.get_children())
 				if len(children) >= 2:
-					# Index expression should be treated as read.
-					handle_expr(children[1])
+					# Index expression should be treated as read, before the write itself.
+					work.append((finish_lvalue, cursor, is_compound))
+					push_expr(children[1])
+					return
+			finish_lvalue(cursor, is_compound)
+
+		def finish_lvalue(cursor, is_compound: bool) -> None:
 			if cursor.kind == CursorKind.UNARY_OPERATOR and get_operator(cursor) == "*":
 				child = next(cursor.get_children(), None)
 				ptr_name = resolve_pointer_name(child)
@@ -573,410 +682,354 @@ class FuncParser:
 			else:
 				handle_access(name, nonconst, read=False, write=True)
 
-		# Walk expression nodes and apply read/write rules.
-		def handle_expr(cursor) -> None:
-			if cursor.kind == CursorKind.VAR_DECL:
-				children = list(cursor.get_children())
-				# Track local pointer declarations and initializers.
-				var_name = cursor.spelling
-				if var_name:
-					local_key = f"{func_prefix}{var_name}"
-					if self._mem.ensure_address(local_key) is None:
-						local_type = cursor.type
-						raw_type = local_type.spelling
-						canonical_type = local_type.get_canonical()
-						if canonical_type.kind == TypeKind.POINTER:
-							local_kind = VARIABLE_KIND.POINTER
-						elif canonical_type.kind == TypeKind.RECORD:
-							local_kind = VARIABLE_KIND.RECORD
-						elif canonical_type.kind in [TypeKind.CONSTANTARRAY, TypeKind.INCOMPLETEARRAY, TypeKind.VARIABLEARRAY, TypeKind.DEPENDENTSIZEDARRAY]:
-							local_kind = VARIABLE_KIND.ARRAY
-						else:
-							local_kind = VARIABLE_KIND.BUILTIN
-						is_pointer_local = (canonical_type.kind == TypeKind.POINTER)
-						local_var = Variable(
-							name=local_key,
-							raw_type=raw_type,
-							kind=local_kind,
-							domain=VARIABLE_DOMAIN.LOCAL,
-							is_pointer=is_pointer_local,
-							points_to={},
-						)
-						self._mem.allocate_local(local_var)
-				if var_name and cursor.type.kind == TypeKind.POINTER:
-					local_key = f"{func_prefix}{var_name}"
-					pointer_map[local_key] = None
-					init_child = None
-					for child in children:
-						if child.kind != CursorKind.TYPE_REF:
-							init_child = child
-							break
-					if init_child is not None:
-						target_addr = resolve_pointer_target(init_child)
-						update_pointer_mapping(local_key, target_addr)
-						handle_expr(init_child)
-					return
+		def visit_var_decl(cursor) -> None:
+			children = list(cursor.get_children())
+			# Track local pointer declarations and initializers.
+			var_name = cursor.spelling
+			if var_name:
+				local_key = f"{func_prefix}{var_name}"
+				if self._mem.ensure_address(local_key) is None:
+					local_type = cursor.type
+					raw_type = local_type.spelling
+					canonical_type = local_type.get_canonical()
+					if canonical_type.kind == TypeKind.POINTER:
+						local_kind = VARIABLE_KIND.POINTER
+					elif canonical_type.kind == TypeKind.RECORD:
+						local_kind = VARIABLE_KIND.RECORD
+					elif canonical_type.kind in [TypeKind.CONSTANTARRAY, TypeKind.INCOMPLETEARRAY, TypeKind.VARIABLEARRAY, TypeKind.DEPENDENTSIZEDARRAY]:
+						local_kind = VARIABLE_KIND.ARRAY
+					else:
+						local_kind = VARIABLE_KIND.BUILTIN
+					is_pointer_local = (canonical_type.kind == TypeKind.POINTER)
+					local_var = Variable(
+						name=local_key,
+						raw_type=raw_type,
+						kind=local_kind,
+						domain=VARIABLE_DOMAIN.LOCAL,
+						is_pointer=is_pointer_local,
+						points_to={},
+					)
+					self._mem.allocate_local(local_var)
+			if var_name and cursor.type.kind == TypeKind.POINTER:
+				local_key = f"{func_prefix}{var_name}"
+				pointer_map[local_key] = None
+				init_child = None
 				for child in children:
-					handle_expr(child)
+					if child.kind != CursorKind.TYPE_REF:
+						init_child = child
+						break
+				if init_child is not None:
+					target_addr = resolve_pointer_target(init_child)
+					update_pointer_mapping(local_key, target_addr)
+					push_expr(init_child)
 				return
-			
-			if cursor.kind == CursorKind.CALL_EXPR:
-				# Mark global non-pointer arguments (any occurrence) as reads.
-				# Collect reads inside a call argument expression.
-				def collect_arg_reads(expr) -> None:
-					if expr is None:
+			push_exprs(children)
+
+		def visit_call(cursor) -> None:
+			# Mark global non-pointer arguments (any occurrence) as reads.
+			for arg in cursor.get_arguments():
+				collect_arg_reads(arg)
+
+			callee_name = cursor.spelling or ""
+			if not callee_name:
+				referenced = getattr(cursor, "referenced", None)
+				callee_name = getattr(referenced, "spelling", "") if referenced else ""
+
+			if callee_name and callee_name in self._symbols:
+				callee_func = self._symbols.function(callee_name)
+				param_names = callee_func.params or []
+				arg_nodes = list(cursor.get_arguments())
+
+				# Build param info for pointer params (map to actual target address).
+				param_targets: Dict[str, Optional[int]] = {}
+				param_arg_names: Dict[str, Optional[str]] = {}
+				for i, param_name in enumerate(param_names):
+					if i >= len(arg_nodes):
+						break
+					param_key = f"<{callee_func.name}>{param_name}"
+					param_var = callee_func.vars_dict.get(param_key) if callee_func.vars_dict else None
+					if param_var is not None and (param_var.is_pointer or param_var.is_pointer_array):
+						param_targets[param_name] = resolve_pointer_target(arg_nodes[i])
+						arg_name, _ = resolve_var_access(arg_nodes[i])
+						param_arg_names[param_name] = arg_name
+						if arg_name:
+							add_non_state_name(arg_name)
+
+				# Merge cached callee results into root_func.
+				def merge_global_read(var_name: str) -> None:
+					addr = self._mem.ensure_address(var_name)
+					if addr is None:
 						return
-					if expr.kind == CursorKind.CSTYLE_CAST_EXPR:
-						for child in expr.get_children():
-							collect_arg_reads(child)
+					add_non_state_name(var_name)
+					mark_read(addr)
+
+				def merge_global_write(var_name: str) -> None:
+					addr = self._mem.ensure_address(var_name)
+					if addr is None:
 						return
-					if expr.kind in FuncParser.UNWRAP_KINDS:
-						child = next(expr.get_children(), None)
-						collect_arg_reads(child)
+					add_non_state_name(var_name)
+					mark_write(addr)
+
+				def mark_non_state_by_addr(addr: int) -> None:
+					block = self._mem.get_block(addr)
+					if block is None or block.var is None:
 						return
-					if expr.kind == CursorKind.UNARY_OPERATOR and get_operator(expr) == "*":
-						child = next(expr.get_children(), None)
-						ptr_name = resolve_pointer_name(child)
-						ptr_key = resolve_pointer_key(ptr_name)
-						if ptr_key:
-							target_addr = get_pointer_target_by_key(ptr_key)
+					add_non_state_name(block.var.name)
+
+				prefix = f"<{callee_func.name}>"
+				for var_name in list(callee_func.reads):
+					if var_name.startswith(prefix):
+						# Handle pointer-param dummy reads only.
+						if "__pointee[" in var_name:
+							param_name = var_name[len(prefix):].split("__pointee", 1)[0]
+							idx = var_name.split("__pointee[", 1)[1].removesuffix("]")
+							target_addr = param_targets.get(param_name)
+							if target_addr is not None:
+								block = self._mem.get_block(target_addr)
+								base_name = block.var.name if block and block.var else None
+								arg_name = param_arg_names.get(param_name) or base_name
+								if arg_name:
+									add_non_state_name(arg_name)
+									elem_addr = None if meter is not None and meter.collapse_indexes else get_addr_for_name(f"{arg_name}[{idx}]")
+									if elem_addr is not None:
+										mark_read(elem_addr)
+									else:
+										mark_read(target_addr)
+							continue
+						if var_name.endswith("__pointee"):
+							param_name = var_name[len(prefix):].removesuffix("__pointee")
+							target_addr = param_targets.get(param_name)
+							arg_name = param_arg_names.get(param_name)
 							if target_addr is not None:
+								mark_non_state_by_addr(target_addr)
+								if arg_name:
+									add_non_state_name(arg_name)
 								mark_read(target_addr)
-						return
-					if expr.kind == CursorKind.UNARY_OPERATOR and get_operator(expr) == "&":
-						# Taking address should not count as a read, but index expressions are reads.
-						child = next(expr.get_children(), None)
-						if child is not None and child.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
-							children = list(child.get_children())
-							if len(children) >= 2:
-								collect_arg_reads(children[1])
-						return
-					name, _ = resolve_var_access(expr)
-					if name:
-						addr = get_addr_for_name(name)
-						if addr is not None:
-							block = self._mem.get_block(addr)
-							if block is not None and block.var is not None and not block.var.is_pointer:
-								# Array name used as a pointer (e.g., function argument) does not count as read.
-								if not (expr.kind == CursorKind.DECL_REF_EXPR and block.var.kind.name == "ARRAY"):
-									mark_read(addr)
-						# Avoid double-counting base identifiers in member expressions.
-						if expr.kind == CursorKind.MEMBER_REF_EXPR:
-							children = list(expr.get_children())
-							if children:
-								collect_arg_reads(children[0])
-							return
-						if expr.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
-							# ARRAY_SUBSCRIPT_EXPR semantically has two key children: base and index.
-							# Only traverse those two to avoid double-counting implicit/extra nodes.
-							children = list(expr.get_children())
-							if len(children) >= 2:
-								collect_arg_reads(children[0])
-								collect_arg_reads(children[1])
-							return
-					for child in ordered_children(expr):
-						collect_arg_reads(child)
-
-				for arg in cursor.get_arguments():
-					collect_arg_reads(arg)
-
-				callee_name = cursor.spelling or ""
-				if not callee_name:
-					referenced = getattr(cursor, "referenced", None)
-					callee_name = getattr(referenced, "spelling", "") if referenced else ""
-
-				if callee_name and callee_name in self._functions:
-					callee_node, callee_func = self._functions[callee_name]
-					param_names = callee_func.params or []
-					arg_nodes = list(cursor.get_arguments())
-
-					# Build param info for pointer params (map to actual target address).
-					param_targets: Dict[str, Optional[int]] = {}
-					param_arg_names: Dict[str, Optional[str]] = {}
-					for i, param_name in enumerate(param_names):
-						if i >= len(arg_nodes):
-							break
-						param_key = f"<{callee_func.name}>{param_name}"
-						param_var = callee_func.vars_dict.get(param_key) if callee_func.vars_dict else None
-						if param_var is not None and (param_var.is_pointer or param_var.is_pointer_array):
-							param_targets[param_name] = resolve_pointer_target(arg_nodes[i])
-							arg_name, _ = resolve_var_access(arg_nodes[i])
-							param_arg_names[param_name] = arg_name
-							if arg_name:
+							elif arg_name:
 								add_non_state_name(arg_name)
-
-					# Merge cached callee results into root_func.
-					def merge_global_read(var_name: str) -> None:
-						addr = self._mem.ensure_address(var_name)
-						if addr is None:
-							return
-						add_non_state_name(var_name)
-						mark_read(addr)
-
-					def merge_global_write(var_name: str) -> None:
-						addr = self._mem.ensure_address(var_name)
-						if addr is None:
-							return
-						add_non_state_name(var_name)
-						mark_write(addr)
-
-					def mark_non_state_by_addr(addr: int) -> None:
-						block = self._mem.get_block(addr)
-						if block is None or block.var is None:
-							return
-						add_non_state_name(block.var.name)
-
-					prefix = f"<{callee_func.name}>"
-					for var_name in list(callee_func.reads):
-						if var_name.startswith(prefix):
-							# Handle pointer-param dummy reads only.
-							if "__pointee[" in var_name:
-								param_name = var_name[len(prefix):].split("__pointee", 1)[0]
-								idx = var_name.split("__pointee[", 1)[1].removesuffix("]")
-								target_addr = param_targets.get(param_name)
-								if target_addr is not None:
-									block = self._mem.get_block(target_addr)
-									base_name = block.var.name if block and block.var else None
-									arg_name = param_arg_names.get(param_name) or base_name
-									if arg_name:
-										add_non_state_name(arg_name)
-										elem_addr = get_addr_for_name(f"{arg_name}[{idx}]")
-										if elem_addr is not None:
-											mark_read(elem_addr)
-										else:
-											mark_read(target_addr)
-								continue
-							if var_name.endswith("__pointee"):
-								param_name = var_name[len(prefix):].removesuffix("__pointee")
-								target_addr = param_targets.get(param_name)
-								arg_name = param_arg_names.get(param_name)
+								arg_addr = get_addr_for_name(arg_name)
+								if arg_addr is not None:
+									mark_pointer_read(arg_addr)
+							continue
+						# Handle pointer-param array elements allocated as params.
+						local_name = var_name[len(prefix):]
+						param_base = local_name.split("[", 1)[0].split(".", 1)[0]
+						arg_name = param_arg_names.get(param_base)
+						if arg_name:
+							add_non_state_name(arg_name)
+							mapped_name = f"{arg_name}{local_name[len(param_base):]}"
+							mapped_addr = get_addr_for_name(mapped_name)
+							if mapped_addr is not None:
+								mark_read(mapped_addr)
+							else:
+								target_addr = param_targets.get(param_base)
 								if target_addr is not None:
-									mark_non_state_by_addr(target_addr)
-									if arg_name:
-										add_non_state_name(arg_name)
 									mark_read(target_addr)
-								elif arg_name:
+						# Non-pointer params are counted via argument evaluation, skip here.
+						continue
+					merge_global_read(var_name)
+
+				for var_name in list(callee_func.writes):
+					if var_name.startswith(prefix):
+						if "__pointee[" in var_name:
+							param_name = var_name[len(prefix):].split("__pointee", 1)[0]
+							idx = var_name.split("__pointee[", 1)[1].removesuffix("]")
+							target_addr = param_targets.get(param_name)
+							if target_addr is not None:
+								block = self._mem.get_block(target_addr)
+								base_name = block.var.name if block and block.var else None
+								arg_name = param_arg_names.get(param_name) or base_name
+								if arg_name:
 									add_non_state_name(arg_name)
-									arg_addr = get_addr_for_name(arg_name)
-									if arg_addr is not None:
-										mark_pointer_read(arg_addr)
-								continue
-							# Handle pointer-param array elements allocated as params.
-							local_name = var_name[len(prefix):]
-							param_base = local_name.split("[", 1)[0].split(".", 1)[0]
-							arg_name = param_arg_names.get(param_base)
-							if arg_name:
-								add_non_state_name(arg_name)
-								mapped_name = f"{arg_name}{local_name[len(param_base):]}"
-								mapped_addr = get_addr_for_name(mapped_name)
-								if mapped_addr is not None:
-									mark_read(mapped_addr)
-								else:
-									target_addr = param_targets.get(param_base)
-									if target_addr is not None:
-										mark_read(target_addr)
-							# Non-pointer params are counted via argument evaluation, skip here.
+									elem_addr = None if meter is not None and meter.collapse_indexes else get_addr_for_name(f"{arg_name}[{idx}]")
+									if elem_addr is not None:
+										mark_write(elem_addr)
+									else:
+										mark_write(target_addr)
 							continue
-						merge_global_read(var_name)
-
-					for var_name in list(callee_func.writes):
-						if var_name.startswith(prefix):
-							if "__pointee[" in var_name:
-								param_name = var_name[len(prefix):].split("__pointee", 1)[0]
-								idx = var_name.split("__pointee[", 1)[1].removesuffix("]")
-								target_addr = param_targets.get(param_name)
-								if target_addr is not None:
-									block = self._mem.get_block(target_addr)
-									base_name = block.var.name if block and block.var else None
-									arg_name = param_arg_names.get(param_name) or base_name
-									if arg_name:
-										add_non_state_name(arg_name)
-										elem_addr = get_addr_for_name(f"{arg_name}[{idx}]")
-										if elem_addr is not None:
-											mark_write(elem_addr)
-										else:
-											mark_write(target_addr)
-								continue
-							if var_name.endswith("__pointee"):
-								param_name = var_name[len(prefix):].removesuffix("__pointee")
-								target_addr = param_targets.get(param_name)
-								arg_name = param_arg_names.get(param_name)
-								if target_addr is not None:
-									mark_non_state_by_addr(target_addr)
-									if arg_name:
-										add_non_state_name(arg_name)
-									mark_write(target_addr)
-								elif arg_name:
+						if var_name.endswith("__pointee"):
+							param_name = var_name[len(prefix):].removesuffix("__pointee")
+							target_addr = param_targets.get(param_name)
+							arg_name = param_arg_names.get(param_name)
+							if target_addr is not None:
+								mark_non_state_by_addr(target_addr)
+								if arg_name:
 									add_non_state_name(arg_name)
-									arg_addr = get_addr_for_name(arg_name)
-									if arg_addr is not None:
-										mark_pointer_write(arg_addr)
-								continue
-							# Handle pointer-param array elements allocated as params.
-							local_name = var_name[len(prefix):]
-							param_base = local_name.split("[", 1)[0].split(".", 1)[0]
-							arg_name = param_arg_names.get(param_base)
-							if arg_name:
+								mark_write(target_addr)
+							elif arg_name:
 								add_non_state_name(arg_name)
-								mapped_name = f"{arg_name}{local_name[len(param_base):]}"
-								mapped_addr = get_addr_for_name(mapped_name)
-								if mapped_addr is not None:
-									mark_write(mapped_addr)
-								else:
-									target_addr = param_targets.get(param_base)
-									if target_addr is not None:
-										mark_write(target_addr)
+								arg_addr = get_addr_for_name(arg_name)
+								if arg_addr is not None:
+									mark_pointer_write(arg_addr)
 							continue
-							# Writes to by-value params do not affect caller.
-							continue
-						merge_global_write(var_name)
-
-					# Merge callee pointer final states back to caller context.
-					if getattr(callee_func, "ptr_init", None):
-						prefix = f"<{callee_func.name}>"
-
-						def map_local_name_to_caller(local_name: str, allow_param_value: bool = False) -> Optional[str]:
-							for param_base, arg_name in param_arg_names.items():
-								if not arg_name:
-									continue
+						# Handle pointer-param array elements allocated as params.
+						local_name = var_name[len(prefix):]
+						param_base = local_name.split("[", 1)[0].split(".", 1)[0]
+						arg_name = param_arg_names.get(param_base)
+						if arg_name:
+							add_non_state_name(arg_name)
+							mapped_name = f"{arg_name}{local_name[len(param_base):]}"
+							mapped_addr = get_addr_for_name(mapped_name)
+							if mapped_addr is not None:
+								mark_write(mapped_addr)
+							else:
 								target_addr = param_targets.get(param_base)
-								target_base_name = arg_name
 								if target_addr is not None:
-									target_block = self._mem.get_block(target_addr)
-									if target_block is not None and target_block.var is not None:
-										target_base_name = target_block.var.name
-								pointee_prefix = f"{param_base}__pointee"
-								if local_name == pointee_prefix:
-									return target_base_name
-								if local_name.startswith(pointee_prefix + ".") or local_name.startswith(pointee_prefix + "["):
-									return f"{target_base_name}{local_name[len(pointee_prefix):]}"
-								if local_name == param_base:
-									return arg_name if allow_param_value else None
-								if local_name.startswith(param_base + ".") or local_name.startswith(param_base + "["):
-									return f"{arg_name}{local_name[len(param_base):]}"
-							return None
-
-						for callee_ptr_addr, callee_target_addr in callee_func.ptr_init.items():
-							ptr_block = self._mem.get_block(callee_ptr_addr)
-							if ptr_block is None or ptr_block.var is None or not ptr_block.var.is_pointer:
+									mark_write(target_addr)
+						continue
+						# Writes to by-value params do not affect caller.
+						continue
+					merge_global_write(var_name)
+
+				# Merge callee pointer final states back to caller context.
+				if getattr(callee_func, "ptr_init_names", None):
+					prefix = f"<{callee_func.name}>"
+
+					def map_local_name_to_caller(local_name: str, allow_param_value: bool = False) -> Optional[str]:
+						for param_base, arg_name in param_arg_names.items():
+							if not arg_name:
 								continue
-							ptr_name = ptr_block.var.name
+							target_addr = param_targets.get(param_base)
+							target_base_name = arg_name
+							if target_addr is not None:
+								target_block = self._mem.get_block(target_addr)
+								if target_block is not None and target_block.var is not None:
+									target_base_name = target_block.var.name
+							pointee_prefix = f"{param_base}__pointee"
+							if local_name == pointee_prefix:
+								return target_base_name
+							if local_name.startswith(pointee_prefix + ".") or local_name.startswith(pointee_prefix + "["):
+								return f"{target_base_name}{local_name[len(pointee_prefix):]}"
+							if local_name == param_base:
+								return arg_name if allow_param_value else None
+							if local_name.startswith(param_base + ".") or local_name.startswith(param_base + "["):
+								return f"{arg_name}{local_name[len(param_base):]}"
+						return None
+
+					for ptr_name, callee_target_name in callee_func.ptr_init_names:
+						mapped_ptr_name: Optional[str] = None
+						if ptr_name.startswith(prefix):
+							local_name = ptr_name[len(prefix):]
+							mapped_ptr_name = map_local_name_to_caller(local_name)
+						else:
+							mapped_ptr_name = ptr_name
+
+						if not mapped_ptr_name:
+							continue
 
-							mapped_ptr_name: Optional[str] = None
-							if ptr_name.startswith(prefix):
-								local_name = ptr_name[len(prefix):]
-								mapped_ptr_name = map_local_name_to_caller(local_name)
+						mapped_target_addr: Optional[int] = None
+						if callee_target_name is not None:
+							if callee_target_name.startswith(prefix):
+								local_target_name = callee_target_name[len(prefix):]
+								mapped_target_name = map_local_name_to_caller(local_target_name, allow_param_value=True)
+								if mapped_target_name:
+									mapped_target_addr = get_addr_for_name(mapped_target_name)
 							else:
-								mapped_ptr_name = ptr_name
+								mapped_target_addr = self._mem.ensure_address(callee_target_name)
 
-							if not mapped_ptr_name:
-								continue
+						mapped_ptr_key = resolve_pointer_key(mapped_ptr_name) or mapped_ptr_name
+						update_pointer_mapping(mapped_ptr_key, mapped_target_addr)
 
-							mapped_target_addr: Optional[int] = None
-							if callee_target_addr is not None and callee_target_addr >= 0:
-								target_block = self._mem.get_block(callee_target_addr)
-								if target_block is not None and target_block.var is not None:
-									target_name = target_block.var.name
-									if target_name.startswith(prefix):
-										local_target_name = target_name[len(prefix):]
-										mapped_target_name = map_local_name_to_caller(local_target_name, allow_param_value=True)
-										if mapped_target_name:
-											mapped_target_addr = get_addr_for_name(mapped_target_name)
-									else:
-										mapped_target_addr = self._mem.ensure_address(target_name)
 
-							mapped_ptr_key = resolve_pointer_key(mapped_ptr_name) or mapped_ptr_name
-							update_pointer_mapping(mapped_ptr_key, mapped_target_addr)
+		def visit_access(cursor) -> None:
+			name, nonconst = resolve_var_access(cursor)
+			if name is not None:
+				addr = get_addr_for_name(name)
+				if addr is not None:
+					block = self._mem.get_block(addr)
+					if block is not None and block.var is not None:
+						if not (cursor.kind == CursorKind.DECL_REF_EXPR and block.var.kind.name == "ARRAY"):
+							handle_access(name, nonconst, read=True, write=False)
+			children = list(cursor.get_children())
+			if cursor.kind == CursorKind.MEMBER_REF_EXPR:
+				if children:
+					push_expr(children[0])
+			if cursor.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
+				# ARRAY_SUBSCRIPT_EXPR semantically has two key children: base and index.
+				# Only traverse those two to avoid double-counting implicit/extra nodes.
+				if len(children) >= 2:
+					push_exprs(children[:2])
 
+		def visit_unary(cursor) -> None:
+			op = get_operator(cursor)
+			child = next(cursor.get_children(), None)
+			if child is None:
 				return
-			
-			if cursor.kind in (CursorKind.DECL_REF_EXPR, CursorKind.MEMBER_REF_EXPR, CursorKind.ARRAY_SUBSCRIPT_EXPR):
-				name, nonconst = resolve_var_access(cursor)
-				if name is not None:
-					addr = get_addr_for_name(name)
-					if addr is not None:
-						block = self._mem.get_block(addr)
-						if block is not None and block.var is not None:
-							if not (cursor.kind == CursorKind.DECL_REF_EXPR and block.var.kind.name == "ARRAY"):
-								handle_access(name, nonconst, read=True, write=False)
-				children = list(cursor.get_children())
-				if cursor.kind == CursorKind.MEMBER_REF_EXPR:
-					if children:
-						handle_expr(children[0])
-				if cursor.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
-					# ARRAY_SUBSCRIPT_EXPR semantically has two key children: base and index.
-					# Only traverse those two to avoid double-counting implicit/extra nodes.
+			if op == "*":
+				ptr_name = resolve_pointer_name(child)
+				ptr_key = resolve_pointer_key(ptr_name)
+				if ptr_key:
+					target_addr = get_pointer_target_by_key(ptr_key)
+					if target_addr is not None:
+						mark_read(target_addr)
+				return
+			if op == "&":
+				if child.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
+					children = list(child.get_children())
 					if len(children) >= 2:
-						handle_expr(children[0])
-						handle_expr(children[1])
+						push_expr(children[1])
 				return
+			if op in ("++", "--"):
+				push_lvalue(child, True)
+				return
+			push_expr(child)
 
-			if cursor.kind == CursorKind.UNARY_OPERATOR:
-				op = get_operator(cursor)
-				child = next(cursor.get_children(), None)
-				if child is None:
-					return
-				if op == "*":
-					ptr_name = resolve_pointer_name(child)
+		def visit_binary(cursor) -> None:
+			op = get_operator(cursor)
+			children = list(cursor.get_children())
+			if len(children) < 2:
+				visit_children(cursor)
+				return
+			lhs, rhs = children[0], children[1]
+			if op == "=":
+				if lhs.kind == CursorKind.UNARY_OPERATOR and get_operator(lhs) == "*":
+					lhs_child = next(lhs.get_children(), None)
+					ptr_name = resolve_pointer_name(lhs_child)
 					ptr_key = resolve_pointer_key(ptr_name)
 					if ptr_key:
-						target_addr = get_pointer_target_by_key(ptr_key)
-						if target_addr is not None:
-							mark_read(target_addr)
-					return
-				if op == "&":
-					if child.kind == CursorKind.ARRAY_SUBSCRIPT_EXPR:
-						children = list(child.get_children())
-						if len(children) >= 2:
-							handle_expr(children[1])
+						deref_addr = get_pointer_target_by_key(ptr_key)
+						if deref_addr is not None:
+							deref_block = self._mem.get_block(deref_addr)
+							if deref_block is not None and deref_block.var is not None and deref_block.var.is_pointer:
+								new_target_addr = resolve_pointer_target(rhs)
+								update_pointer_mapping(deref_block.var.name, new_target_addr)
+								push_expr(rhs)
+								return
+				lhs_name, _ = resolve_var_access(lhs)
+				lhs_key = resolve_pointer_key(lhs_name)
+				if lhs_key:
+					# Pointer assignment: update mapping without read/write on pointer.
+					target_addr = resolve_pointer_target(rhs)
+					update_pointer_mapping(lhs_key, target_addr)
+					push_expr(rhs)
 					return
-				if op in ("++", "--"):
-					handle_lvalue(child, is_compound=True)
-					return
-				handle_expr(child)
+				# For normal assignment, evaluate RHS first so reads like a=a+1 are preserved.
+				push_lvalue(lhs, False)
+				push_expr(rhs)
 				return
+			if op in ("+=", "-=", "*=", "/=", "%=", "<<=", ">>=", "&=", "|=", "^="):
+				push_expr(rhs)
+				push_lvalue(lhs, True)
+				return
+			push_exprs([lhs, rhs])
+
+		def visit_children(cursor) -> None:
+			push_exprs(ordered_children(cursor))
+
+		expr_handlers = {
+			CursorKind.VAR_DECL: visit_var_decl,
+			CursorKind.CALL_EXPR: visit_call,
+			CursorKind.DECL_REF_EXPR: visit_access,
+			CursorKind.MEMBER_REF_EXPR: visit_access,
+			CursorKind.ARRAY_SUBSCRIPT_EXPR: visit_access,
+			CursorKind.UNARY_OPERATOR: visit_unary,
+			CursorKind.BINARY_OPERATOR: visit_binary,
+			CursorKind.COMPOUND_ASSIGNMENT_OPERATOR: visit_binary,
+		}
 
-			if cursor.kind in (CursorKind.BINARY_OPERATOR, CursorKind.COMPOUND_ASSIGNMENT_OPERATOR):
-				op = get_operator(cursor)
-				children = list(cursor.get_children())
-				if len(children) >= 2:
-					lhs, rhs = children[0], children[1]
-					if op == "=":
-						if lhs.kind == CursorKind.UNARY_OPERATOR and get_operator(lhs) == "*":
-							lhs_child = next(lhs.get_children(), None)
-							ptr_name = resolve_pointer_name(lhs_child)
-							ptr_key = resolve_pointer_key(ptr_name)
-							if ptr_key:
-								deref_addr = get_pointer_target_by_key(ptr_key)
-								if deref_addr is not None:
-									deref_block = self._mem.get_block(deref_addr)
-									if deref_block is not None and deref_block.var is not None and deref_block.var.is_pointer:
-										new_target_addr = resolve_pointer_target(rhs)
-										update_pointer_mapping(deref_block.var.name, new_target_addr)
-										handle_expr(rhs)
-										return
-						lhs_name, _ = resolve_var_access(lhs)
-						lhs_key = resolve_pointer_key(lhs_name)
-						if lhs_key:
-							# Pointer assignment: update mapping without read/write on pointer.
-							target_addr = resolve_pointer_target(rhs)
-							update_pointer_mapping(lhs_key, target_addr)
-							handle_expr(rhs)
-							return
-						# For normal assignment, evaluate RHS first so reads like a=a+1 are preserved.
-						handle_expr(rhs)
-						handle_lvalue(lhs, is_compound=False)
-						return
-					if op in ("+=", "-=", "*=", "/=", "%=", "<<=", ">>=", "&=", "|=", "^="):
-						handle_lvalue(lhs, is_compound=True)
-						handle_expr(rhs)
-						return
-					handle_expr(lhs)
-					handle_expr(rhs)
-					return
-
-			for child in ordered_children(cursor):
-				handle_expr(child)
+		# Walk expression nodes and apply read/write rules.
+		def visit_expr(cursor, _is_compound: bool = False) -> None:
+			expr_handlers.get(cursor.kind, visit_children)(cursor)
 
 		# Return children in source order by location.
 		def ordered_children(cursor):
@@ -989,8 +1042,32 @@ class FuncParser:
 			children.sort(key=key)
 			return children
 
-		for child in ordered_children(node):
-			# Traverse function body in source order.
-			handle_expr(child)
+		# Budget fallback: every variable the remaining nodes reference is read and written
+		# as a whole object (a pointer through its current target); calls still merge their callee.
+		def coarse_scan(roots) -> None:
+			stack = list(roots)
+			while stack:
+				cursor = stack.pop()
+				if cursor is None:
+					continue
+				if cursor.kind == CursorKind.CALL_EXPR:
+					visit_call(cursor)
+				elif cursor.kind == CursorKind.DECL_REF_EXPR and cursor.spelling:
+					ptr_key = resolve_pointer_key(cursor.spelling)
+					addr = get_pointer_target_by_key(ptr_key) if ptr_key else get_addr_for_name(cursor.spelling)
+					if addr is not None:
+						mark_read(addr)
+						mark_write(addr)
+				stack.extend(cursor.get_children())
+
+		# Traverse function body in source order.
+		push_exprs(ordered_children(node))
+		while work:
+			if meter is not None and meter.tick(self._mem.arena_start()):
+				coarse_scan(cursor for _, cursor, _ in work)
+				work.clear()
+				break
+			handler, cursor, is_compound = work.pop()
+			handler(cursor, is_compound)
 
 		call_stack.remove(current_func.name)
@@ -1,7 +1,8 @@
 import sys
 import os
-from typing import List, Dict, Any
-import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterable
 
 # Allow importing from models directory by adding parent directory to sys.path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -9,25 +10,68 @@ parent_dir = os.path.dirname(current_dir)
 if parent_dir not in sys.path:
     sys.path.append(parent_dir)
 
-from clang.cindex import Index, CursorKind, TypeKind
+from clang.cindex import Diagnostic, Index, CursorKind, TypeKind, TranslationUnit
 
 from models.variables import Variable, VARIABLE_DOMAIN, VARIABLE_KIND
 from models.functions import Function
+from models.symbol_table import SymbolTable
 from models.configs import FunctionConfig, VariableConfig
 from models.structs import StructsManager
 from memory_managing.memory import MemoryManager
+from parsing.budget import AnalysisBudget
 from parsing.func_parser import FuncParser
-from utils.callgraph import reverse_topo_from_project
+from utils.callgraph import add_translation_unit_calls, reverse_topo_from_root
+from utils.profile import Profiler
+from utils.symbols import SymbolIndex, SymbolPlan, plan_unity_chunks
+from utils.libmodel import LibraryModel, default_cache_dir
+from utils.pch import PrefixPch, common_prefix
+
+# Synthetic unity translation units live outside every project path.
+UNITY_DIR = os.path.join(os.sep, "__ip_parser_unity__")
+
+# Errors clang reports when two files of one unity unit define the same file-scope name.
+_REDEFINITION_ERRORS = ("redefinition", "conflicting types for", "redeclared as different kind")
+
+
+def _redefines_names(tu) -> bool:
+    return any(
+        diag.severity >= Diagnostic.Error and any(msg in diag.spelling for msg in _REDEFINITION_ERRORS)
+        for diag in tu.diagnostics
+    )
+
 
 class Parser:
 
-    def __init__(self, project_path: str):
+    def __init__(self, project_path: str, demand_driven: bool = False, release_blocks: bool = False, unity: bool = False, pch: bool = False, jobs: int = 1, unsaved_files: Dict[str, str] | None = None, budget: AnalysisBudget | None = None):
         # Initialize parser state and caches.
         self.project_path = os.path.abspath(project_path)
+        self.demand_driven = demand_driven  # entry-mode runs load only what the entry can reach
+        self.release_blocks = release_blocks  # drop param/local blocks no summary needs after each function
+        self.unity = unity  # parse .c files as a few synthetic unity translation units
+        self._unity_sources: set[str] = set()  # real source files covered by the unity translation units
+        self.pch = pch  # precompile the include prefix most .c files share (per-file mode only)
+        self._pch: PrefixPch | None = None
+        self._pch_files: set[str] = set()  # source files parsed with the prefix PCH
+        self._decl_only_files: set[str] = set()  # files parsed without function bodies (no reachable function)
+        self.jobs = max(1, jobs)  # libclang parser threads; declarations are still collected on this thread
+        self._thread_state = threading.local()
+        self.budget = budget  # per-function analysis limits with precision fallbacks (parsing/budget.py)
+        self.unsaved_files: Dict[str, str] = {}  # absolute path -> in-memory contents overriding the disk file
+        self.set_unsaved(unsaved_files or {})
+        self.symbol_plan: SymbolPlan | None = None
+        self.structs = StructsManager.instance()
+        self._index = None
+        self._translation_units: Dict[str, Any] = {}  # source file (or unity chunk) path -> TranslationUnit
+        self._call_graph: Dict[str, set[str]] | None = None
+        self._library_model: LibraryModel | None = None
+        self._collected = False
+        self._analyzed = False
+        self._reset_collections()
+
+    def _reset_collections(self) -> None:
         self.global_vars: List[Variable] = []
         self.functions: List[Function] = []
-        self.structs = StructsManager.instance()
-        self._global_var_map: Dict[str, Variable] = {}
+        self.symbols = SymbolTable(resolver=self._resolve_config_function)  # name/file/kind indexes over functions and globals
         self._seen_var_names = set() # Set of variable names for global deduplication
         self._seen_func_keys = set() # Set of (file_path, name) for function deduplication
         self._seen_struct_nodes = set() # Set of (file_path, line, col) for struct deduplication
@@ -40,45 +84,307 @@ class Parser:
         Parse all source files in the project_path.
         """
         # Orchestrate parsing, memory allocation, and function analysis.
-        index = Index.create()
-        source_files = self._get_source_files()
-        
+        self.load(entry_function if self.demand_driven else None)
+        self.analyze(entry_function)
+
+    def set_unsaved(self, buffers: Dict[str, str | None]) -> None:
+        """
+        Override file contents in memory (None restores the disk copy). Takes effect on
+        the next load(), or on reparse() of the same paths.
+        """
+        for path, contents in buffers.items():
+            path = os.path.abspath(path)
+            if contents is None:
+                self.unsaved_files.pop(path, None)
+            else:
+                self.unsaved_files[path] = contents
+
+    def read_source(self, path: str) -> bytes | None:
+        """
+        Contents of a source file as libclang sees it: the in-memory override if any.
+        """
+        contents = self.unsaved_files.get(os.path.abspath(path))
+        if contents is not None:
+            return contents.encode("utf-8")
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _unsaved(self) -> List[tuple[str, str]]:
+        return list(self.unsaved_files.items())
+
+    def _clang_args(self) -> List[str]:
         # Basic include arguments: include the project root
-        args = [f'-I{self.project_path}']
+        return [f'-I{self.project_path}']
 
-        for file_path in source_files:
-            # Parse the translation unit
-            translation_unit = index.parse(file_path, args=args)
-            self._visit_root(translation_unit.cursor)
+    def load(self, entry_function: str | None = None) -> None:
+        """
+        Parse every source file into a translation unit and collect its declarations.
+        Translation units are kept so later analyses and reparses can reuse them.
 
-        # Calculate struct sizes after all structs collected
-        self.structs.calculate_size()
+        With `entry_function`, a textual symbol prepass restricts parsing to the files
+        defining functions reachable from it (and the globals they reference), and only
+        those globals are kept for allocation.
+        """
+        self._index = Index.create()
+        args = self._clang_args()
+        self._translation_units = {}
+        source_files = self._get_source_files()
+        self.symbol_plan = None
+        self._decl_only_files = set()
+        if entry_function:
+            with Profiler.phase("symbol_prepass"):
+                self.symbol_plan = SymbolIndex.build(source_files, self.unsaved_files).plan(entry_function)
+            if self.symbol_plan is not None:
+                source_files = [f for f in source_files if f in self.symbol_plan.files]
+                # Files that only contribute globals and types need no function bodies.
+                self._decl_only_files = self.symbol_plan.files - self.symbol_plan.body_files
+        if self.unity:
+            self._parse_unity(source_files, args)
+        else:
+            self._prepare_pch(source_files, args)
+            if self.jobs > 1:
+                self._call_graph = None
+                self._collect_while_parsing(source_files, args)
+                return
+            for file_path in source_files:
+                with Profiler.phase("libclang_parse", file=file_path):
+                    self._translation_units[file_path] = self._parse_file(file_path, args)
+        self._call_graph = None
+        self.collect()
+
+    def _thread_index(self):
+        # Each parser thread gets its own libclang index; translation units keep theirs alive.
+        index = getattr(self._thread_state, "index", None)
+        if index is None:
+            index = self._thread_state.index = Index.create()
+        return index
+
+    def _collect_while_parsing(self, source_files: List[str], args: List[str]) -> None:
+        """
+        Parse files on a thread pool (libclang releases the GIL while parsing) and
+        collect each translation unit's declarations on this thread as soon as it is
+        ready. Units are consumed in source order, so the collected state is the same
+        as in a serial load.
+        """
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            futures = [
+                (file_path, pool.submit(lambda path: self._parse_file(path, args, self._thread_index()), file_path))
+                for file_path in source_files
+            ]
+
+            def arrivals() -> Iterable[Any]:
+                for file_path, future in futures:
+                    translation_unit = future.result()
+                    self._translation_units[file_path] = translation_unit
+                    yield translation_unit
+
+            self.collect(arrivals())
+
+    def _parse_all(self, items: List[Any], parse: Callable[[Any, Any], Any], label: Callable[[Any], str]) -> List[Any]:
+        # parse(item, index) for every item, in order; on a thread pool when jobs > 1.
+        if self.jobs <= 1:
+            results = []
+            for item in items:
+                with Profiler.phase("libclang_parse", file=label(item)):
+                    results.append(parse(item, self._index))
+            return results
+        with Profiler.phase("libclang_parse_pool", jobs=self.jobs, files=len(items)):
+            with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+                return list(pool.map(lambda item: parse(item, self._thread_index()), items))
+
+    def _prepare_pch(self, source_files: List[str], args: List[str]) -> None:
+        # Build (or reuse) the PCH for the most common leading include block.
+        self._pch_files = set()
+        if not self.pch:
+            return
+        with Profiler.phase("pch_prepare"):
+            prefix, users = common_prefix([f for f in source_files if f.endswith(".c")], [self.project_path])
+            self._pch = PrefixPch(self._index, args, os.path.join(default_cache_dir(), "pch"))
+            if self._pch.prepare(prefix) is not None and not self._pch.dependencies & self.unsaved_files.keys():
+                # The PCH reflects the disk copies; files edited in memory are parsed without it.
+                self._pch_files = set(users) - self.unsaved_files.keys()
+
+    def _parse_file(self, file_path: str, args: List[str], index=None):
+        if file_path in self._pch_files:
+            args = args + ["-include-pch", self._pch.path]
+        parse_options = TranslationUnit.PARSE_SKIP_FUNCTION_BODIES if file_path in self._decl_only_files else 0
+        return (index or self._index).parse(file_path, args=args, unsaved_files=self._unsaved(), options=parse_options)
+
+    def _parse_unity(self, source_files: List[str], args: List[str]) -> None:
+        """
+        Parse the .c files as unity translation units generated in memory, each one
+        `#include`-ing a chunk of files whose file-scope names do not collide.
+        Cursors keep their real file locations; every macro a file defines is
+        `#undef`-ed after its `#include`. Declaration-only files get their own
+        chunks parsed without function bodies. Headers no chunk includes are parsed
+        on their own. A chunk clang still finds a redefinition in (a name the textual
+        prepass missed) falls back to per-file translation units.
+        """
+        self._translation_units = {}
+        self._unity_sources = set(source_files)
+        c_files = [f for f in source_files if f.endswith(".c")]
+        with Profiler.phase("unity_plan"):
+            symbol_index = SymbolIndex.build(c_files, self.unsaved_files)
+            chunks = [(chunk, 0) for chunk in plan_unity_chunks(symbol_index, [f for f in c_files if f not in self._decl_only_files])]
+            chunks += [
+                (chunk, TranslationUnit.PARSE_SKIP_FUNCTION_BODIES)
+                for chunk in plan_unity_chunks(symbol_index, [f for f in c_files if f in self._decl_only_files])
+            ]
+            # Keep source order across the two groups so declarations are visited as in per-file mode.
+            chunks.sort(key=lambda item: c_files.index(item[0][0]))
+        units = [(os.path.join(UNITY_DIR, f"unity_{i}.c"), chunk, parse_options) for i, (chunk, parse_options) in enumerate(chunks)]
+
+        def parse_unit(unit, index):
+            chunk_path, chunk, parse_options = unit
+            text = "".join(
+                '#include "{}"\n'.format(p.replace("\\", "\\\\").replace('"', '\\"'))
+                # Keep the file's own macros from leaking into the files after it.
+                + "".join(f"#undef {macro}\n" for macro in sorted(symbol_index.file_macros.get(p, ())))
+                for p in chunk
+            )
+            return index.parse(chunk_path, args=args, unsaved_files=[(chunk_path, text), *self._unsaved()], options=parse_options)
+
+        included: set[str] = set()
+        for unit, tu in zip(units, self._parse_all(units, parse_unit, lambda unit: unit[0])):
+            chunk_path, chunk, _ = unit
+            parsed = [(chunk_path, tu)]
+            if len(chunk) > 1 and _redefines_names(tu):
+                parsed = [(file_path, self._parse_file(file_path, args)) for file_path in chunk]
+            for key, unit_tu in parsed:
+                self._translation_units[key] = unit_tu
+                included.update(os.path.abspath(inc.include.name) for inc in unit_tu.get_includes())
+        headers = [f for f in source_files if not f.endswith(".c") and f not in included]
+        for file_path, tu in zip(headers, self._parse_all(headers, lambda path, index: self._parse_file(path, args, index), lambda path: path)):
+            self._translation_units[file_path] = tu
+
+    def reparse(self, paths: List[str]) -> set[str]:
+        """
+        Re-parse translation units affected by the given changed files:
+        the files themselves and every translation unit that includes one of them.
+        Added and removed source files are picked up as well.
+        Returns the set of affected source file paths.
+        """
+        changed = {os.path.abspath(p) for p in paths}
+        affected: set[str] = set()
+        current_files = set(self._get_source_files())
+        if self.unity:
+            # Chunk membership depends on every file, so rebuild all unity units.
+            affected = (changed & (current_files | self._unity_sources)) | (current_files ^ self._unity_sources)
+            if affected:
+                self._parse_unity(sorted(current_files), self._clang_args())
+                self._call_graph = None
+                self.collect()
+            return affected
+        for file_path in list(self._translation_units):
+            if file_path not in current_files:
+                del self._translation_units[file_path]
+                affected.add(file_path)
+        args = self._clang_args()
+        # A changed prefix header invalidates the PCH and every file parsed with it.
+        fresh: set[str] = set()
+        if self._pch is not None and changed & self._pch.dependencies:
+            fresh = set(self._pch_files)
+            self._prepare_pch(sorted(current_files), args)
+            fresh |= self._pch_files
+        for file_path in sorted(current_files):
+            tu = self._translation_units.get(file_path)
+            if tu is None or file_path in fresh:
+                self._translation_units[file_path] = self._parse_file(file_path, args)
+                affected.add(file_path)
+                continue
+            includes = {os.path.abspath(inc.include.name) for inc in tu.get_includes()}
+            if file_path in changed or includes & changed:
+                tu.reparse(unsaved_files=self._unsaved())
+                affected.add(file_path)
+        if affected:
+            self._call_graph = None
+            self.collect()
+        return affected
+
+    def collect(self, translation_units: Iterable[Any] | None = None) -> None:
+        """
+        Rebuild globals, functions, structs and configured functions from the parsed translation units.
+        `translation_units` may be a stream of units still being parsed; it defaults to every parsed unit.
+        """
+        self._reset_collections()
+        self.structs.reset()
+        with Profiler.phase("collect_declarations"):
+            for translation_unit in (self._translation_units.values() if translation_units is None else translation_units):
+                self._visit_root(translation_unit.cursor)
+            if self.symbol_plan is not None:
+                self._restrict_globals(self.symbol_plan.globals)
 
-        self._load_function_configs()
+        # Calculate struct sizes after all structs collected
+        with Profiler.phase("calculate_size"):
+            self.structs.calculate_size()
+
+        # Configured library functions are instantiated on first lookup (see _resolve_config_function).
+        with Profiler.phase("load_function_configs"):
+            self._library().refresh()
+        self._collected = True
+        self._analyzed = False
+
+    def _restrict_globals(self, names: set[str]) -> None:
+        # Keep only the globals the reachable functions can reference.
+        self.global_vars = [v for v in self.global_vars if v.name in names]
+        self.symbols.retain_globals(names)
+        self._global_pointer_inits = {name: c for name, c in self._global_pointer_inits.items() if name in names}
+
+    def call_graph(self) -> Dict[str, set[str]]:
+        """
+        Call graph (caller -> set of callees) built from the parsed translation units.
+        """
+        if self._call_graph is None:
+            call_graph: Dict[str, set[str]] = {}
+            with Profiler.phase("call_graph"):
+                for translation_unit in self._translation_units.values():
+                    add_translation_unit_calls(translation_unit, self.project_path, call_graph)
+            self._call_graph = call_graph
+        return self._call_graph
+
+    def analyze(self, entry_function: str | None = None) -> None:
+        """
+        Allocate memory and analyze functions, reachable from `entry_function` if given.
+        Collected state is rebuilt first when a previous analysis already consumed it.
+        """
+        if self._analyzed or not self._collected:
+            self.collect()
 
         memMana = MemoryManager.instance()
-        memMana.allocate_globals(self.global_vars)
+        memMana.reset()
+        with Profiler.phase("allocate_globals"):
+            memMana.allocate_globals(self.global_vars)
 
         func_parser = FuncParser.instance()
-        func_parser.initialize(self.global_vars, self._global_pointer_inits, self._function_nodes, {})
+        with Profiler.phase("initialize_pointers"):
+            func_parser.initialize(self.global_vars, self._global_pointer_inits, self.symbols, {}, release_blocks=self.release_blocks, budget=self.budget)
 
         if entry_function:
-            order = reverse_topo_from_project(self.project_path, entry_function)
-            func_map = {func.name: (node, func) for node, func in self._function_nodes}
+            order = reverse_topo_from_root(self.call_graph(), entry_function)
             for func_name in order:
-                if func_name in func_map:
-                    func_node, func = func_map[func_name]
-                    func_parser.parse_function(func_node, func)
+                if func_name in self.symbols:
+                    with Profiler.function(func_name):
+                        func_parser.parse_function(self.symbols.node(func_name), self.symbols.function(func_name))
         else:
-            for func_node, func in self._function_nodes:
-                func_parser.parse_function(func_node, func)
+            # Instantiate every configured function the project calls before the full walk.
+            for callees in self.call_graph().values():
+                for callee in callees:
+                    self.symbols.function(callee)
+            for func_node, func in list(self._function_nodes):
+                with Profiler.function(func.name):
+                    func_parser.parse_function(func_node, func)
 
-        func_parser.finalize()
+        with Profiler.phase("analyze_memories"):
+            func_parser.finalize()
+        self._analyzed = True
 
     def _get_source_files(self) -> List[str]:
         """Recursive search for .c and .h files"""
         # Collect source file paths from project root or single file.
-        if os.path.isfile(self.project_path):
+        if os.path.isfile(self.project_path) or self.project_path in self.unsaved_files:
             return [self.project_path]
             
         sources = []
@@ -86,6 +392,11 @@ class Parser:
             for file in files:
                 if file.endswith((".c", ".h")):
                     sources.append(os.path.join(root, file))
+        # Files that so far exist only in memory.
+        on_disk = set(sources)
+        for path in sorted(self.unsaved_files):
+            if path.endswith((".c", ".h")) and path.startswith(self.project_path + os.sep) and path not in on_disk:
+                sources.append(path)
         return sources
 
     def _visit_root(self, cursor):
@@ -146,7 +457,7 @@ class Parser:
         if not name:
             return
 			
-        if name in self._global_var_map:
+        if self.symbols.has_global(name):
             # Allow later definition/initializer (e.g. weak symbol in header).
             if node.type.get_canonical().kind == TypeKind.POINTER:
                 init_child = next(node.get_children(), None)
@@ -184,7 +495,7 @@ class Parser:
             points_to={}
         )
         self.global_vars.append(var)
-        self._global_var_map[name] = var
+        self.symbols.add_global(var)
 
         if is_pointer:
             init_child = next(node.get_children(), None)
@@ -256,148 +567,96 @@ class Parser:
         )
         self.functions.append(func)
         self._function_nodes.append((node, func))
+        self.symbols.add_function(func, node)
 
-    def _load_function_configs(self) -> None:
-        for filename, data in self._iter_function_config_files():
-            self._parse_function_config_file(filename, data)
-
-    def _iter_function_config_files(self) -> List[tuple[str, list]]:
+    def _config_dirs(self) -> List[str]:
         base_dir = self.project_path
         if os.path.isfile(base_dir):
             base_dir = os.path.dirname(base_dir)
-        candidates = [
+        return [
             os.path.join(base_dir, "config"),
             os.path.join(os.path.dirname(base_dir), "config"),
         ]
-        items: List[tuple[str, list]] = []
-        seen_paths = set()
-        for config_dir in candidates:
-            if not os.path.isdir(config_dir):
-                continue
-            for filename in os.listdir(config_dir):
-                if not filename.endswith(".json"):
-                    continue
-                path = os.path.join(config_dir, filename)
-                if path in seen_paths:
-                    continue
-                seen_paths.add(path)
-                try:
-                    with open(path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                except Exception:
-                    continue
-                if not isinstance(data, list):
-                    continue
-                items.append((filename, data))
-        return items
-
-    def _parse_function_config_file(self, filename: str, data: list) -> None:
+
+    def _library(self) -> LibraryModel:
+        if self._library_model is None:
+            self._library_model = LibraryModel(self._config_dirs(), cache_dir=default_cache_dir())
+        return self._library_model
+
+    def _resolve_config_function(self, func_name: str) -> Function | None:
+        """
+        Instantiate a configured library function the first time it is looked up.
+        """
+        entry = self._library().lookup(func_name)
+        if entry is None:
+            return None
+        filename, model = entry
+        func = self._build_config_function(filename, model)
+        self.functions.append(func)
+        self._function_nodes.append((None, func))
+        self.symbols.add_function(func, None, SymbolTable.CONFIG)
+        self.config_function_names.add(func_name)
+        return func
+
+    def _build_config_function(self, filename: str, model: Dict[str, Any]) -> Function:
         def pointer_level(type_name: str) -> int:
             t = self.structs.get_decoded_name(type_name).strip()
             return t.count("*")
 
-        def parse_ptr_target_name(target: Any) -> str | None:
-            if target is None:
-                return None
-            if not isinstance(target, str):
-                target = str(target)
-            name = target.strip()
-            if not name:
-                return None
-            if name.upper() in {"NULL", "nullptr".upper()}:
-                return None
-            return name
-
-        for item in data:
-            if not isinstance(item, dict):
-                continue
-            func_name = item.get("function_name")
-            args = item.get("arguments", [])
-            if not func_name or not isinstance(args, list):
-                continue
-            if any(f.name == func_name for f in self.functions):
-                continue
-            var_cfgs: List[VariableConfig] = []
-            arg_type_map: Dict[str, str] = {}
-            for arg in args:
-                if not isinstance(arg, dict):
-                    continue
-                name = arg.get("name")
-                type_str = arg.get("type")
-                if not name or not type_str:
-                    continue
-                arg_type_map[name] = type_str
-                var_cfgs.append(VariableConfig(
-                    name=name,
-                    type=type_str,
-                    read=bool(arg.get("read", False)),
-                    write=bool(arg.get("write", False)),
-                ))
-            func_cfg = FunctionConfig(function_name=func_name, arguments=var_cfgs)
-
-            params = [vc.name for vc in func_cfg.arguments]
-            func_vars_dict: Dict[str, Variable] = {}
-            reads = set()
-            writes = set()
-            ptr_init_names: List[tuple[str, str | None]] = []
-            for vc in func_cfg.arguments:
-                raw_type = vc.type
-                kind = VARIABLE_KIND.BUILTIN
-                if self.structs.is_pointer(raw_type):
-                    kind = VARIABLE_KIND.POINTER
-                elif self.structs.is_array(raw_type):
-                    kind = VARIABLE_KIND.ARRAY
-                elif self.structs.is_struct(raw_type):
-                    kind = VARIABLE_KIND.RECORD
-                is_pointer = self.structs.is_pointer(raw_type)
-                prefixed_name = f"<{func_name}>{vc.name}"
-                func_vars_dict[prefixed_name] = Variable(
-                    name=prefixed_name,
-                    raw_type=raw_type,
-                    kind=kind,
-                    domain=VARIABLE_DOMAIN.PARAM,
-                    is_pointer=is_pointer,
-                    points_to={},
-                )
-                if is_pointer:
-                    if vc.read:
-                        reads.add(f"<{func_name}>{vc.name}__pointee")
-                    if vc.write:
-                        writes.add(f"<{func_name}>{vc.name}__pointee")
-
-            ptr_init_items = item.get("ptr_init", [])
-            if isinstance(ptr_init_items, list):
-                for pi in ptr_init_items:
-                    if not isinstance(pi, dict):
-                        continue
-                    src_name = pi.get("name")
-                    tgt_name = parse_ptr_target_name(pi.get("target"))
-                    if not src_name:
-                        continue
-                    src_prefixed = f"<{func_name}>{src_name}"
-                    src_type = arg_type_map.get(src_name, "")
-                    src_level = pointer_level(src_type) if src_type else 0
-                    if src_level >= 2:
-                        src_prefixed = f"{src_prefixed}__pointee"
-
-                    tgt_prefixed: str | None = None
-                    if tgt_name:
-                        tgt_prefixed = f"<{func_name}>{tgt_name}"
-                        tgt_type = arg_type_map.get(tgt_name, "")
-                        tgt_level = pointer_level(tgt_type) if tgt_type else 0
-                        if tgt_level >= 1:
-                            tgt_prefixed = f"{tgt_prefixed}__pointee"
-                    ptr_init_names.append((src_prefixed, tgt_prefixed))
-            func = Function(
-                name=func_name,
-                source_file=os.path.join("config", filename),
-                params=params,
-                vars_dict=func_vars_dict,
-                reads=reads,
-                writes=writes,
-                config_ptr_init_names=ptr_init_names,
-            )
-            self.functions.append(func)
-            self._function_nodes.append((None, func))
-            self.config_function_names.add(func_name)
+        func_name = model["function_name"]
+        var_cfgs = [
+            VariableConfig(name=name, type=type_str, read=read, write=write)
+            for name, type_str, read, write in model["arguments"]
+        ]
+        arg_type_map: Dict[str, str] = {vc.name: vc.type for vc in var_cfgs}
+        func_cfg = FunctionConfig(function_name=func_name, arguments=var_cfgs)
 
+        params = [vc.name for vc in func_cfg.arguments]
+        func_vars_dict: Dict[str, Variable] = {}
+        reads = set()
+        writes = set()
+        ptr_init_names: List[tuple[str, str | None]] = []
+        for vc in func_cfg.arguments:
+            raw_type = vc.type
+            desc = self.structs.type_descriptor(raw_type)
+            kind = desc.kind
+            is_pointer = desc.is_pointer
+            prefixed_name = f"<{func_name}>{vc.name}"
+            func_vars_dict[prefixed_name] = Variable(
+                name=prefixed_name,
+                raw_type=raw_type,
+                kind=kind,
+                domain=VARIABLE_DOMAIN.PARAM,
+                is_pointer=is_pointer,
+                points_to={},
+            )
+            if is_pointer:
+                if vc.read:
+                    reads.add(f"<{func_name}>{vc.name}__pointee")
+                if vc.write:
+                    writes.add(f"<{func_name}>{vc.name}__pointee")
+
+        for src_name, tgt_name in model["ptr_init"]:
+            src_prefixed = f"<{func_name}>{src_name}"
+            src_type = arg_type_map.get(src_name, "")
+            src_level = pointer_level(src_type) if src_type else 0
+            if src_level >= 2:
+                src_prefixed = f"{src_prefixed}__pointee"
+
+            tgt_prefixed: str | None = None
+            if tgt_name:
+                tgt_prefixed = f"<{func_name}>{tgt_name}"
+                tgt_type = arg_type_map.get(tgt_name, "")
+                tgt_level = pointer_level(tgt_type) if tgt_type else 0
+                if tgt_level >= 1:
+                    tgt_prefixed = f"{tgt_prefixed}__pointee"
+            ptr_init_names.append((src_prefixed, tgt_prefixed))
+        return Function(
+            name=func_name,
+            source_file=os.path.join("config", filename),
+            params=params,
+            vars_dict=func_vars_dict,
+            reads=reads,
+            writes=writes,
+            config_ptr_init_names=ptr_init_names,
+        )
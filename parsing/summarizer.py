@@ -0,0 +1,125 @@
+"""
+Classification of a function's accesses into interface categories.
+"""
+
+from memory_managing.memory import MemoryManager
+from models.summarize import FunctionSummarize, BriefVariable
+from utils.callgraph import reverse_topo_from_root
+from utils.profile import Profiler
+
+
+def to_brief(var) -> BriefVariable:
+	name = var.name
+	if name.endswith("__pointee"):
+		return None
+	if name.startswith("<") and ">" in name:
+		name = name.split(">", 1)[1]
+	name = name.replace("__pointee.", "->")
+	return BriefVariable(name=name, type=getattr(var, "original_raw_type", var.raw_type))
+
+
+def summarize_function(parser, target_name: str) -> FunctionSummarize:
+	mem = MemoryManager.instance()
+
+	target_func = parser.symbols.function(target_name)
+	if target_func is None:
+		raise ValueError(f"Function '{target_name}' not found")
+
+	summary = FunctionSummarize(function_name=target_name)
+
+	for block in mem._blocks:
+		if block is None:
+			continue
+		var = block.var
+		if var is None:
+			continue
+
+		root_addr = block.addr
+		root_block = block
+		while root_block.parent != 0:
+			root_addr = root_block.parent
+			root_block = mem._blocks[root_addr]
+			if root_block is None:
+				break
+		root_var = root_block.var if root_block is not None else None
+		root_is_global = root_var is not None and root_var.domain == root_var.domain.GLOBAL
+		if root_var is not None and root_var.domain == root_var.domain.LOCAL:
+			continue
+
+		r_target = target_name in var.read
+		w_target = target_name in var.write
+
+		# Only include variables that the target function reads or writes.
+		if not (r_target or w_target):
+			continue
+
+		if r_target and not w_target and root_is_global:
+			brief = to_brief(var)
+			if brief:
+				summary.interface_semantics.parameters.append(brief)
+		elif (
+			r_target and w_target
+			and root_is_global
+			and var.read.issubset({target_name})
+			and var.write.issubset({target_name})
+			and var.name not in target_func.non_state
+		):
+			brief = to_brief(var)
+			if brief:
+				summary.interface_semantics.state.append(brief)
+		elif r_target and not w_target:
+			brief = to_brief(var)
+			if brief:
+				summary.interface_semantics.input.append(brief)
+		elif w_target and not r_target:
+			brief = to_brief(var)
+			if brief:
+				summary.interface_semantics.output.append(brief)
+		else:
+			brief = to_brief(var)
+			if brief:
+				summary.interface_semantics.inout.append(brief)
+
+	summary.degraded = list(getattr(target_func, "degraded", []))
+	return summary
+
+
+def summary_to_dict(summary: FunctionSummarize) -> dict:
+	def serialize_vars(items):
+		return [{"name": v.name, "type": v.type} for v in items]
+
+	result = {
+		"function_name": summary.function_name,
+		"interface_semantics": {
+			"parameters": serialize_vars(summary.interface_semantics.parameters),
+			"state": serialize_vars(summary.interface_semantics.state),
+			"input": serialize_vars(summary.interface_semantics.input),
+			"output": serialize_vars(summary.interface_semantics.output),
+			"inout": serialize_vars(summary.interface_semantics.inout),
+		},
+	}
+	if summary.degraded:
+		result["degraded"] = list(summary.degraded)
+	return result
+
+
+def iter_summaries(parser, func_names: list[str]):
+	config_names = getattr(parser, "config_function_names", set())
+	for name in func_names:
+		if name in config_names:
+			continue
+		with Profiler.function(name, phase="summarize_function"):
+			summary = summarize_function(parser, name)
+		yield summary
+
+
+def reachable_function_names(parser, entry_function: str) -> list[str]:
+	"""
+	Functions defined in the project (or configured) that are reachable from
+	`entry_function`, callers first, with the entry function always included.
+	"""
+	order = reversed(reverse_topo_from_root(parser.call_graph(), entry_function))
+	func_names = [name for name in order if name in parser.symbols]
+	if entry_function not in func_names:
+		func_names.append(entry_function)
+	return func_names
@@ -0,0 +1,102 @@
+"""
+In-process library API: analyze a project and get summaries as objects, with no
+subprocess, result files or JSON round trip.
+
+    from utils.api import AnalyzeOptions, analyze
+
+    for summary in analyze("input", entries=["AttitudeSelectXY"]):
+        print(summary.function_name, [v.name for v in summary.interface_semantics.output])
+
+Parsed projects stay warm between calls (one AnalysisSession per project and
+parser options), so later calls only analyze entries they have not seen yet.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from models.summarize import FunctionSummarize
+from parsing.budget import AnalysisBudget
+from utils.session import AnalysisSession
+
+
+@dataclass(frozen=True)
+class AnalyzeOptions:
+    """
+    unity / pch / jobs: parser options, as with --unity, --pch and --jobs.
+    blocks: attach to each summary the memory blocks that function reads or writes.
+    budget: per-function analysis limits; a summary's `degraded` lists the fallbacks taken.
+    """
+    unity: bool = False
+    pch: bool = False
+    jobs: int = 1
+    blocks: bool = False
+    budget: Optional[AnalysisBudget] = None
+
+
+_sessions: Dict[tuple, AnalysisSession] = {}
+
+
+def get_session(project_path: str, options: Optional[AnalyzeOptions] = None) -> AnalysisSession:
+    """
+    The warm session for `project_path` under `options`, created on first use.
+    Call `invalidate` or `update_buffers` on it after editing the project.
+    """
+    options = options or AnalyzeOptions()
+    key = (os.path.abspath(project_path), options.unity, options.pch, options.jobs, options.budget)
+    session = _sessions.get(key)
+    if session is None:
+        session = AnalysisSession(project_path, unity=options.unity, pch=options.pch, jobs=options.jobs, budget=options.budget)
+        _sessions[key] = session
+    return session
+
+
+def clear_sessions() -> None:
+    """
+    Drop every warm session (and the translation units it keeps alive).
+    """
+    _sessions.clear()
+
+
+def _blocks_by_function(rows: List[dict]) -> Dict[str, List[dict]]:
+    by_function: Dict[str, List[dict]] = {}
+    for row in rows:
+        for name in dict.fromkeys(row["read"] + row["write"]):
+            by_function.setdefault(name, []).append(row)
+    return by_function
+
+
+def analyze(
+    project_path: str,
+    entries: Optional[Iterable[str] | str] = None,
+    options: Optional[AnalyzeOptions] = None,
+) -> Iterator[FunctionSummarize]:
+    """
+    Yield the summaries of every function reachable from each entry (callers first),
+    straight from the in-memory analysis. `entries` defaults to every function
+    defined in the project's sources. Each summary's `entry` is the entry it was
+    reached from and, with `options.blocks`, `blocks` lists the memory blocks
+    (addr, name, type, parent, size, read, write) the function reads or writes.
+    Each call yields fresh shallow copies of the session's cached summaries.
+    Unknown entries raise ValueError.
+    """
+    options = options or AnalyzeOptions()
+    session = get_session(project_path, options)
+    if entries is None:
+        entries = session.source_function_names()
+    elif isinstance(entries, str):
+        entries = [entries]
+    for entry in entries:
+        summaries = session.summary_objects(entry)
+        blocks = _blocks_by_function(session.memory(entry)) if options.blocks else None
+        for cached in summaries:
+            summary = copy.copy(cached)
+            summary.entry = entry
+            summary.blocks = blocks.get(summary.function_name, []) if blocks is not None else None
+            yield summary
+
+
+__all__ = ["AnalyzeOptions", "analyze", "clear_sessions", "get_session"]
@@ -6,6 +6,43 @@ from typing import Dict, Iterable, List, Set
 from clang.cindex import Index, CursorKind
 
 
+def is_in_project(cursor, project_path: str) -> bool:
+    loc = cursor.location
+    if not loc or not loc.file:
+        return False
+    return os.path.abspath(loc.file.name).startswith(project_path)
+
+
+def _collect_calls(func_cursor, func_name: str, call_graph: Dict[str, Set[str]]) -> None:
+    # Explicit stack: deeply nested bodies must not hit the recursion limit.
+    stack = list(func_cursor.get_children())
+    while stack:
+        child = stack.pop()
+        if child.kind == CursorKind.CALL_EXPR:
+            callee_name = child.spelling or ""
+            if not callee_name:
+                ref = getattr(child, "referenced", None)
+                callee_name = getattr(ref, "spelling", "") if ref else ""
+            if callee_name:
+                call_graph.setdefault(func_name, set()).add(callee_name)
+        stack.extend(child.get_children())
+
+
+def add_translation_unit_calls(tu, project_path: str, call_graph: Dict[str, Set[str]]) -> None:
+    """
+    Add the call edges of every project function defined in `tu` to `call_graph`.
+    """
+    for cursor in tu.cursor.get_children():
+        if cursor.kind == CursorKind.FUNCTION_DECL and cursor.is_definition():
+            if not is_in_project(cursor, project_path):
+                continue
+            func_name = cursor.spelling
+            if not func_name:
+                continue
+            call_graph.setdefault(func_name, set())
+            _collect_calls(cursor, func_name, call_graph)
+
+
 def build_call_graph(project_path: str) -> Dict[str, Set[str]]:
     """
     Parse a project and build a call graph (caller -> set of callees).
@@ -25,35 +62,10 @@ def build_call_graph(project_path: str) -> Dict[str, Set[str]]:
                     sources.append(os.path.join(root, file))
         return sources
 
-    def is_in_project(cursor) -> bool:
-        loc = cursor.location
-        if not loc or not loc.file:
-            return False
-        return os.path.abspath(loc.file.name).startswith(project_path)
-
-    def collect_calls(func_cursor, func_name: str) -> None:
-        for child in func_cursor.get_children():
-            if child.kind == CursorKind.CALL_EXPR:
-                callee_name = child.spelling or ""
-                if not callee_name:
-                    ref = getattr(child, "referenced", None)
-                    callee_name = getattr(ref, "spelling", "") if ref else ""
-                if callee_name:
-                    call_graph.setdefault(func_name, set()).add(callee_name)
-            collect_calls(child, func_name)
-
     args = [f"-I{project_path}"]
     for file_path in iter_source_files():
         tu = index.parse(file_path, args=args)
-        for cursor in tu.cursor.get_children():
-            if cursor.kind == CursorKind.FUNCTION_DECL and cursor.is_definition():
-                if not is_in_project(cursor):
-                    continue
-                func_name = cursor.spelling
-                if not func_name:
-                    continue
-                call_graph.setdefault(func_name, set())
-                collect_calls(cursor, func_name)
+        add_translation_unit_calls(tu, project_path, call_graph)
 
     return call_graph
 
@@ -96,4 +108,4 @@ def reverse_topo_from_project(project_path: str, root: str) -> List[str]:
     return reverse_topo_from_root(graph, root)
 
 
-__all__ = ["build_call_graph", "reverse_topo_from_root", "reverse_topo_from_project"]
+__all__ = ["is_in_project", "add_translation_unit_calls", "build_call_graph", "reverse_topo_from_root", "reverse_topo_from_project"]
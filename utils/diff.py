@@ -0,0 +1,188 @@
+"""
+Differential analysis: which functions' interface classification changed
+between a base and a head revision of a project.
+
+The base revision is analyzed in a warm session; the head revision is then
+applied to it as unsaved buffers for the files whose content hash differs.
+Only the translation units including a changed file are re-parsed, and only
+the entries reaching a changed function (or every entry, when declarations
+changed) are re-analyzed; the other entries keep their cached summaries and
+cannot differ.
+
+Without entries, each revision is analyzed once as a whole and only the changed
+functions and their transitive callers are summarized again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from models.summarize import FunctionSummarize
+from utils.session import AnalysisSession
+
+CATEGORIES = ("parameters", "state", "input", "output", "inout")
+
+
+def _project_hashes(project_path: str) -> Dict[str, str]:
+    # Relative path -> content hash of every .c/.h file.
+    hashes: Dict[str, str] = {}
+    for root, _, files in os.walk(project_path):
+        for file in files:
+            if not file.endswith((".c", ".h")):
+                continue
+            path = os.path.join(root, file)
+            with open(path, "rb") as f:
+                hashes[os.path.relpath(path, project_path)] = hashlib.sha1(f.read()).hexdigest()
+    return hashes
+
+
+def changed_files(base_path: str, head_path: str) -> List[str]:
+    """
+    Relative paths of the .c/.h files added, removed or modified between two trees.
+    """
+    base = _project_hashes(base_path)
+    head = _project_hashes(head_path)
+    return sorted(rel for rel in set(base) | set(head) if base.get(rel) != head.get(rel))
+
+
+def _interface(summary: Optional[FunctionSummarize]) -> Dict[str, List[Tuple[str, str]]]:
+    if summary is None:
+        return {category: [] for category in CATEGORIES}
+    semantics = summary.interface_semantics
+    return {category: [(v.name, v.type) for v in getattr(semantics, category)] for category in CATEGORIES}
+
+
+def diff_summaries(base: Optional[FunctionSummarize], head: Optional[FunctionSummarize]) -> Optional[dict]:
+    """
+    Per-category added/removed variables between two summaries of one function,
+    or None if its interface is unchanged. A missing side means the function was
+    added or removed.
+    """
+    old, new = _interface(base), _interface(head)
+    changes = {}
+    for category in CATEGORIES:
+        added = [{"name": n, "type": t} for n, t in new[category] if (n, t) not in old[category]]
+        removed = [{"name": n, "type": t} for n, t in old[category] if (n, t) not in new[category]]
+        if added or removed:
+            changes[category] = {"added": added, "removed": removed}
+    if base is not None and head is not None and not changes:
+        return None
+    status = "added" if base is None else "removed" if head is None else "changed"
+    return {
+        "function_name": (head or base).function_name,
+        "status": status,
+        "interface_semantics": changes,
+    }
+
+
+def _by_name(summaries: Optional[List[FunctionSummarize]]) -> Dict[str, FunctionSummarize]:
+    return {s.function_name: s for s in summaries or []}
+
+
+def _with_callers(call_graph: Dict[str, Set[str]], names: Iterable[str]) -> Set[str]:
+    # `names` and every function calling one of them, directly or not.
+    callers: Dict[str, Set[str]] = {}
+    for caller, callees in call_graph.items():
+        for callee in callees:
+            callers.setdefault(callee, set()).add(caller)
+    seen = set(names)
+    stack = list(seen)
+    while stack:
+        for caller in callers.get(stack.pop(), ()):
+            if caller not in seen:
+                seen.add(caller)
+                stack.append(caller)
+    return seen
+
+
+def _diff_roots(
+    session: AnalysisSession,
+    base: Dict[str, FunctionSummarize],
+    base_graph: Dict[str, Set[str]],
+    update: Optional[dict],
+) -> Tuple[List[str], List[dict]]:
+    # Re-summarize the functions an update can affect from one whole-project analysis of head.
+    if update is None:
+        return [], []
+    names = list(dict.fromkeys([*base, *session.source_function_names()]))
+    if not update["declarations_changed"]:
+        changed = update["changed_functions"]
+        affected = _with_callers(base_graph, changed) | _with_callers(session.parser.call_graph(), changed)
+        names = [name for name in names if name in affected]
+    head = session.project_summaries(names) if names else {}
+    changes: List[dict] = []
+    for name in names:
+        change = diff_summaries(base.get(name), head.get(name))
+        if change is not None:
+            changes.append({"entry": name, **change})
+    return names, changes
+
+
+def diff_projects(
+    base_path: str,
+    head_path: str,
+    entries: Optional[Iterable[str]] = None,
+    **parser_options,
+) -> dict:
+    """
+    Interface changes of every function reachable from each entry between the
+    base and head trees. Without `entries`, every function defined in either
+    revision is diffed on its own summary from a whole-project analysis.
+
+    Returns {"changed_files", "reanalyzed", "changes"}, where each change carries
+    the entry, function_name, status (added/removed/changed) and the per-category
+    added/removed variables.
+    """
+    session = AnalysisSession(base_path, **parser_options)
+    roots_only = entries is None
+    if roots_only:
+        base_summaries = session.project_summaries()
+        base_graph = session.parser.call_graph()
+    else:
+        entries = list(dict.fromkeys(entries))
+        base_results = {
+            entry: session.summary_objects(entry)
+            for entry in entries if entry in session.parser.symbols
+        }
+
+    files = changed_files(base_path, head_path)
+    buffers: Dict[str, Optional[str]] = {}
+    for rel in files:
+        head_file = os.path.join(head_path, rel)
+        contents = ""  # removed in head
+        if os.path.isfile(head_file):
+            with open(head_file, "r", encoding="utf-8", errors="replace") as f:
+                contents = f.read()
+        buffers[os.path.join(session.parser.project_path, rel)] = contents
+    update = session.update_buffers(buffers) if buffers else None
+
+    if roots_only:
+        reanalyzed_names, changes = _diff_roots(session, base_summaries, base_graph, update)
+        return {"changed_files": files, "reanalyzed": reanalyzed_names, "changes": changes}
+    reanalyzed = set(update["invalidated"]) if update else set()
+    unknown = [e for e in entries if e not in base_results and e not in session.parser.symbols]
+    if unknown:
+        raise ValueError(f"Function '{unknown[0]}' not found")
+
+    changes: List[dict] = []
+    for entry in entries:
+        in_head = entry in session.parser.symbols
+        if entry in base_results and entry not in reanalyzed and in_head:
+            continue  # nothing the entry reaches changed
+        reanalyzed.add(entry)
+        base = _by_name(base_results.get(entry))
+        head = _by_name(session.summary_objects(entry) if in_head else None)
+        for name in dict.fromkeys([*base, *head]):
+            change = diff_summaries(base.get(name), head.get(name))
+            if change is not None:
+                changes.append({"entry": entry, **change})
+    return {
+        "changed_files": files,
+        "reanalyzed": [entry for entry in entries if entry in reanalyzed],
+        "changes": changes,
+    }
+
+
+__all__ = ["changed_files", "diff_projects", "diff_summaries"]
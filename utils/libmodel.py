@@ -0,0 +1,218 @@
+"""
+Compiled library model: the function config files (`config/*.json`) indexed by
+function name in a SQLite cache.
+
+The cache records every source file's mtime, size and content hash. It is
+rebuilt when a file is added, removed or its content changes; a touched but
+unchanged file only refreshes its recorded mtime. Entries are looked up one name
+at a time, so only the configured functions a project actually calls are read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS functions (
+    name TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    model TEXT NOT NULL
+);
+"""
+
+
+def default_cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ip-parser")
+
+
+def _parse_ptr_target_name(target: Any) -> str | None:
+    if target is None:
+        return None
+    if not isinstance(target, str):
+        target = str(target)
+    name = target.strip()
+    if not name:
+        return None
+    if name.upper() in {"NULL", "nullptr".upper()}:
+        return None
+    return name
+
+
+def compile_function_model(item: Any) -> Optional[Dict[str, Any]]:
+    """
+    Validate one config entry and reduce it to what instantiation needs:
+    arguments as (name, type, read, write) and ptr_init as (name, target or None).
+    Returns None for malformed entries, which the loader skips.
+    """
+    if not isinstance(item, dict):
+        return None
+    func_name = item.get("function_name")
+    args = item.get("arguments", [])
+    if not func_name or not isinstance(args, list):
+        return None
+    arguments: List[Tuple[str, str, bool, bool]] = []
+    for arg in args:
+        if not isinstance(arg, dict):
+            continue
+        name = arg.get("name")
+        type_str = arg.get("type")
+        if not name or not type_str:
+            continue
+        arguments.append((name, type_str, bool(arg.get("read", False)), bool(arg.get("write", False))))
+    ptr_init: List[Tuple[str, Optional[str]]] = []
+    ptr_init_items = item.get("ptr_init", [])
+    if isinstance(ptr_init_items, list):
+        for pi in ptr_init_items:
+            if not isinstance(pi, dict):
+                continue
+            src_name = pi.get("name")
+            if not src_name:
+                continue
+            ptr_init.append((src_name, _parse_ptr_target_name(pi.get("target"))))
+    return {"function_name": func_name, "arguments": arguments, "ptr_init": ptr_init}
+
+
+class LibraryModel:
+    """
+    Name-indexed view over the function config files in `config_dirs`.
+    When several files configure the same name, the first one (in directory
+    order) wins.
+    """
+
+    def __init__(self, config_dirs: Iterable[str], cache_dir: str | None = None):
+        self.config_dirs = [os.path.abspath(d) for d in config_dirs]
+        self.cache_path = ":memory:"
+        if cache_dir is not None:
+            key = hashlib.sha1("\0".join(self.config_dirs).encode("utf-8")).hexdigest()[:16]
+            self.cache_path = os.path.join(cache_dir, f"libmodel-{key}.sqlite")
+        self._conn: sqlite3.Connection | None = None
+
+    def _source_files(self) -> List[str]:
+        files: List[str] = []
+        seen = set()
+        for config_dir in self.config_dirs:
+            if not os.path.isdir(config_dir):
+                continue
+            for filename in os.listdir(config_dir):
+                if not filename.endswith(".json"):
+                    continue
+                path = os.path.join(config_dir, filename)
+                if path in seen:
+                    continue
+                seen.add(path)
+                files.append(path)
+        return files
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            try:
+                if self.cache_path != ":memory:":
+                    os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                self._conn = sqlite3.connect(self.cache_path)
+                self._conn.executescript(_SCHEMA)
+            except (OSError, sqlite3.Error):
+                # Unwritable cache location: compile into memory instead.
+                self.cache_path = ":memory:"
+                self._conn = sqlite3.connect(self.cache_path)
+                self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def refresh(self) -> bool:
+        """
+        Make the index match the config files on disk. Returns True if it was rebuilt.
+        """
+        conn = self._connect()
+        recorded = {row[0]: row[1:] for row in conn.execute("SELECT path, mtime_ns, size, sha1 FROM sources")}
+        files = self._source_files()
+        stats: Dict[str, os.stat_result] = {}
+        for path in files:
+            try:
+                stats[path] = os.stat(path)
+            except OSError:
+                continue
+        touched: List[Tuple[int, str]] = []
+        stale = set(recorded) != set(stats)
+        if not stale:
+            for path, st in stats.items():
+                mtime_ns, size, sha1 = recorded[path]
+                if (st.st_mtime_ns, st.st_size) == (mtime_ns, size):
+                    continue
+                if st.st_size != size or self._hash(path) != sha1:
+                    stale = True
+                    break
+                touched.append((st.st_mtime_ns, path))
+        if not stale:
+            if touched:
+                with conn:
+                    conn.executemany("UPDATE sources SET mtime_ns = ? WHERE path = ?", touched)
+            return False
+        self._rebuild(conn, [p for p in files if p in stats], stats)
+        return True
+
+    @staticmethod
+    def _hash(path: str) -> str:
+        try:
+            with open(path, "rb") as f:
+                return hashlib.sha1(f.read()).hexdigest()
+        except OSError:
+            return ""
+
+    def _rebuild(self, conn: sqlite3.Connection, files: List[str], stats: Dict[str, os.stat_result]) -> None:
+        sources = []
+        functions: Dict[str, Tuple[str, str]] = {}
+        for path in files:
+            try:
+                with open(path, "rb") as f:
+                    raw = f.read()
+                data = json.loads(raw.decode("utf-8"))
+            except Exception:
+                data = None
+            st = stats[path]
+            sources.append((path, st.st_mtime_ns, st.st_size, hashlib.sha1(raw).hexdigest() if data is not None else ""))
+            if not isinstance(data, list):
+                continue
+            filename = os.path.basename(path)
+            for item in data:
+                model = compile_function_model(item)
+                if model is None or model["function_name"] in functions:
+                    continue
+                functions[model["function_name"]] = (filename, json.dumps(model))
+        with conn:
+            conn.execute("DELETE FROM sources")
+            conn.execute("DELETE FROM functions")
+            conn.executemany("INSERT INTO sources VALUES (?, ?, ?, ?)", sources)
+            conn.executemany(
+                "INSERT INTO functions VALUES (?, ?, ?)",
+                [(name, filename, model) for name, (filename, model) in functions.items()],
+            )
+
+    def lookup(self, name: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        (config file name, compiled model) for a configured function, or None.
+        """
+        row = self._connect().execute("SELECT filename, model FROM functions WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def names(self) -> List[str]:
+        return [row[0] for row in self._connect().execute("SELECT name FROM functions")]
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+__all__ = ["LibraryModel", "compile_function_model", "default_cache_dir"]
@@ -0,0 +1,100 @@
+"""
+Streaming dump of the abstract memory (`--memory`) in text, CSV or NDJSON,
+optionally restricted to globals, blocks touched by a function or a name glob.
+"""
+
+import csv
+import json
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, Optional, TextIO
+
+from models.variables import VARIABLE_DOMAIN
+
+CSV_FIELDS = ("addr", "name", "type", "parent", "size", "domain", "read", "write")
+
+
+@dataclass
+class MemoryFilter:
+    """
+    Which blocks to dump; the default keeps every visible block.
+
+    globals_only: only blocks whose root variable is a global.
+    touched_by: only blocks the named function reads or writes.
+    name_glob: only blocks whose name matches this shell-style pattern.
+    """
+    globals_only: bool = False
+    touched_by: Optional[str] = None
+    name_glob: Optional[str] = None
+
+
+def iter_memory_rows(mem, structs, memory_filter: MemoryFilter | None = None) -> Iterable[Dict[str, Any]]:
+    """
+    Yield one row per visible block in address order, with its root variable's domain.
+    """
+    memory_filter = memory_filter or MemoryFilter()
+    blocks = mem._blocks
+    root_domain: Dict[int, VARIABLE_DOMAIN] = {}
+    for addr in range(1, len(blocks)):
+        block = blocks[addr]
+        if block is None:
+            continue
+        # Children are always allocated after their parent.
+        domain = block.var.domain if block.parent == 0 else root_domain.get(block.parent, block.var.domain)
+        root_domain[addr] = domain
+        var = block.var
+        if getattr(var, "hidden", False):
+            continue
+        if memory_filter.globals_only and domain != VARIABLE_DOMAIN.GLOBAL:
+            continue
+        if memory_filter.touched_by is not None and memory_filter.touched_by not in var.read and memory_filter.touched_by not in var.write:
+            continue
+        if memory_filter.name_glob is not None and not fnmatchcase(var.name, memory_filter.name_glob):
+            continue
+        yield {
+            "addr": addr,
+            "name": var.name,
+            "type": var.raw_type,
+            "parent": block.parent,
+            "size": structs.get_size(var.raw_type),
+            "domain": domain.value,
+            "read": sorted(var.read),
+            "write": sorted(var.write),
+        }
+
+
+def _write_text(rows: Iterable[Dict[str, Any]], f: TextIO) -> None:
+    f.write("Memory Blocks:\n\n")
+    for row in rows:
+        f.write(
+            f"  M: Addr {row['addr']}: {row['name']} "
+            f"(type {row['type']}, parent={row['parent']}, size={row['size']})\n"
+        )
+        f.write(f"     R: {', '.join(row['read']) if row['read'] else '-'}\n")
+        f.write(f"     W: {', '.join(row['write']) if row['write'] else '-'}\n")
+
+
+def _write_csv(rows: Iterable[Dict[str, Any]], f: TextIO) -> None:
+    writer = csv.writer(f)
+    writer.writerow(CSV_FIELDS)
+    for row in rows:
+        writer.writerow([
+            row["addr"], row["name"], row["type"], row["parent"], row["size"], row["domain"],
+            ";".join(row["read"]), ";".join(row["write"]),
+        ])
+
+
+def _write_ndjson(rows: Iterable[Dict[str, Any]], f: TextIO) -> None:
+    for row in rows:
+        f.write(json.dumps(row, ensure_ascii=False))
+        f.write("\n")
+
+
+MEMORY_WRITERS = {
+    "text": (".txt", _write_text),
+    "csv": (".csv", _write_csv),
+    "ndjson": (".ndjson", _write_ndjson),
+}
+
+
+__all__ = ["CSV_FIELDS", "MEMORY_WRITERS", "MemoryFilter", "iter_memory_rows"]
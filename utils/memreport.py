@@ -0,0 +1,232 @@
+"""
+Memory-footprint report: RSS and tracemalloc samples at phase boundaries, plus
+attribution of abstract memory blocks to root variables and struct types.
+"""
+
+import json
+import os
+import sys
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from utils.profile import Profiler
+
+# Phases that end with a full tracemalloc snapshot; allocation sites are reported
+# as the difference between consecutive snapshots.
+SNAPSHOT_PHASES = ("collect_declarations", "allocate_globals", "analyze_memories")
+FUNCTION_PHASES = ("parse_function", "allocate_params", "summarize_function")
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _block_bytes(block) -> int:
+    """
+    Shallow size estimate of one memory block and the Variable it owns.
+    """
+    var = block.var
+    size = sys.getsizeof(block) + sys.getsizeof(block.__dict__) + sys.getsizeof(block.pointers)
+    if var is not None:
+        size += sys.getsizeof(var) + sys.getsizeof(var.__dict__) + sys.getsizeof(var.name)
+        size += sys.getsizeof(var.points_to) + sys.getsizeof(var.read) + sys.getsizeof(var.write)
+    return size
+
+
+class MemoryReporter:
+    """
+    Phase listener collecting memory samples; see `Profiler.add_listener`.
+    """
+
+    def __init__(self, top_n: int = 20):
+        self.top_n = top_n
+        self.samples: List[Dict[str, Any]] = []
+        self.phase_totals: Dict[str, Dict[str, Any]] = {}
+        self.functions: List[Dict[str, Any]] = []
+        self.allocation_sites: List[Dict[str, Any]] = []
+        self._starts: Dict[str, tuple[int, int]] = {}
+        self._last_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._last_snapshot_phase = "start"
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._last_snapshot = tracemalloc.take_snapshot()
+        Profiler.add_listener(self)
+
+    def stop(self) -> None:
+        Profiler.remove_listener(self)
+        self._snapshot("end")
+        tracemalloc.stop()
+
+    def _blocks(self) -> int:
+        from memory_managing.memory import MemoryManager
+        return len(MemoryManager.instance()._blocks) - 1
+
+    def phase_started(self, name: str, args: Dict[str, Any]) -> None:
+        self._starts[name] = (tracemalloc.get_traced_memory()[0], self._blocks())
+
+    def phase_finished(self, name: str, args: Dict[str, Any]) -> None:
+        traced, peak = tracemalloc.get_traced_memory()
+        traced_start, blocks_start = self._starts.pop(name, (traced, 0))
+        blocks = self._blocks()
+        if name in FUNCTION_PHASES:
+            self.functions.append({
+                "phase": name,
+                "function": args.get("function"),
+                "traced_delta": traced - traced_start,
+                "blocks": blocks - blocks_start,
+            })
+            return
+        rss = _rss_bytes()
+        sample = {
+            "phase": name,
+            "rss": rss,
+            "traced": traced,
+            "traced_peak": peak,
+            "blocks": blocks,
+        }
+        # Repeated phases (one per file) collapse into their last sample.
+        if self.samples and self.samples[-1]["phase"] == name:
+            self.samples[-1] = sample
+        else:
+            self.samples.append(sample)
+        totals = self.phase_totals.setdefault(name, {"calls": 0, "traced_delta": 0, "blocks_delta": 0, "max_rss": 0})
+        totals["calls"] += 1
+        totals["traced_delta"] += traced - traced_start
+        totals["blocks_delta"] += blocks - blocks_start
+        totals["max_rss"] = max(totals["max_rss"], rss)
+        if name in SNAPSHOT_PHASES:
+            self._snapshot(name)
+
+    def _snapshot(self, phase: str) -> None:
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        if self._last_snapshot is not None:
+            stats = snapshot.compare_to(self._last_snapshot, "lineno")
+            stats = [s for s in stats if s.size_diff > 0][:self.top_n]
+            self.allocation_sites.append({
+                "interval": f"{self._last_snapshot_phase} -> {phase}",
+                "sites": [
+                    {"site": str(s.traceback), "size_diff": s.size_diff, "count_diff": s.count_diff}
+                    for s in stats
+                ],
+            })
+        self._last_snapshot = snapshot
+        self._last_snapshot_phase = phase
+
+    def attribute_blocks(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Block counts and estimated bytes per root variable and per root struct type.
+        """
+        from memory_managing.memory import MemoryManager
+        from models.structs import StructsManager
+
+        mem = MemoryManager.instance()
+        structs = StructsManager.instance()
+        roots: Dict[int, Dict[str, Any]] = {}
+        root_of: List[int] = [0] * len(mem._blocks)
+        for addr in range(1, len(mem._blocks)):
+            block = mem._blocks[addr]
+            if block is None:
+                continue
+            # Children are always allocated after their parent.
+            root = addr if block.parent == 0 else root_of[block.parent]
+            root_of[addr] = root
+            if root == addr:
+                var = block.var
+                roots[addr] = {
+                    "name": var.name,
+                    "type": var.raw_type,
+                    "domain": var.domain.value,
+                    "blocks": 0,
+                    "bytes": 0,
+                }
+            entry = roots[root]
+            entry["blocks"] += 1
+            entry["bytes"] += _block_bytes(block)
+
+        types: Dict[str, Dict[str, Any]] = {}
+        for entry in roots.values():
+            type_name = structs.get_decoded_name(entry["type"])
+            while structs.is_array(type_name):
+                type_name = structs.get_decoded_name(structs.parse_array_type(type_name)[0])
+            if not structs.is_struct(type_name) and structs.get_struct(f"struct {type_name}") is None:
+                continue
+            if structs.get_struct(type_name) is None:
+                type_name = f"struct {type_name}"
+            info = types.setdefault(type_name, {
+                "type": type_name,
+                "size": structs.get_size(type_name),
+                "roots": 0,
+                "blocks": 0,
+                "bytes": 0,
+            })
+            info["roots"] += 1
+            info["blocks"] += entry["blocks"]
+            info["bytes"] += entry["bytes"]
+
+        by_size = lambda e: (-e["bytes"], -e["blocks"])
+        return {
+            "roots": sorted(roots.values(), key=by_size)[:self.top_n],
+            "types": sorted(types.values(), key=by_size)[:self.top_n],
+        }
+
+    def build_report(self) -> Dict[str, Any]:
+        attribution = self.attribute_blocks()
+        return {
+            "samples": self.samples,
+            "phases": self.phase_totals,
+            "functions": sorted(self.functions, key=lambda e: (-e["traced_delta"], -e["blocks"]))[:self.top_n],
+            "allocation_sites": self.allocation_sites,
+            "roots": attribution["roots"],
+            "types": attribution["types"],
+        }
+
+    def write(self, text_path: str, json_path: str) -> None:
+        report = self.build_report()
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        mb = lambda n: n / (1024 * 1024)
+        lines = ["Phase boundaries:", ""]
+        lines.append(f"  {'phase':<28}{'rss MB':>10}{'traced MB':>12}{'peak MB':>10}{'blocks':>10}")
+        for sample in report["samples"]:
+            lines.append(
+                f"  {sample['phase']:<28}{mb(sample['rss']):>10.2f}{mb(sample['traced']):>12.2f}"
+                f"{mb(sample['traced_peak']):>10.2f}{sample['blocks']:>10}"
+            )
+        lines.extend(["", "Phases:", ""])
+        lines.append(f"  {'phase':<28}{'calls':>7}{'max rss MB':>12}{'traced +MB':>12}{'blocks +':>10}")
+        for name, totals in sorted(report["phases"].items(), key=lambda item: -item[1]["traced_delta"]):
+            lines.append(
+                f"  {name:<28}{totals['calls']:>7}{mb(totals['max_rss']):>12.2f}"
+                f"{mb(totals['traced_delta']):>12.2f}{totals['blocks_delta']:>10}"
+            )
+        lines.extend(["", f"Top {self.top_n} root variables:", ""])
+        lines.append(f"  {'variable':<48}{'domain':<8}{'blocks':>9}{'est. KB':>10}  type")
+        for entry in report["roots"]:
+            lines.append(f"  {entry['name']:<48}{entry['domain']:<8}{entry['blocks']:>9}{entry['bytes'] / 1024:>10.1f}  {entry['type']}")
+        lines.extend(["", f"Top {self.top_n} struct types:", ""])
+        lines.append(f"  {'type':<40}{'size':>7}{'roots':>7}{'blocks':>9}{'est. KB':>10}")
+        for entry in report["types"]:
+            lines.append(f"  {entry['type']:<40}{entry['size']:>7}{entry['roots']:>7}{entry['blocks']:>9}{entry['bytes'] / 1024:>10.1f}")
+        lines.extend(["", f"Top {self.top_n} functions by traced allocation:", ""])
+        for entry in report["functions"]:
+            lines.append(f"  {str(entry['function']):<40}{entry['phase']:<20}{mb(entry['traced_delta']):>10.3f} MB{entry['blocks']:>9} blocks")
+        for interval in report["allocation_sites"]:
+            lines.extend(["", f"Allocation sites {interval['interval']}:", ""])
+            for site in interval["sites"]:
+                lines.append(f"  {site['size_diff'] / 1024:>10.1f} KB {site['count_diff']:>8}  {site['site']}")
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+__all__ = ["MemoryReporter"]
@@ -0,0 +1,176 @@
+"""
+Precompiled header for the include block most project sources start with.
+
+The leading `#include` lines of every .c file are read textually; the prefix
+shared by the most files is compiled once into a PCH with libclang and passed
+to those files with `-include-pch`. Only include-guarded headers take part, so
+the files' own `#include` lines of the same headers become no-ops. The PCH is
+cached across runs next to a manifest of the files it was built from and is
+rebuilt when one of them changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from clang.cindex import TranslationUnitSaveError, conf
+
+_INCLUDE_RE = re.compile(r'#\s*include\s*([<"])([^>"]+)[>"]')
+_DIRECTIVE_RE = re.compile(r"#\s*(\w+)\s*(\w*)")
+
+PCH_HEADER = os.path.join(os.sep, "__ip_parser_pch__", "prefix.h")
+
+
+def _code_lines(text: str) -> Iterable[str]:
+    # Lines with comments removed, skipping blank ones.
+    text = re.sub(r"/\*.*?\*/", " ", text, flags=re.S)
+    for line in text.splitlines():
+        line = line.split("//", 1)[0].strip()
+        if line:
+            yield line
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def is_guarded(path: str) -> bool:
+    """
+    Whether a header starts with `#pragma once` or an `#ifndef X` / `#define X` guard.
+    """
+    text = _read(path)
+    if text is None:
+        return False
+    lines = _code_lines(text)
+    first = _DIRECTIVE_RE.match(next(lines, ""))
+    if first is None:
+        return False
+    if first.group(1) == "pragma" and first.group(2) == "once":
+        return True
+    second = _DIRECTIVE_RE.match(next(lines, ""))
+    return (
+        first.group(1) == "ifndef" and second is not None
+        and second.group(1) == "define" and second.group(2) == first.group(2)
+    )
+
+
+def leading_includes(path: str, include_dirs: Sequence[str]) -> List[str]:
+    """
+    The `#include` lines a source file starts with, as `"<absolute path>"` or `<name>`,
+    up to the first other line or the first quoted header that is unresolved or unguarded.
+    """
+    text = _read(path)
+    if text is None:
+        return []
+    includes: List[str] = []
+    for line in _code_lines(text):
+        m = _INCLUDE_RE.match(line)
+        if m is None:
+            break
+        delim, name = m.groups()
+        if delim == "<":
+            includes.append(f"<{name}>")
+            continue
+        candidates = [os.path.join(os.path.dirname(path), name)]
+        candidates.extend(os.path.join(d, name) for d in include_dirs)
+        resolved = next((os.path.abspath(c) for c in candidates if os.path.isfile(c)), None)
+        if resolved is None or not is_guarded(resolved):
+            break
+        includes.append(f'"{resolved}"')
+    return includes
+
+
+def common_prefix(files: Iterable[str], include_dirs: Sequence[str]) -> Tuple[Tuple[str, ...], List[str]]:
+    """
+    The include prefix shared by the most files (longest on ties) and those files.
+    The prefix is empty when no two files share one.
+    """
+    leading = {path: tuple(leading_includes(path, include_dirs)) for path in files}
+    counts: Dict[Tuple[str, ...], int] = {}
+    for includes in leading.values():
+        for k in range(1, len(includes) + 1):
+            counts[includes[:k]] = counts.get(includes[:k], 0) + 1
+    best: Tuple[str, ...] = ()
+    for prefix, count in counts.items():
+        if count >= 2 and (count, len(prefix)) > (counts.get(best, 0), len(best)):
+            best = prefix
+    if not best:
+        return (), []
+    return best, [path for path, includes in leading.items() if includes[:len(best)] == best]
+
+
+def _stat_key(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class PrefixPch:
+    """
+    Builds, or reuses from `cache_dir`, the PCH for an include prefix under fixed clang args.
+    """
+
+    def __init__(self, index, args: Sequence[str], cache_dir: str):
+        self.index = index
+        self.args = list(args)
+        self.cache_dir = cache_dir
+        self.path: Optional[str] = None
+        self.dependencies: Set[str] = set()  # every file the PCH was built from
+
+    def prepare(self, prefix: Sequence[str]) -> Optional[str]:
+        """
+        Path of an up-to-date PCH for `prefix`, or None if it cannot be built here.
+        """
+        self.path = None
+        self.dependencies = set()
+        if not prefix:
+            return None
+        text = "".join(f"#include {inc}\n" for inc in prefix)
+        key = hashlib.sha1("\0".join([text, *self.args, conf.get_filename() or ""]).encode("utf-8")).hexdigest()[:16]
+        pch_path = os.path.join(self.cache_dir, f"prefix-{key}.pch")
+        manifest_path = pch_path + ".json"
+        manifest = self._load_manifest(manifest_path)
+        if manifest is not None and os.path.isfile(pch_path):
+            if all(_stat_key(dep) == stat for dep, stat in manifest.items()):
+                self.path = pch_path
+                self.dependencies = set(manifest)
+                return pch_path
+        return self._build(text, pch_path, manifest_path)
+
+    @staticmethod
+    def _load_manifest(manifest_path: str) -> Optional[Dict[str, List[int]]]:
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _build(self, text: str, pch_path: str, manifest_path: str) -> Optional[str]:
+        tu = self.index.parse(PCH_HEADER, args=["-x", "c-header", *self.args], unsaved_files=[(PCH_HEADER, text)])
+        deps = {os.path.abspath(inc.include.name) for inc in tu.get_includes()}
+        manifest = {dep: _stat_key(dep) for dep in sorted(deps)}
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{pch_path}.{os.getpid()}.tmp"
+            tu.save(tmp_path)
+            os.replace(tmp_path, pch_path)
+            with open(manifest_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+        except (OSError, TranslationUnitSaveError):
+            return None
+        self.path = pch_path
+        self.dependencies = deps
+        return pch_path
+
+
+__all__ = ["PrefixPch", "common_prefix", "is_guarded", "leading_includes"]
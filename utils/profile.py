@@ -0,0 +1,239 @@
+import json
+import time
+from collections import defaultdict
+from typing import Any, Dict, List
+
+
+class _NullContext:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class _PhaseTimer:
+    def __init__(self, name: str, args: Dict[str, Any]):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        for listener in Profiler._listeners:
+            listener.phase_started(self.name, self.args)
+        self.start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        if Profiler.ENABLED:
+            Profiler._record(self.name, self.start, time.perf_counter() - self.start, time.process_time() - self.cpu_start, self.args)
+        for listener in Profiler._listeners:
+            listener.phase_finished(self.name, self.args)
+        return False
+
+
+class _FunctionTimer(_PhaseTimer):
+    """
+    Phase timer that also records per-function counter and block deltas.
+    """
+
+    def __enter__(self):
+        from memory_managing.memory import MemoryManager
+        self.mem = MemoryManager.instance()
+        self.blocks_start = len(self.mem._blocks)
+        self.counters_start = dict(Profiler._counters)
+        return super().__enter__()
+
+    def __exit__(self, *exc) -> bool:
+        if not Profiler.ENABLED:
+            return super().__exit__(*exc)
+        wall = time.perf_counter() - self.start
+        cpu = time.process_time() - self.cpu_start
+        counters = {
+            key: value - self.counters_start.get(key, 0)
+            for key, value in Profiler._counters.items()
+            if value != self.counters_start.get(key, 0)
+        }
+        entry = {
+            "phase": self.name,
+            "function": self.args.get("function"),
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "blocks": len(self.mem._blocks) - self.blocks_start,
+            **counters,
+        }
+        Profiler._functions.append(entry)
+        Profiler._record(self.name, self.start, wall, cpu, {**self.args, **{k: v for k, v in entry.items() if k not in ("phase", "function")}})
+        for listener in Profiler._listeners:
+            listener.phase_finished(self.name, self.args)
+        return False
+
+
+class Profiler:
+    """
+    Opt-in phase timing and counters.
+
+    While disabled, `phase` and `function` return a shared no-op context and no
+    hooks are installed, so instrumented code pays only a flag check per phase.
+    Enabling installs counting wrappers around `MemoryManager.ensure_address` and
+    libclang's `Cursor.get_children`.
+
+    Listeners (objects with `phase_started(name, args)` / `phase_finished(name, args)`)
+    are notified at phase boundaries even when timing itself is disabled.
+    """
+
+    ENABLED = False
+    ACTIVE = False  # timing enabled or listeners registered
+
+    _origin = time.perf_counter()
+    _events: List[Dict[str, Any]] = []
+    _phase_totals: Dict[str, List[float]] = {}  # name -> [wall, cpu, count]
+    _functions: List[Dict[str, Any]] = []
+    _counters: Dict[str, int] = defaultdict(int)
+    _originals: Dict[str, Any] = {}
+    _listeners: List[Any] = []
+
+    @classmethod
+    def enable(cls) -> None:
+        if cls.ENABLED:
+            return
+        cls.ENABLED = True
+        cls.ACTIVE = True
+        cls._origin = time.perf_counter()
+        cls._install_hooks()
+
+    @classmethod
+    def disable(cls) -> None:
+        if not cls.ENABLED:
+            return
+        cls.ENABLED = False
+        cls.ACTIVE = bool(cls._listeners)
+        cls._remove_hooks()
+
+    @classmethod
+    def add_listener(cls, listener: Any) -> None:
+        cls._listeners.append(listener)
+        cls.ACTIVE = True
+
+    @classmethod
+    def remove_listener(cls, listener: Any) -> None:
+        if listener in cls._listeners:
+            cls._listeners.remove(listener)
+        cls.ACTIVE = cls.ENABLED or bool(cls._listeners)
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._events = []
+        cls._phase_totals = {}
+        cls._functions = []
+        cls._counters = defaultdict(int)
+        cls._origin = time.perf_counter()
+
+    @classmethod
+    def phase(cls, name: str, **args: Any):
+        if not cls.ACTIVE:
+            return _NULL_CONTEXT
+        return _PhaseTimer(name, args)
+
+    @classmethod
+    def function(cls, name: str, phase: str = "parse_function"):
+        if not cls.ACTIVE:
+            return _NULL_CONTEXT
+        return _FunctionTimer(phase, {"function": name})
+
+    @classmethod
+    def count(cls, name: str, n: int = 1) -> None:
+        if cls.ENABLED:
+            cls._counters[name] += n
+
+    @classmethod
+    def _record(cls, name: str, start: float, wall: float, cpu: float, args: Dict[str, Any]) -> None:
+        cls._events.append({
+            "name": name,
+            "ph": "X",
+            "ts": (start - cls._origin) * 1e6,
+            "dur": wall * 1e6,
+            "pid": 1,
+            "tid": 1,
+            "args": {"cpu_ms": cpu * 1e3, **args},
+        })
+        totals = cls._phase_totals.setdefault(name, [0.0, 0.0, 0])
+        totals[0] += wall
+        totals[1] += cpu
+        totals[2] += 1
+
+    @classmethod
+    def _install_hooks(cls) -> None:
+        from clang.cindex import Cursor
+        from memory_managing.memory import MemoryManager
+
+        ensure_address = MemoryManager.ensure_address
+        get_children = Cursor.get_children
+        cls._originals = {"ensure_address": ensure_address, "get_children": get_children}
+
+        def counting_ensure_address(self, var_name):
+            cls._counters["ensure_address.calls"] += 1
+            if var_name not in self._map:
+                cls._counters["ensure_address.map_misses"] += 1
+            addr = ensure_address(self, var_name)
+            if addr is None:
+                cls._counters["ensure_address.unresolved"] += 1
+            return addr
+
+        def counting_get_children(self):
+            for child in get_children(self):
+                cls._counters["cursor.visited"] += 1
+                yield child
+
+        MemoryManager.ensure_address = counting_ensure_address
+        Cursor.get_children = counting_get_children
+
+    @classmethod
+    def _remove_hooks(cls) -> None:
+        from clang.cindex import Cursor
+        from memory_managing.memory import MemoryManager
+
+        if "ensure_address" in cls._originals:
+            MemoryManager.ensure_address = cls._originals["ensure_address"]
+        if "get_children" in cls._originals:
+            Cursor.get_children = cls._originals["get_children"]
+        cls._originals = {}
+
+    @classmethod
+    def write_trace(cls, path: str) -> None:
+        """
+        Write recorded phases in Chrome trace-event format (chrome://tracing, Perfetto).
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": cls._events, "displayTimeUnit": "ms"}, f)
+
+    @classmethod
+    def write_report(cls, path: str, top_n: int = 20) -> None:
+        """
+        Write phase totals and the `top_n` slowest functions, each sorted by wall time.
+        """
+        lines = ["Phases (sorted by wall time):", ""]
+        lines.append(f"  {'phase':<28}{'calls':>8}{'wall ms':>12}{'cpu ms':>12}")
+        for name, (wall, cpu, calls) in sorted(cls._phase_totals.items(), key=lambda item: -item[1][0]):
+            lines.append(f"  {name:<28}{calls:>8}{wall * 1e3:>12.2f}{cpu * 1e3:>12.2f}")
+
+        lines.extend(["", f"Top {top_n} functions by time:", ""])
+        lines.append(f"  {'function':<40}{'phase':<20}{'wall ms':>10}{'blocks':>9}{'cursors':>10}{'ensure':>9}{'misses':>9}")
+        for entry in sorted(cls._functions, key=lambda e: -e["wall_s"])[:top_n]:
+            lines.append(
+                f"  {str(entry['function']):<40}{entry['phase']:<20}{entry['wall_s'] * 1e3:>10.2f}{entry['blocks']:>9}"
+                f"{entry.get('cursor.visited', 0):>10}{entry.get('ensure_address.calls', 0):>9}"
+                f"{entry.get('ensure_address.map_misses', 0):>9}"
+            )
+
+        lines.extend(["", "Counters:", ""])
+        for name, value in sorted(cls._counters.items()):
+            lines.append(f"  {name:<36}{value:>12}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+__all__ = ["Profiler"]
@@ -0,0 +1,157 @@
+"""
+Local JSON-RPC 2.0 server over a Unix domain socket.
+
+Each request is one JSON object per line; each response is written back as one line.
+Supported methods:
+- summarize {"function": name}  -> list of function summaries (as in results_<fn>.json)
+- memory {"function": name}     -> list of memory blocks with read/write sets
+- invalidate {"paths": [...]}   -> re-parse changed files and drop stale results
+- update {"buffers": {path: text|null}} -> analyze unsaved contents (null restores the disk file)
+- shutdown                      -> stop the server
+Positional params (`[name]`, `[[paths...]]`) are accepted as well. Notifications
+(requests without an "id") are executed but get no response.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+from typing import Any, Optional
+
+from utils.session import AnalysisSession
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+ANALYSIS_ERROR = -32000
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.dispatch(line)
+            if response is None:
+                continue
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class AnalysisServer(socketserver.UnixStreamServer):
+    """
+    Serves one `AnalysisSession`. Requests are handled one at a time because the
+    analysis state (MemoryManager, FuncParser, StructsManager) is process-global.
+    """
+
+    def __init__(self, socket_path: str, session: AnalysisSession):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        self.socket_path = socket_path
+        self.session = session
+        super().__init__(socket_path, _RequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def dispatch(self, raw: bytes) -> Optional[dict]:
+        """
+        Handle one request line; returns the response, or None for a notification.
+        """
+        try:
+            request = json.loads(raw)
+        except ValueError as e:
+            return _error(None, PARSE_ERROR, f"Parse error: {e}")
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+        response = self._call(request)
+        return response if "id" in request else None
+
+    def _call(self, request: dict) -> dict:
+        req_id = request.get("id")
+        method = request["method"]
+        params = request.get("params", {})
+
+        try:
+            if method in ("summarize", "memory"):
+                name = _get_param(params, "function", 0)
+                if not isinstance(name, str):
+                    return _error(req_id, INVALID_PARAMS, "Expected a function name")
+                handler = self.session.summarize if method == "summarize" else self.session.memory
+                return _result(req_id, handler(name))
+            if method == "invalidate":
+                paths = _get_param(params, "paths", 0)
+                if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+                    return _error(req_id, INVALID_PARAMS, "Expected a list of paths")
+                return _result(req_id, self.session.invalidate(paths))
+            if method == "update":
+                buffers = _get_param(params, "buffers", 0)
+                if not isinstance(buffers, dict) or not all(
+                    isinstance(p, str) and (t is None or isinstance(t, str)) for p, t in buffers.items()
+                ):
+                    return _error(req_id, INVALID_PARAMS, "Expected a mapping of paths to contents")
+                return _result(req_id, self.session.update_buffers(buffers))
+            if method == "shutdown":
+                threading.Thread(target=self.shutdown, daemon=True).start()
+                return _result(req_id, True)
+        except ValueError as e:
+            return _error(req_id, ANALYSIS_ERROR, str(e))
+        except Exception as e:
+            # e.g. a libclang load error or OSError while re-parsing: answer instead of dropping the connection.
+            traceback.print_exc(file=sys.stderr)
+            return _error(req_id, ANALYSIS_ERROR, f"{type(e).__name__}: {e}")
+        return _error(req_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+
+
+def _get_param(params: Any, name: str, position: int) -> Any:
+    if isinstance(params, dict):
+        return params.get(name)
+    if isinstance(params, list) and len(params) > position:
+        return params[position]
+    return None
+
+
+def _result(req_id: Any, result: Any) -> dict:
+    return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+
+def _error(req_id: Any, code: int, message: str) -> dict:
+    return {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": message}}
+
+
+def serve(project_path: str, socket_path: str) -> None:
+    session = AnalysisSession(project_path)
+    with AnalysisServer(socket_path, session) as server:
+        print(f"Serving '{session.parser.project_path}' on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def request(socket_path: str, method: str, params: Any = None, req_id: int = 1) -> Any:
+    """
+    Send one request to a running server and return its result.
+    Raises RuntimeError if the server answered with an error.
+    """
+    payload = {"jsonrpc": "2.0", "id": req_id, "method": method, "params": params or {}}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            response = json.loads(f.readline())
+    if "error" in response:
+        raise RuntimeError(response["error"]["message"])
+    return response["result"]
+
+
+__all__ = ["AnalysisServer", "serve", "request"]
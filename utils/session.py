@@ -0,0 +1,203 @@
+"""
+Warm analysis session: the project is parsed once and per-entry results are cached.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Dict, Iterable, List, Optional, Set
+
+from parsing.parser import Parser
+from parsing.summarizer import iter_summaries, reachable_function_names, summary_to_dict
+from memory_managing.memory import MemoryManager
+from models.summarize import FunctionSummarize
+from models.symbol_table import SymbolTable
+from utils.callgraph import reverse_topo_from_root
+
+
+class AnalysisSession:
+    """
+    Keeps the parsed translation units of one project alive and caches the
+    summaries and memory reports of every analyzed entry function.
+
+    `invalidate` re-parses only the affected translation units and drops only
+    the cached entries whose reachable functions changed. A change to anything
+    other than function bodies (globals, types, macros) drops every entry.
+    """
+
+    def __init__(self, project_path: str, **parser_options):
+        self.parser = Parser(project_path, **parser_options)
+        self.parser.load()
+        self._current_entry: Optional[str] = None
+        self._summaries: Dict[str, List[FunctionSummarize]] = {}
+        self._memory: Dict[str, List[dict]] = {}
+        self._reachable: Dict[str, Set[str]] = {}
+        self._function_fps: Dict[str, tuple[str, str]] = {}  # function name -> (file path, body hash)
+        self._decl_fps: Dict[str, str] = {}  # file path -> hash of everything outside function bodies
+        self._update_fingerprints(None)
+
+    def _analyze(self, entry: str) -> None:
+        if self._current_entry == entry:
+            return
+        if entry not in self.parser.symbols:
+            raise ValueError(f"Function '{entry}' not found")
+        self.parser.analyze(entry_function=entry)
+        self._current_entry = entry
+        self._reachable[entry] = set(reverse_topo_from_root(self.parser.call_graph(), entry))
+
+    def summary_objects(self, entry: str) -> List[FunctionSummarize]:
+        """
+        Summaries of every function reachable from `entry`, callers first.
+        """
+        cached = self._summaries.get(entry)
+        if cached is not None:
+            return cached
+        self._analyze(entry)
+        func_names = reachable_function_names(self.parser, entry)
+        result = list(iter_summaries(self.parser, func_names))
+        self._summaries[entry] = result
+        return result
+
+    def project_summaries(self, names: Optional[Iterable[str]] = None) -> Dict[str, FunctionSummarize]:
+        """
+        Analyze the whole project once, without an entry, and summarize `names`
+        (every source function by default). The result is not cached.
+        """
+        self.parser.analyze()
+        self._current_entry = None  # the memory no longer reflects a single entry
+        names = self.source_function_names() if names is None else [n for n in names if n in self.parser.symbols]
+        return {s.function_name: s for s in iter_summaries(self.parser, names)}
+
+    def summarize(self, entry: str) -> List[dict]:
+        """
+        Summaries of every function reachable from `entry`, as written to `results_<entry>.json`.
+        """
+        return [summary_to_dict(s) for s in self.summary_objects(entry)]
+
+    def source_function_names(self) -> List[str]:
+        """
+        Names of the functions defined in the project's sources, in collection order.
+        """
+        symbols = self.parser.symbols
+        names = dict.fromkeys(f.name for f in self.parser.functions if symbols.kind(f.name) == SymbolTable.SOURCE)
+        return list(names)
+
+    def memory(self, entry: str) -> List[dict]:
+        """
+        Visible memory blocks after analyzing `entry`, with their read/write function sets.
+        """
+        cached = self._memory.get(entry)
+        if cached is not None:
+            return cached
+        self._analyze(entry)
+        structs = self.parser.structs
+        result = []
+        for block in MemoryManager.instance().iter_blocks():
+            var = block.var
+            if var is None or getattr(var, "hidden", False):
+                continue
+            result.append({
+                "addr": block.addr,
+                "name": var.name,
+                "type": var.raw_type,
+                "parent": block.parent,
+                "size": structs.get_size(var.raw_type),
+                "read": sorted(var.read),
+                "write": sorted(var.write),
+            })
+        self._memory[entry] = result
+        return result
+
+    def invalidate(self, paths: List[str]) -> dict:
+        """
+        Re-parse the translation units affected by `paths` and drop stale cached entries.
+        """
+        changed_files = {os.path.abspath(p) for p in paths}
+        old_function_fps = dict(self._function_fps)
+        old_decl_fps = dict(self._decl_fps)
+        reparsed = self.parser.reparse(list(changed_files))
+        if not reparsed:
+            return {"reparsed": [], "changed_functions": [], "declarations_changed": False, "invalidated": []}
+        self._current_entry = None
+        self._update_fingerprints(changed_files)
+
+        changed_functions: Set[str] = set()
+        for name in set(old_function_fps) | set(self._function_fps):
+            old = old_function_fps.get(name)
+            new = self._function_fps.get(name)
+            if old == new:
+                continue
+            if (old and old[0] in changed_files) or (new and new[0] in changed_files):
+                changed_functions.add(name)
+        decls_changed = any(old_decl_fps.get(f) != self._decl_fps.get(f) for f in changed_files)
+
+        if decls_changed:
+            invalidated = set(self._summaries) | set(self._memory)
+        else:
+            invalidated = {
+                entry for entry, reachable in self._reachable.items()
+                if reachable & changed_functions
+            }
+        for entry in invalidated:
+            self._summaries.pop(entry, None)
+            self._memory.pop(entry, None)
+            self._reachable.pop(entry, None)
+        return {
+            "reparsed": sorted(reparsed),
+            "changed_functions": sorted(changed_functions),
+            "declarations_changed": decls_changed,
+            "invalidated": sorted(invalidated),
+        }
+
+    def update_buffers(self, buffers: Dict[str, Optional[str]]) -> dict:
+        """
+        Analyze unsaved editor buffers: `buffers` maps paths to in-memory contents
+        (None drops the override). Only the affected translation units are re-parsed
+        and only stale entries dropped, as with `invalidate`.
+        """
+        self.parser.set_unsaved(buffers)
+        return self.invalidate(list(buffers))
+
+    def _update_fingerprints(self, files: Set[str] | None) -> None:
+        """
+        Hash function bodies and the remaining declarations per file.
+        Only `files` are refreshed when given, otherwise every project file.
+        """
+        extents: Dict[str, List[tuple[str, int, int]]] = {}
+        for node, func in self.parser._function_nodes:
+            if node is None:
+                continue
+            start = node.extent.start
+            if start.file is None:
+                continue
+            file_path = os.path.abspath(start.file.name)
+            if files is not None and file_path not in files:
+                continue
+            extents.setdefault(file_path, []).append((func.name, start.offset, node.extent.end.offset))
+
+        if files is None:
+            self._function_fps = {}
+            self._decl_fps = {}
+            files = set(self.parser._translation_units)
+        else:
+            self._function_fps = {
+                name: fp for name, fp in self._function_fps.items() if fp[0] not in files
+            }
+
+        for file_path in files:
+            content = self.parser.read_source(file_path)
+            if content is None:
+                self._decl_fps.pop(file_path, None)
+                continue
+            decl_hash = hashlib.sha1()
+            last = 0
+            for name, begin, end in sorted(extents.get(file_path, []), key=lambda e: e[1]):
+                self._function_fps[name] = (file_path, hashlib.sha1(content[begin:end]).hexdigest())
+                decl_hash.update(content[last:begin])
+                last = max(last, end)
+            decl_hash.update(content[last:])
+            self._decl_fps[file_path] = decl_hash.hexdigest()
+
+
+__all__ = ["AnalysisSession"]
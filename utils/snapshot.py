@@ -0,0 +1,252 @@
+"""
+Binary snapshot of an analyzed run: memory blocks with their read/write sets and
+the interface summaries, in flat little-endian arrays plus one string table.
+
+The file is opened with `mmap` and read lazily: only the records a query touches
+are decoded, and worker processes opening the same file share its pages.
+
+Layout (all integers little-endian):
+    header    magic, version, entry string id, then (offset, count) per section
+    strings   count + 1 uint32 offsets into the UTF-8 blob, then the blob
+    blocks    fixed-size block records in address order
+    refs      uint32 string ids of the functions in the blocks' read/write sets
+    names     uint32 block indexes sorted by block name (binary search)
+    summaries fixed-size summary records
+    vars      (name id, type id) uint32 pairs of the summaries' categories
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from fnmatch import fnmatchcase
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from models.summarize import BriefVariable, FunctionSummarize
+from models.variables import VARIABLE_DOMAIN
+from utils.memdump import MemoryFilter
+
+MAGIC = b"IPSNAP01"
+VERSION = 1
+CATEGORIES = ("parameters", "state", "input", "output", "inout")
+SECTIONS = ("string_offsets", "string_blob", "blocks", "refs", "names", "summaries", "vars")
+
+_HEADER = struct.Struct("<8sII" + "II" * len(SECTIONS))
+_U32 = struct.Struct("<I")
+# addr, parent, name, type, size, domain, flags, read offset/count, write offset/count
+_BLOCK = struct.Struct("<IIIIqIIIIII")
+# function name, then (offset, count) into vars per category
+_SUMMARY = struct.Struct("<I" + "II" * len(CATEGORIES))
+
+_HIDDEN = 1
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.items: List[str] = []
+
+    def id(self, text: str) -> int:
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.items)
+            self.items.append(text)
+        return string_id
+
+
+def write_snapshot(path: str, mem, structs, summaries: Iterable[FunctionSummarize], entry: str = "") -> None:
+    """
+    Write the current abstract memory and `summaries` to `path` (replaced atomically).
+    """
+    strings = _StringTable()
+    entry_id = strings.id(entry)
+    blocks = bytearray()
+    refs: List[int] = []
+    block_names: List[tuple[str, int]] = []
+    root_domain: Dict[int, VARIABLE_DOMAIN] = {}
+    mem_blocks = mem._blocks
+    for addr in range(1, len(mem_blocks)):
+        block = mem_blocks[addr]
+        if block is None:
+            continue
+        var = block.var
+        # Children are always allocated after their parent.
+        domain = var.domain if block.parent == 0 else root_domain.get(block.parent, var.domain)
+        root_domain[addr] = domain
+        read = sorted(var.read)
+        write = sorted(var.write)
+        read_offset = len(refs)
+        refs.extend(strings.id(name) for name in read)
+        write_offset = len(refs)
+        refs.extend(strings.id(name) for name in write)
+        block_names.append((var.name, len(block_names)))
+        blocks += _BLOCK.pack(
+            addr, block.parent, strings.id(var.name), strings.id(var.raw_type),
+            structs.get_size(var.raw_type), strings.id(domain.value),
+            _HIDDEN if getattr(var, "hidden", False) else 0,
+            read_offset, len(read), write_offset, len(write),
+        )
+    names = [index for _, index in sorted(block_names)]
+
+    summary_records = bytearray()
+    var_pairs: List[int] = []
+    summary_count = 0
+    for summary in summaries:
+        fields = [strings.id(summary.function_name)]
+        for category in CATEGORIES:
+            items = getattr(summary.interface_semantics, category)
+            fields += [len(var_pairs) // 2, len(items)]
+            for item in items:
+                var_pairs += [strings.id(item.name), strings.id(item.type)]
+        summary_records += _SUMMARY.pack(*fields)
+        summary_count += 1
+
+    encoded = [text.encode("utf-8") for text in strings.items]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    sections = [
+        (struct.pack(f"<{len(offsets)}I", *offsets), len(offsets)),
+        (b"".join(encoded), offsets[-1]),
+        (bytes(blocks), len(block_names)),
+        (struct.pack(f"<{len(refs)}I", *refs), len(refs)),
+        (struct.pack(f"<{len(names)}I", *names), len(names)),
+        (bytes(summary_records), summary_count),
+        (struct.pack(f"<{len(var_pairs)}I", *var_pairs), len(var_pairs) // 2),
+    ]
+    layout: List[int] = []
+    offset = _HEADER.size
+    for data, count in sections:
+        offset += -offset % 8  # keep every section 8-byte aligned
+        layout += [offset, count]
+        offset += len(data)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, entry_id, *layout))
+        for (data, _), section_offset in zip(sections, layout[::2]):
+            f.write(b"\0" * (section_offset - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+class MemorySnapshot:
+    """
+    Read-only, lazily decoded view of a snapshot file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        fields = _HEADER.unpack_from(self._buf, 0)
+        magic, version = fields[0], fields[1]
+        if magic != MAGIC or version != VERSION:
+            self._buf.close()
+            raise ValueError(f"{path} is not a version {VERSION} memory snapshot")
+        layout = fields[3:]
+        self._sections = {name: (layout[2 * i], layout[2 * i + 1]) for i, name in enumerate(SECTIONS)}
+        self._strings: Dict[int, str] = {}
+        self.entry = self.string(fields[2])
+
+    def close(self) -> None:
+        self._buf.close()
+
+    def __enter__(self) -> "MemorySnapshot":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.close()
+        return False
+
+    def string(self, string_id: int) -> str:
+        text = self._strings.get(string_id)
+        if text is None:
+            offsets, _ = self._sections["string_offsets"]
+            blob, _ = self._sections["string_blob"]
+            start, end = struct.unpack_from("<II", self._buf, offsets + 4 * string_id)
+            text = self._strings[string_id] = self._buf[blob + start:blob + end].decode("utf-8")
+        return text
+
+    def _u32(self, section: str, index: int) -> int:
+        return _U32.unpack_from(self._buf, self._sections[section][0] + 4 * index)[0]
+
+    def _names(self, offset: int, count: int) -> List[str]:
+        return [self.string(self._u32("refs", offset + i)) for i in range(count)]
+
+    def __len__(self) -> int:
+        return self._sections["blocks"][1]
+
+    def _record(self, index: int) -> tuple:
+        return _BLOCK.unpack_from(self._buf, self._sections["blocks"][0] + _BLOCK.size * index)
+
+    def block(self, index: int) -> Dict[str, Any]:
+        """
+        The index-th block as a row in the `iter_memory_rows` format.
+        """
+        addr, parent, name, type_id, size, domain, _, read_offset, read_count, write_offset, write_count = self._record(index)
+        return {
+            "addr": addr,
+            "name": self.string(name),
+            "type": self.string(type_id),
+            "parent": parent,
+            "size": size,
+            "domain": self.string(domain),
+            "read": self._names(read_offset, read_count),
+            "write": self._names(write_offset, write_count),
+        }
+
+    def find(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        The block named `name`, by binary search over the name index.
+        """
+        lo, hi = 0, self._sections["names"][1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            index = self._u32("names", mid)
+            if self.string(self._record(index)[2]) < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._sections["names"][1]:
+            index = self._u32("names", lo)
+            if self.string(self._record(index)[2]) == name:
+                return self.block(index)
+        return None
+
+    def iter_rows(self, memory_filter: MemoryFilter | None = None) -> Iterator[Dict[str, Any]]:
+        """
+        Visible blocks in address order, like `iter_memory_rows` on the live memory.
+        """
+        memory_filter = memory_filter or MemoryFilter()
+        for index in range(len(self)):
+            record = self._record(index)
+            if record[6] & _HIDDEN:
+                continue
+            if memory_filter.globals_only and self.string(record[5]) != VARIABLE_DOMAIN.GLOBAL.value:
+                continue
+            if memory_filter.name_glob is not None and not fnmatchcase(self.string(record[2]), memory_filter.name_glob):
+                continue
+            row = self.block(index)
+            if memory_filter.touched_by is not None and memory_filter.touched_by not in row["read"] and memory_filter.touched_by not in row["write"]:
+                continue
+            yield row
+
+    def summaries(self) -> Iterator[FunctionSummarize]:
+        offset, count = self._sections["summaries"]
+        pairs, _ = self._sections["vars"]
+        for i in range(count):
+            fields = _SUMMARY.unpack_from(self._buf, offset + _SUMMARY.size * i)
+            summary = FunctionSummarize(self.string(fields[0]))
+            summary.entry = self.entry
+            for c, category in enumerate(CATEGORIES):
+                start, n = fields[1 + 2 * c], fields[2 + 2 * c]
+                items = getattr(summary.interface_semantics, category)
+                for j in range(start, start + n):
+                    name_id, type_id = struct.unpack_from("<II", self._buf, pairs + 8 * j)
+                    items.append(BriefVariable(name=self.string(name_id), type=self.string(type_id)))
+            yield summary
+
+
+__all__ = ["MemorySnapshot", "write_snapshot"]
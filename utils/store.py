@@ -0,0 +1,188 @@
+"""
+SQLite results store.
+
+One `run` is recorded per analyzed entry function. Re-running the same entry
+against the same project replaces the previous run, so the database always
+holds the latest results for every entry.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from typing import Iterable, List, Optional, Tuple
+
+CATEGORIES = ("parameters", "state", "input", "output", "inout")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    entry TEXT NOT NULL,
+    project_path TEXT NOT NULL,
+    UNIQUE (entry, project_path)
+);
+CREATE TABLE IF NOT EXISTS functions (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    source_file TEXT,
+    PRIMARY KEY (run_id, name)
+);
+CREATE TABLE IF NOT EXISTS interface (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    function TEXT NOT NULL,
+    variable TEXT NOT NULL,
+    type TEXT,
+    category TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    addr INTEGER NOT NULL,
+    parent INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    raw_type TEXT,
+    domain TEXT,
+    PRIMARY KEY (run_id, addr)
+);
+CREATE TABLE IF NOT EXISTS block_access (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    addr INTEGER NOT NULL,
+    function TEXT NOT NULL,
+    mode TEXT NOT NULL CHECK (mode IN ('R', 'W'))
+);
+CREATE INDEX IF NOT EXISTS idx_interface_variable ON interface(variable, category);
+CREATE INDEX IF NOT EXISTS idx_interface_function ON interface(function, run_id);
+CREATE INDEX IF NOT EXISTS idx_blocks_name ON blocks(name);
+CREATE INDEX IF NOT EXISTS idx_access_block ON block_access(run_id, addr);
+CREATE INDEX IF NOT EXISTS idx_access_function ON block_access(function, mode);
+"""
+
+
+class ResultsStore:
+    """
+    Writes summaries and raw memory block accesses into an indexed SQLite database.
+
+    Rows are buffered and inserted with `executemany`; everything belonging to
+    one run is committed in a single transaction by `close()`.
+    """
+
+    BATCH_SIZE = 5000
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._run_id: Optional[int] = None
+        self._interface_rows: List[Tuple] = []
+
+    def begin_run(self, entry: str, project_path: str) -> int:
+        project_path = os.path.abspath(project_path)
+        self._conn.execute("DELETE FROM runs WHERE entry = ? AND project_path = ?", (entry, project_path))
+        cur = self._conn.execute("INSERT INTO runs (entry, project_path) VALUES (?, ?)", (entry, project_path))
+        self._run_id = cur.lastrowid
+        return self._run_id
+
+    def add_functions(self, functions: Iterable) -> None:
+        rows = [(self._run_id, f.name, f.source_file) for f in functions]
+        self._conn.executemany("INSERT OR REPLACE INTO functions VALUES (?, ?, ?)", rows)
+
+    def add_summary(self, summary) -> None:
+        semantics = summary.interface_semantics
+        for category in CATEGORIES:
+            for var in getattr(semantics, category):
+                self._interface_rows.append((self._run_id, summary.function_name, var.name, var.type, category))
+        if len(self._interface_rows) >= self.BATCH_SIZE:
+            self._flush_interface()
+
+    def add_blocks(self, blocks: Iterable) -> None:
+        """
+        Record every visible memory block with its raw read/write function sets.
+        """
+        block_rows: List[Tuple] = []
+        access_rows: List[Tuple] = []
+        for block in blocks:
+            var = block.var
+            if var is None or getattr(var, "hidden", False):
+                continue
+            block_rows.append((self._run_id, block.addr, block.parent, var.name, var.raw_type, var.domain.value))
+            for func in var.read:
+                access_rows.append((self._run_id, block.addr, func, "R"))
+            for func in var.write:
+                access_rows.append((self._run_id, block.addr, func, "W"))
+            if len(access_rows) >= self.BATCH_SIZE:
+                self._insert_blocks(block_rows, access_rows)
+                block_rows, access_rows = [], []
+        self._insert_blocks(block_rows, access_rows)
+
+    def _insert_blocks(self, block_rows: List[Tuple], access_rows: List[Tuple]) -> None:
+        self._conn.executemany("INSERT INTO blocks VALUES (?, ?, ?, ?, ?, ?)", block_rows)
+        self._conn.executemany("INSERT INTO block_access VALUES (?, ?, ?, ?)", access_rows)
+
+    def _flush_interface(self) -> None:
+        self._conn.executemany("INSERT INTO interface VALUES (?, ?, ?, ?, ?)", self._interface_rows)
+        self._interface_rows = []
+
+    def close(self) -> None:
+        self._flush_interface()
+        self._conn.commit()
+        self._conn.close()
+
+
+# Common lookups for the `query` subcommand: name -> (argument count, SQL, column headers)
+QUERIES = {
+    # Entry functions whose analysis (including callees) writes the given variable.
+    "writers": (1, """
+        SELECT DISTINCT r.entry FROM runs r
+        JOIN blocks b ON b.run_id = r.id AND b.name = ?
+        JOIN block_access a ON a.run_id = b.run_id AND a.addr = b.addr AND a.function = r.entry AND a.mode = 'W'
+        ORDER BY r.entry
+    """, ("entry",)),
+    # Entry functions whose analysis reads the given variable.
+    "readers": (1, """
+        SELECT DISTINCT r.entry FROM runs r
+        JOIN blocks b ON b.run_id = r.id AND b.name = ?
+        JOIN block_access a ON a.run_id = b.run_id AND a.addr = b.addr AND a.function = r.entry AND a.mode = 'R'
+        ORDER BY r.entry
+    """, ("entry",)),
+    # Variables classified as `state` for more than one entry function.
+    "shared-state": (0, """
+        SELECT i.variable, COUNT(DISTINCT r.entry) AS n, GROUP_CONCAT(DISTINCT r.entry) FROM interface i
+        JOIN runs r ON r.id = i.run_id AND i.function = r.entry
+        WHERE i.category = 'state'
+        GROUP BY i.variable HAVING n > 1
+        ORDER BY n DESC, i.variable
+    """, ("variable", "entries", "entry_list")),
+    # Interface of one function, taken from the most recent run that summarized it.
+    "function": (1, """
+        SELECT i.category, i.variable, i.type FROM interface i
+        WHERE i.function = ? AND i.run_id = (SELECT MAX(run_id) FROM interface WHERE function = i.function)
+        ORDER BY i.category, i.variable
+    """, ("category", "variable", "type")),
+    # Every function/category a variable appears in.
+    "variable": (1, """
+        SELECT DISTINCT i.function, i.category FROM interface i
+        WHERE i.variable = ?
+        ORDER BY i.function, i.category
+    """, ("function", "category")),
+}
+
+
+def run_query(db_path: str, name: str, args: List[str]) -> Tuple[Tuple[str, ...], List[Tuple]]:
+    if name not in QUERIES:
+        raise ValueError(f"Unknown query '{name}', expected one of: {', '.join(QUERIES)}")
+    argc, sql, headers = QUERIES[name]
+    if len(args) != argc:
+        raise ValueError(f"Query '{name}' expects {argc} argument(s), got {len(args)}")
+    if not os.path.isfile(db_path):
+        raise FileNotFoundError(db_path)
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(sql, args).fetchall()
+    finally:
+        conn.close()
+    return headers, rows
+
+
+__all__ = ["CATEGORIES", "QUERIES", "ResultsStore", "run_query"]
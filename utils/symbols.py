@@ -0,0 +1,418 @@
+"""
+Lightweight textual symbol prepass.
+
+Scans C sources with a small lexer (no preprocessing, no libclang) and records
+which files define which functions and globals, and which identifiers each
+function body, global initializer and macro body mentions. The index is an
+over-approximation used to decide which translation units an entry-mode run
+actually needs.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+_TOKEN_RE = re.compile(r"[A-Za-z_]\w*|\d[\w.]*|->|\S")
+_IDENT_RE = re.compile(r"[A-Za-z_]\w*")
+_DEFINE_RE = re.compile(r"#\s*define\s+([A-Za-z_]\w*)(\([^)]*\))?(.*)", re.S)
+
+C_KEYWORDS = frozenset({
+    "auto", "break", "case", "char", "const", "continue", "default", "do", "double",
+    "else", "enum", "extern", "float", "for", "goto", "if", "inline", "int", "long",
+    "register", "restrict", "return", "short", "signed", "sizeof", "static", "struct",
+    "switch", "typedef", "union", "unsigned", "void", "volatile", "while", "_Bool",
+    "__attribute__", "__declspec", "__inline", "__inline__", "__restrict", "__volatile__",
+    "__asm__", "asm",
+})
+
+_ATTRIBUTE_WORDS = frozenset({"__attribute__", "__declspec", "__asm__", "asm"})
+
+
+def _strip_source(text: str) -> tuple[str, List[str]]:
+    """
+    Remove comments and literal contents; return (code, preprocessor directives).
+    Directives are removed from the code and returned with continuations joined.
+    """
+    out: List[str] = []
+    directives: List[str] = []
+    i = 0
+    n = len(text)
+    at_line_start = True
+    while i < n:
+        c = text[i]
+        if c == "/" and i + 1 < n and text[i + 1] == "*":
+            end = text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            out.append(" ")
+            continue
+        if c == "/" and i + 1 < n and text[i + 1] == "/":
+            end = text.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if c in "\"'":
+            j = i + 1
+            while j < n and text[j] != c and text[j] != "\n":
+                j += 2 if text[j] == "\\" else 1
+            out.append(c + c)
+            i = j + 1
+            continue
+        if c == "#" and at_line_start:
+            # Collect the directive up to an unescaped newline, dropping comments.
+            chunk: List[str] = []
+            j = i
+            while j < n:
+                if text[j] == "\\" and j + 1 < n and text[j + 1] == "\n":
+                    j += 2
+                    chunk.append(" ")
+                    continue
+                if text[j] == "\n":
+                    break
+                if text.startswith("/*", j):
+                    end = text.find("*/", j + 2)
+                    j = n if end < 0 else end + 2
+                    chunk.append(" ")
+                    continue
+                if text.startswith("//", j):
+                    while j < n and text[j] != "\n":
+                        j += 1
+                    break
+                chunk.append(text[j])
+                j += 1
+            directives.append("".join(chunk))
+            i = j
+            continue
+        if c == "\n":
+            at_line_start = True
+        elif not c.isspace():
+            at_line_start = False
+        out.append(c)
+        i += 1
+    return "".join(out), directives
+
+
+@dataclass
+class SymbolPlan:
+    """
+    What an entry-mode run needs: source files to parse and globals to allocate.
+    """
+    files: Set[str]
+    functions: Set[str]
+    globals: Set[str]
+    body_files: Set[str] = field(default_factory=set)  # files defining a reachable function
+
+
+@dataclass
+class SymbolIndex:
+    function_files: Dict[str, Set[str]] = field(default_factory=dict)  # function -> defining files
+    function_refs: Dict[str, Set[str]] = field(default_factory=dict)   # function -> identifiers in its body
+    global_files: Dict[str, Set[str]] = field(default_factory=dict)    # global -> defining (non-extern) files
+    global_decls: Set[str] = field(default_factory=set)                # every global name declared anywhere
+    global_refs: Dict[str, Set[str]] = field(default_factory=dict)     # global -> identifiers in its initializer
+    macro_refs: Dict[str, Set[str]] = field(default_factory=dict)      # macro -> identifiers in its body
+    file_symbols: Dict[str, Set[str]] = field(default_factory=dict)    # file -> file-scope names it defines (tags as "tag <name>")
+    file_macros: Dict[str, Set[str]] = field(default_factory=dict)     # file -> macros it #defines
+
+    @classmethod
+    def build(cls, files: Iterable[str], overrides: Optional[Dict[str, str]] = None) -> "SymbolIndex":
+        """
+        Index `files`; contents in `overrides` (path -> text) are used instead of the disk copy.
+        """
+        index = cls()
+        for path in files:
+            text = overrides.get(path) if overrides else None
+            if text is None:
+                try:
+                    with open(path, "r", encoding="utf-8", errors="replace") as f:
+                        text = f.read()
+                except OSError:
+                    continue
+            index.add_source(path, text)
+        return index
+
+    def add_source(self, path: str, text: str) -> None:
+        code, directives = _strip_source(text)
+        for directive in directives:
+            m = _DEFINE_RE.match(directive.strip())
+            if m:
+                params = set(_IDENT_RE.findall(m.group(2) or ""))
+                refs = set(_IDENT_RE.findall(m.group(3))) - params - C_KEYWORDS
+                self.macro_refs.setdefault(m.group(1), set()).update(refs)
+                self.file_symbols.setdefault(path, set()).add(m.group(1))
+                self.file_macros.setdefault(path, set()).add(m.group(1))
+        self._scan_top_level(path, _TOKEN_RE.findall(code))
+
+    def _scan_top_level(self, path: str, tokens: List[str]) -> None:
+        stmt: List[str] = []
+        i = 0
+        n = len(tokens)
+        while i < n:
+            tok = tokens[i]
+            if tok == "{":
+                name = self._function_name(stmt)
+                close = self._match_brace(tokens, i)
+                if name is not None:
+                    body = {t for t in tokens[i + 1:close] if _IDENT_RE.fullmatch(t)} - C_KEYWORDS
+                    self.function_files.setdefault(name, set()).add(path)
+                    self.file_symbols.setdefault(path, set()).add(name)
+                    self.function_refs.setdefault(name, set()).update(body)
+                    stmt = []
+                else:
+                    # Type definition or braced initializer: keep it in the statement.
+                    stmt.extend(tokens[i:close + 1])
+                i = close + 1
+                continue
+            if tok == ";":
+                self._declaration(path, stmt)
+                stmt = []
+            else:
+                stmt.append(tok)
+            i += 1
+
+    @staticmethod
+    def _match_brace(tokens: List[str], start: int) -> int:
+        depth = 0
+        for j in range(start, len(tokens)):
+            if tokens[j] == "{":
+                depth += 1
+            elif tokens[j] == "}":
+                depth -= 1
+                if depth == 0:
+                    return j
+        return len(tokens) - 1
+
+    @staticmethod
+    def _function_name(stmt: List[str]) -> Optional[str]:
+        """
+        Name of the function whose definition starts with `stmt`, or None if `stmt`
+        does not end with a parameter list (struct bodies, initializers).
+        """
+        if "=" in stmt or not stmt:
+            return None
+        j = len(stmt) - 1
+        # Skip trailing attribute groups: ... ) __attribute__((x)) {
+        while j >= 0:
+            if stmt[j] != ")":
+                return None
+            depth = 0
+            k = j
+            while k >= 0:
+                if stmt[k] == ")":
+                    depth += 1
+                elif stmt[k] == "(":
+                    depth -= 1
+                    if depth == 0:
+                        break
+                k -= 1
+            if k <= 0:
+                return None
+            before = stmt[k - 1]
+            if before in _ATTRIBUTE_WORDS:
+                j = k - 2
+                continue
+            if _IDENT_RE.fullmatch(before) and before not in C_KEYWORDS:
+                return before
+            return None
+        return None
+
+    @staticmethod
+    def _type_names(stmt: List[str]) -> Set[str]:
+        """
+        Struct/union/enum tags defined in `stmt` (as "tag <name>", their own namespace)
+        and the enumerators of its enum bodies.
+        """
+        names: Set[str] = set()
+        n = len(stmt)
+        for k, tok in enumerate(stmt):
+            if tok not in ("struct", "union", "enum"):
+                continue
+            j = k + 1
+            if j < n and _IDENT_RE.fullmatch(stmt[j]) and stmt[j] not in C_KEYWORDS:
+                if j + 1 < n and stmt[j + 1] == "{":
+                    names.add(f"tag {stmt[j]}")
+                j += 1
+            if tok != "enum" or j >= n or stmt[j] != "{":
+                continue
+            # Enumerators: the first identifier of each top-level item of the body.
+            depth = 0
+            expect_name = False
+            for t in stmt[j:]:
+                if t in ("(", "[", "{"):
+                    depth += 1
+                    expect_name = depth == 1
+                    continue
+                if t in (")", "]", "}"):
+                    depth -= 1
+                    if depth == 0:
+                        break
+                    continue
+                if depth == 1 and t == ",":
+                    expect_name = True
+                    continue
+                if expect_name and _IDENT_RE.fullmatch(t):
+                    names.add(t)
+                expect_name = False
+        return names
+
+    def _declaration(self, path: str, stmt: List[str]) -> None:
+        if not stmt:
+            return
+        defined = self._type_names(stmt)
+        is_typedef = stmt[0] == "typedef"
+        is_extern = "extern" in stmt
+        # Drop type bodies (struct S { ... } g;) but keep braced initializers.
+        tokens: List[str] = []
+        skip_depth = 0
+        for tok in stmt:
+            if skip_depth:
+                if tok == "{":
+                    skip_depth += 1
+                elif tok == "}":
+                    skip_depth -= 1
+                continue
+            if tok == "{" and "=" not in tokens:
+                skip_depth = 1
+                continue
+            tokens.append(tok)
+        # Split into declarators on top-level commas.
+        declarators: List[List[str]] = [[]]
+        paren = 0
+        for tok in tokens:
+            if tok in ("(", "[", "{"):
+                paren += 1
+            elif tok in (")", "]", "}"):
+                paren -= 1
+            if tok == "," and paren == 0:
+                declarators.append([])
+                continue
+            declarators[-1].append(tok)
+        for decl in declarators:
+            head = decl[: decl.index("=")] if "=" in decl else decl
+            init = decl[decl.index("=") + 1:] if "=" in decl else []
+            name = self._declarator_name(head)
+            if name is None:
+                continue
+            if is_typedef:
+                defined.add(name)
+                continue
+            self.global_decls.add(name)
+            if not is_extern:
+                self.global_files.setdefault(name, set()).add(path)
+                self.file_symbols.setdefault(path, set()).add(name)
+            refs = {t for t in init if _IDENT_RE.fullmatch(t)} - C_KEYWORDS
+            if refs:
+                self.global_refs.setdefault(name, set()).update(refs)
+        if defined:
+            self.file_symbols.setdefault(path, set()).update(defined)
+
+    @staticmethod
+    def _declarator_name(head: List[str]) -> Optional[str]:
+        # Function pointer variable: T (*name)(args)
+        for k in range(len(head) - 2):
+            if head[k] == "(" and head[k + 1] == "*" and _IDENT_RE.fullmatch(head[k + 2]):
+                return head[k + 2]
+        if "(" in head:
+            return None  # function prototype
+        # Strip array dimensions, take the last identifier.
+        depth = 0
+        last = None
+        for tok in head:
+            if tok == "[":
+                depth += 1
+            elif tok == "]":
+                depth -= 1
+            elif depth == 0 and _IDENT_RE.fullmatch(tok) and tok not in C_KEYWORDS:
+                last = tok
+        return last
+
+    def expand_macros(self, identifiers: Iterable[str]) -> Set[str]:
+        result: Set[str] = set()
+        stack = list(identifiers)
+        while stack:
+            ident = stack.pop()
+            if ident in result:
+                continue
+            result.add(ident)
+            stack.extend(self.macro_refs.get(ident, ()))
+        return result
+
+    def plan(self, entry: str) -> Optional[SymbolPlan]:
+        """
+        Files and globals needed to analyze `entry`; None if `entry` is not indexed.
+        """
+        if entry not in self.function_files:
+            return None
+        functions: Set[str] = set()
+        referenced: Set[str] = set()
+        stack = [entry]
+        while stack:
+            name = stack.pop()
+            if name in functions:
+                continue
+            functions.add(name)
+            refs = self.expand_macros(self.function_refs.get(name, ()))
+            referenced.update(refs)
+            stack.extend(r for r in refs if r in self.function_files and r not in functions)
+
+        globals_needed = {name for name in referenced if name in self.global_decls}
+        # Pull in what referenced globals' initializers point to, and globals whose
+        # initializers point into referenced ones (their back-references are marked too).
+        changed = True
+        while changed:
+            changed = False
+            for name, refs in self.global_refs.items():
+                refs = self.expand_macros(refs)
+                if name in globals_needed:
+                    extra = {r for r in refs if r in self.global_decls} - globals_needed
+                    if extra:
+                        globals_needed |= extra
+                        changed = True
+                elif refs & globals_needed:
+                    globals_needed.add(name)
+                    changed = True
+
+        body_files: Set[str] = set()
+        for name in functions:
+            body_files |= self.function_files.get(name, set())
+        files = set(body_files)
+        for name in globals_needed:
+            files |= self.global_files.get(name, set())
+        return SymbolPlan(files=files, functions=functions, globals=globals_needed, body_files=body_files)
+
+
+def plan_unity_chunks(index: SymbolIndex, files: Iterable[str]) -> List[List[str]]:
+    """
+    Group source files into unity chunks: each file goes into the first chunk where
+    none of the functions, globals, macros, typedefs, tags or enumerators it defines
+    (static or not) is already defined, so no chunk redefines a file-scope name.
+    """
+    chunks: List[List[str]] = []
+    chunk_names: List[Set[str]] = []
+    for path in files:
+        names = index.file_symbols.get(path, set())
+        for chunk, defined in zip(chunks, chunk_names):
+            if not names & defined:
+                chunk.append(path)
+                defined |= names
+                break
+        else:
+            chunks.append([path])
+            chunk_names.append(set(names))
+    return chunks
+
+
+def build_symbol_index(project_path: str) -> SymbolIndex:
+    project_path = os.path.abspath(project_path)
+    if os.path.isfile(project_path):
+        return SymbolIndex.build([project_path])
+    sources: List[str] = []
+    for root, _, files in os.walk(project_path):
+        for file in files:
+            if file.endswith((".c", ".h")):
+                sources.append(os.path.join(root, file))
+    return SymbolIndex.build(sources)
+
+
+__all__ = ["SymbolIndex", "SymbolPlan", "build_symbol_index", "plan_unity_chunks"]